@@ -0,0 +1,57 @@
+"""
+Benchmark arsip halaman mentah: crawl live (dengan latensi buatan) sambil
+mengarsipkan halaman, lalu replay snapshot yang sama dari arsip tanpa jaringan.
+
+Cara menjalankan:
+    python -m benchmarks.bench_archive --pages 500 --latency 0.05 --workers 8
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from utils.archive import PageArchive
+from utils.extract import extract_data
+from benchmarks.synthetic import SyntheticCatalog
+from benchmarks.server import CatalogServer
+
+def main(argv=None) -> list:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--cards', type=int, default=20, help='Kartu per halaman.')
+    parser.add_argument('--latency', type=float, default=0.05, help='Latensi buatan per request (detik).')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--parser', default='lxml')
+    args = parser.parse_args(argv)
+
+    catalog = SyntheticCatalog(args.pages, cards_per_page=args.cards)
+    results = []
+    print(f"{'mode':<8} {'seconds':>9} {'pages/s':>9} {'rows':>8} {'archive MB':>11} {'same':>5}")
+    with tempfile.TemporaryDirectory() as workdir:
+        archive = PageArchive(workdir)
+        with CatalogServer(catalog, latency=args.latency) as server:
+            start = time.perf_counter()
+            live = extract_data(server.base_url, args.pages, max_workers=args.workers, parser=args.parser,
+                                archive=archive)
+            live_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            replayed = extract_data(server.base_url, args.pages, max_workers=args.workers, parser=args.parser,
+                                    archive=archive, replay='latest')
+            replay_seconds = time.perf_counter() - start
+
+        snapshot = archive.resolve('latest')
+        archive_mb = os.path.getsize(archive.path_for(snapshot)) / 1e6
+        archive.close()
+
+    for mode, seconds, df in (('live', live_seconds, live), ('replay', replay_seconds, replayed)):
+        result = {'mode': mode, 'seconds': seconds, 'pages_per_sec': args.pages / seconds, 'rows': len(df),
+                  'archive_mb': archive_mb, 'same': df.equals(live)}
+        results.append(result)
+        print(f"{mode:<8} {seconds:>9.2f} {result['pages_per_sec']:>9.1f} {len(df):>8} "
+              f"{archive_mb:>11.2f} {str(result['same']):>5}")
+    return results
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
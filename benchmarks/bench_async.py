@@ -0,0 +1,55 @@
+"""
+Benchmark mesin extract asyncio (extract_data_async) vs extract_data berbasis
+thread, terhadap server katalog lokal dengan latensi buatan.
+
+Cara menjalankan:
+    python -m benchmarks.bench_async --pages 500 --latency 0.05 --workers 8 32 --concurrency 32 200
+"""
+import argparse
+import asyncio
+import logging
+import time
+from utils.async_extract import extract_data_async
+from utils.extract import extract_data
+from benchmarks.synthetic import SyntheticCatalog
+from benchmarks.server import CatalogServer
+
+def main(argv=None) -> list:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=500)
+    parser.add_argument('--cards', type=int, default=20, help='Kartu per halaman.')
+    parser.add_argument('--latency', type=float, default=0.05, help='Latensi buatan per request (detik).')
+    parser.add_argument('--workers', type=int, nargs='+', default=[8, 32], help='Thread extract_data.')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[32, 200],
+                        help='Request bersamaan extract_data_async.')
+    parser.add_argument('--parser', default='lxml')
+    args = parser.parse_args(argv)
+
+    catalog = SyntheticCatalog(args.pages, cards_per_page=args.cards)
+    results = []
+    reference = None
+    print(f"{'engine':<8} {'parallel':>8} {'seconds':>9} {'pages/s':>9} {'rows':>8} {'same':>5}")
+    with CatalogServer(catalog, latency=args.latency) as server:
+        runs = [('thread', workers, lambda workers=workers: extract_data(
+                    server.base_url, args.pages, max_workers=workers, parser=args.parser))
+                for workers in args.workers]
+        runs += [('async', concurrency, lambda concurrency=concurrency: asyncio.run(extract_data_async(
+                    server.base_url, args.pages, concurrency=concurrency, parser=args.parser)))
+                 for concurrency in args.concurrency]
+
+        for engine, parallel, run in runs:
+            start = time.perf_counter()
+            df = run()
+            seconds = time.perf_counter() - start
+            rows = df.drop(columns='timestamp')
+            reference = rows if reference is None else reference
+            result = {'engine': engine, 'parallel': parallel, 'seconds': seconds,
+                      'pages_per_sec': args.pages / seconds, 'rows': len(df), 'same': rows.equals(reference)}
+            results.append(result)
+            print(f"{engine:<8} {parallel:>8} {seconds:>9.2f} {result['pages_per_sec']:>9.1f} "
+                  f"{len(df):>8} {str(result['same']):>5}")
+    return results
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
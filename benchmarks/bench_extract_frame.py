@@ -0,0 +1,82 @@
+"""
+Benchmark pembentukan DataFrame mentah di extract_data: ProductBuffer
+(kolom + timestamp sekali) vs versi lama (list dict per produk).
+
+Yang diukur: waktu mengumpulkan produk per halaman + membentuk DataFrame,
+serta peak memori (tracemalloc) selama proses tersebut.
+
+Cara menjalankan:
+    python -m benchmarks.bench_extract_frame --rows 100000 500000
+"""
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+import pandas as pd
+from utils.extract import ProductBuffer
+from utils.parsers import PRODUCT_FIELDS
+from benchmarks.bench_transform import make_raw_frame
+
+CARDS_PER_PAGE = 20
+
+def make_pages(rows: int) -> list:
+    """Membuat produk seperti output parser, dikelompokkan per halaman."""
+    products = make_raw_frame(rows)[PRODUCT_FIELDS].to_dict('records')
+    return [products[start:start + CARDS_PER_PAGE] for start in range(0, rows, CARDS_PER_PAGE)]
+
+def legacy_build(pages: list, extraction_timestamp: datetime) -> pd.DataFrame:
+    """Cara lama: satu dict baru (dengan timestamp) per produk, lalu DataFrame dari list dict."""
+    all_products = []
+    for products in pages:
+        all_products.extend(dict(product, timestamp=extraction_timestamp) for product in products)
+    return pd.DataFrame(all_products)
+
+def buffer_build(pages: list, extraction_timestamp: datetime) -> pd.DataFrame:
+    """Cara baru: ProductBuffer berorientasi kolom."""
+    buffer = ProductBuffer(extraction_timestamp)
+    for products in pages:
+        buffer.extend(products)
+    return buffer.to_frame()
+
+def measure(build, pages: list, extraction_timestamp: datetime):
+    """Mengembalikan (DataFrame, detik, peak MB) untuk satu cara pembentukan."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    frame = build(pages, extraction_timestamp)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return frame, seconds, peak / (1024 * 1024)
+
+def timed(build, pages: list, extraction_timestamp: datetime) -> float:
+    """Durasi tanpa tracemalloc (tracemalloc memperlambat alokasi)."""
+    start = time.perf_counter()
+    build(pages, extraction_timestamp)
+    return time.perf_counter() - start
+
+def main(argv=None) -> list:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 500_000])
+    args = parser.parse_args(argv)
+
+    results = []
+    extraction_timestamp = datetime.now()
+    print(f"{'rows':>9} {'legacy s':>9} {'buffer s':>9} {'speedup':>8} "
+          f"{'legacy MB':>10} {'buffer MB':>10} {'same':>5}")
+    for rows in args.rows:
+        pages = make_pages(rows)
+        old, _, old_peak = measure(legacy_build, pages, extraction_timestamp)
+        new, _, new_peak = measure(buffer_build, pages, extraction_timestamp)
+        old_time = timed(legacy_build, pages, extraction_timestamp)
+        new_time = timed(buffer_build, pages, extraction_timestamp)
+        result = {
+            'rows': rows, 'legacy_seconds': old_time, 'buffer_seconds': new_time,
+            'legacy_peak_mb': old_peak, 'buffer_peak_mb': new_peak, 'same': old.equals(new),
+        }
+        results.append(result)
+        print(f"{rows:>9} {old_time:>9.3f} {new_time:>9.3f} {old_time / new_time:>7.1f}x "
+              f"{old_peak:>10.1f} {new_peak:>10.1f} {str(result['same']):>5}")
+    return results
+
+if __name__ == '__main__':
+    main()
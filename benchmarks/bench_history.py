@@ -0,0 +1,72 @@
+"""
+Benchmark riwayat harga: mengisi PriceHistory dengan banyak snapshot (sebagian
+kecil harga berubah per snapshot), lalu mengukur latensi query riwayat satu
+produk dan perubahan harga sejak waktu tertentu.
+
+Cara menjalankan:
+    python -m benchmarks.bench_history --products 100000 --snapshots 60 --change 0.05
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from utils.history import PriceHistory
+from benchmarks.bench_identity import make_clean_frame
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--snapshots', type=int, default=60, help='Jumlah snapshot (satu per hari).')
+    parser.add_argument('--change', type=float, default=0.05, help='Proporsi produk yang harganya berubah per snapshot.')
+    parser.add_argument('--queries', type=int, default=200, help='Jumlah query riwayat produk yang diukur.')
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    snapshot = make_clean_frame(args.products)
+    start_day = pd.Timestamp('2024-01-01 06:00')
+
+    with tempfile.TemporaryDirectory() as workdir:
+        history = PriceHistory(os.path.join(workdir, 'history.sqlite'))
+        start = time.perf_counter()
+        for day in range(args.snapshots):
+            changed = rng.random(args.products) < args.change
+            snapshot.loc[changed, 'Price'] += 1000
+            history.append(snapshot.assign(timestamp=start_day + pd.Timedelta(days=day)))
+        append_seconds = time.perf_counter() - start
+        observations = len(history)
+
+        titles = rng.choice(snapshot['title'].to_numpy(), args.queries)
+        rows = snapshot.set_index('title')
+        latencies = []
+        for title in titles:
+            start = time.perf_counter()
+            history.product_history(title, rows.at[title, 'size'], rows.at[title, 'gender'],
+                                    start=start_day + pd.Timedelta(days=args.snapshots // 2))
+            latencies.append(time.perf_counter() - start)
+
+        since = start_day + pd.Timedelta(days=args.snapshots - 1)
+        start = time.perf_counter()
+        changes = history.price_changes(since)
+        changes_seconds = time.perf_counter() - start
+        history.close()
+
+    result = {
+        'observations': observations, 'append_seconds': append_seconds,
+        'product_query_ms_median': statistics.median(latencies) * 1000,
+        'product_query_ms_max': max(latencies) * 1000,
+        'price_changes_rows': len(changes), 'price_changes_ms': changes_seconds * 1000,
+    }
+    print(f"{observations} observasi dari {args.snapshots} snapshot x {args.products} produk "
+          f"(append total {append_seconds:.1f} detik)")
+    print(f"Riwayat satu produk: median {result['product_query_ms_median']:.2f} ms, "
+          f"maks {result['product_query_ms_max']:.2f} ms")
+    print(f"Perubahan harga sejak snapshot terakhir: {len(changes)} baris dalam {result['price_changes_ms']:.1f} ms")
+    return result
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
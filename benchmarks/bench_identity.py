@@ -0,0 +1,78 @@
+"""
+Benchmark indeks identitas produk: classify() dan commit() terhadap indeks
+yang sudah berisi banyak produk, dengan sebagian kecil baris berubah.
+
+Cara menjalankan:
+    python -m benchmarks.bench_identity --rows 100000 1000000 --change 0.02
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from utils.identity import ProductIndex
+
+def make_clean_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Membuat DataFrame bersih sintetis dengan judul unik per baris."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'title': np.char.add('Product ', np.arange(rows).astype(str)).astype(object),
+        'Price': np.round(rng.uniform(160000, 8000000, rows), 0),
+        'Rating': np.round(rng.uniform(1, 5, rows), 1),
+        'colors': rng.integers(1, 6, rows),
+        'size': pd.Categorical(rng.choice(['S', 'M', 'L', 'XL', 'XXL'], rows)),
+        'gender': pd.Categorical(rng.choice(['Men', 'Women', 'Unisex'], rows)),
+        'timestamp': pd.Timestamp.now(),
+    })
+
+def next_snapshot(df: pd.DataFrame, change: float, seed: int = 1) -> pd.DataFrame:
+    """Snapshot berikutnya: sebagian harga berubah, sebagian produk hilang."""
+    rng = np.random.default_rng(seed)
+    snapshot = df.copy()
+    changed = rng.random(len(df)) < change
+    snapshot.loc[changed, 'Price'] = snapshot.loc[changed, 'Price'] + 1000
+    removed = rng.random(len(df)) < change / 2
+    return snapshot[~removed]
+
+def main(argv=None) -> list:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--change', type=float, default=0.02, help='Proporsi baris yang berubah per run.')
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'rows':>9} {'initial load s':>15} {'classify s':>11} {'commit s':>9} "
+          f"{'inserted':>9} {'updated':>8} {'deleted':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.rows:
+            index = ProductIndex(os.path.join(workdir, f'index_{rows}.sqlite'))
+            first = make_clean_frame(rows)
+
+            start = time.perf_counter()
+            index.commit(index.classify(first))
+            initial_seconds = time.perf_counter() - start
+
+            second = next_snapshot(first, args.change)
+            start = time.perf_counter()
+            changes = index.classify(second)
+            classify_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            index.commit(changes)
+            commit_seconds = time.perf_counter() - start
+            index.close()
+
+            result = {
+                'rows': rows, 'initial_seconds': initial_seconds, 'classify_seconds': classify_seconds,
+                'commit_seconds': commit_seconds, 'inserted': len(changes['inserted']),
+                'updated': len(changes['updated']), 'deleted': len(changes['deleted']),
+            }
+            results.append(result)
+            print(f"{rows:>9} {initial_seconds:>15.2f} {classify_seconds:>11.2f} {commit_seconds:>9.2f} "
+                  f"{result['inserted']:>9} {result['updated']:>8} {result['deleted']:>8}")
+    return results
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
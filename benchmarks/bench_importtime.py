@@ -0,0 +1,72 @@
+"""
+Benchmark waktu startup: `python -X importtime` untuk `import main` (dependensi
+sink dimuat malas) dibanding import main ditambah semua dependensi sink berat,
+yaitu biaya yang dulu dibayar setiap run.
+
+Cara menjalankan:
+    python -m benchmarks.bench_importtime --repeat 5
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ['sqlalchemy', 'psycopg2', 'google.oauth2.service_account', 'googleapiclient.discovery', 'aiohttp']
+
+SCENARIOS = {
+    'lazy': "import main",
+    'eager': "import main; " + "; ".join(f"import {module}" for module in HEAVY_MODULES),
+}
+
+def parse_importtime(stderr: str) -> dict:
+    """
+    Membaca output `-X importtime` menjadi {modul top-level: waktu kumulatif (detik)}.
+
+    Baris top-level adalah yang nama modulnya tidak menjorok di kolom terakhir.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith('  '):
+            continue
+        modules[name.strip()] = int(cumulative) / 1e6
+    return modules
+
+def measure(code: str) -> dict:
+    """Menjalankan `code` di interpreter baru dan mengukur total waktu import-nya."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=root,
+                               capture_output=True, text=True, check=True)
+    modules = parse_importtime(completed.stderr)
+    return {'seconds': sum(modules.values()), 'modules': modules}
+
+def main(argv=None) -> list:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Jumlah interpreter baru per skenario.')
+    parser.add_argument('--top', type=int, default=5, help='Jumlah import terberat yang ditampilkan.')
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'scenario':<8} {'median import s':>16} {'min s':>8}")
+    for scenario, code in SCENARIOS.items():
+        runs = [measure(code) for _ in range(args.repeat)]
+        seconds = [run['seconds'] for run in runs]
+        heaviest = sorted(runs[-1]['modules'].items(), key=lambda item: item[1], reverse=True)[:args.top]
+        result = {'scenario': scenario, 'median_seconds': statistics.median(seconds),
+                  'min_seconds': min(seconds), 'heaviest': heaviest}
+        results.append(result)
+        print(f"{scenario:<8} {result['median_seconds']:>16.3f} {result['min_seconds']:>8.3f}")
+        for module, module_seconds in heaviest:
+            print(f"{'':<8}   {module:<40} {module_seconds:>7.3f}")
+
+    saving = results[1]['median_seconds'] - results[0]['median_seconds']
+    print(f"Penghematan startup (median): {saving:.3f} detik")
+    return results
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
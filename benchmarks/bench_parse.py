@@ -0,0 +1,37 @@
+"""
+Benchmark throughput parser HTML kartu produk.
+
+Cara menjalankan:
+    python -m benchmarks.bench_parse --cards 20 --pages 200
+"""
+import argparse
+import time
+from utils.parsers import PARSER_BACKENDS
+from benchmarks.synthetic import SyntheticCatalog
+
+def bench(parse, html: str, pages: int) -> float:
+    """Mengembalikan waktu (detik) untuk mem-parsing `pages` kali halaman yang sama."""
+    start = time.perf_counter()
+    for _ in range(pages):
+        parse(html)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cards', type=int, default=20, help='Jumlah kartu per halaman.')
+    parser.add_argument('--pages', type=int, default=200, help='Jumlah halaman yang di-parse per backend.')
+    parser.add_argument('--malformed', type=float, default=0.05, help='Proporsi kartu rusak.')
+    args = parser.parse_args()
+
+    html = SyntheticCatalog(1, cards_per_page=args.cards, malformed_ratio=args.malformed).render_page(1)
+    baseline = None
+    print(f"{'backend':<8} {'pages/s':>10} {'cards/s':>12} {'speedup':>8}")
+    for name, parse in PARSER_BACKENDS.items():
+        parse(html)
+        elapsed = bench(parse, html, args.pages)
+        pages_per_sec = args.pages / elapsed
+        baseline = baseline or pages_per_sec
+        print(f"{name:<8} {pages_per_sec:>10.1f} {pages_per_sec * args.cards:>12.1f} {pages_per_sec / baseline:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark layanan query: latensi query filter/rentang/top-k atas snapshot
+terindeks (utils.query) dibanding filter boolean pandas atas DataFrame yang
+sama, serta waktu membangun dan menukar snapshot baru.
+
+Cara menjalankan:
+    python -m benchmarks.bench_query --products 100000 --repeat 200
+"""
+import argparse
+import logging
+import statistics
+import time
+from utils.query import QueryService
+from benchmarks.bench_identity import make_clean_frame
+
+QUERIES = {
+    'women_m_cheap_top_rated': {'gender': 'Women', 'size': 'M', 'max_price': 500000, 'min_rating': 4.5},
+    'price_band_sorted': {'min_price': 1000000, 'max_price': 1050000, 'sort': 'Price', 'limit': 20},
+    'top10_rating_unisex': {'gender': 'Unisex', 'sort': '-Rating', 'limit': 10},
+}
+
+def pandas_query(df, gender=None, size=None, min_price=None, max_price=None, min_rating=None, sort=None, limit=None):
+    """Query yang sama dengan filter boolean pandas (cara pembacaan Sheet/tabel hari ini)."""
+    mask = True
+    if gender is not None:
+        mask = mask & (df['gender'] == gender)
+    if size is not None:
+        mask = mask & (df['size'] == size)
+    if min_price is not None:
+        mask = mask & (df['Price'] >= min_price)
+    if max_price is not None:
+        mask = mask & (df['Price'] <= max_price)
+    if min_rating is not None:
+        mask = mask & (df['Rating'] >= min_rating)
+    result = df[mask]
+    if sort is not None:
+        result = result.sort_values(sort.lstrip('-'), ascending=not sort.startswith('-'), kind='stable')
+    if limit is not None:
+        result = result.head(limit)
+    return result.to_dict('records')
+
+def median_us(func, repeat: int) -> float:
+    """Median durasi pemanggilan `func` dalam mikrodetik."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations) * 1e6
+
+def main(argv=None) -> list:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--products', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=200, help='Jumlah pengulangan per query.')
+    args = parser.parse_args(argv)
+
+    df = make_clean_frame(args.products)
+    service = QueryService()
+    start = time.perf_counter()
+    service.publish(df)
+    publish_seconds = time.perf_counter() - start
+
+    results = []
+    print(f"Snapshot {args.products} produk dibangun dan ditukar dalam {publish_seconds * 1000:.1f} ms")
+    print(f"{'query':<26} {'rows':>6} {'indexed us':>11} {'pandas us':>10} {'speedup':>8}")
+    for name, filters in QUERIES.items():
+        indexed = service.query(**filters)
+        expected = pandas_query(df, **filters)
+        result = {
+            'query': name, 'total': indexed['total'],
+            'same': [item['title'] for item in indexed['items']] == [row['title'] for row in expected],
+            'indexed_us': median_us(lambda: service.query(**filters), args.repeat),
+            'pandas_us': median_us(lambda: pandas_query(df, **filters), max(1, args.repeat // 10)),
+            'publish_seconds': publish_seconds,
+        }
+        results.append(result)
+        print(f"{name:<26} {len(indexed['items']):>6} {result['indexed_us']:>11.1f} {result['pandas_us']:>10.1f} "
+              f"{result['pandas_us'] / result['indexed_us']:>7.1f}x")
+    return results
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
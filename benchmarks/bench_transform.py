@@ -0,0 +1,117 @@
+"""
+Benchmark transform_data: implementasi vektor (REVISI 4) vs versi lama.
+
+Cara menjalankan:
+    python -m benchmarks.bench_transform --rows 10000 100000 1000000
+"""
+import argparse
+import logging
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from utils.transform import transform_data
+
+logger = logging.getLogger('bench_transform')
+logger.disabled = True
+
+def make_raw_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Membuat data mentah sintetis dengan format output extract_data (~5% baris invalid)."""
+    rng = np.random.default_rng(seed)
+    invalid = rng.random(rows) < 0.05
+    prices = np.char.add('$', np.round(rng.uniform(10, 500, rows), 2).astype(str))
+    ratings = np.char.add(np.char.add('Rating: ⭐ ', np.round(rng.uniform(1, 5, rows), 1).astype(str)), ' / 5')
+    return pd.DataFrame({
+        'Title': np.where(invalid, 'Unknown Product', np.char.add('Product ', (np.arange(rows) % (rows // 2 + 1)).astype(str))),
+        'Price': np.where(invalid, 'Price Unavailable', prices),
+        'Rating': np.where(invalid, 'Rating: ⭐ Invalid Rating / 5', ratings),
+        'Colors': np.char.add(rng.integers(1, 6, rows).astype(str), ' Colors'),
+        'Size': np.char.add(np.char.add('Size: ', rng.choice(['S', 'M', 'L', 'XL', 'XXL'], rows)), ','),
+        'Gender': np.char.add(np.char.add('Gender: ', rng.choice(['Men', 'Women', 'Unisex'], rows)), ','),
+        'timestamp': pd.Timestamp.now(),
+    }).astype({col: object for col in ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']})
+
+def legacy_transform_data(df: pd.DataFrame, exchange_rate: int = 16000) -> pd.DataFrame:
+    """Salinan transform_data sebelum REVISI 4, dipakai sebagai pembanding."""
+    if df.empty:
+        logger.warning("DataFrame input kosong, tidak ada transformasi yang dilakukan.")
+        return df
+        
+    logger.info("Memulai proses transformasi data...")
+    df_copy = df.copy()
+    
+    try:
+        df_copy = df_copy[df_copy['Title'] != 'Unknown Product'].copy()
+
+        df_copy['Price'] = df_copy['Price'].replace('Price Unavailable', np.nan)
+        df_copy['Price'] = df_copy['Price'].str.replace(r'[$,]', '', regex=True).astype(float)
+        df_copy['Price (IDR)'] = df_copy['Price'] * exchange_rate
+        df_copy['Price (IDR)'] = df_copy['Price (IDR)'].round(0)
+
+        df_copy['Rating'] = df_copy['Rating'].str.split(' ').str.get(2) 
+        df_copy['Rating'] = df_copy['Rating'].replace('Invalid', np.nan)
+        df_copy['Rating'] = pd.to_numeric(df_copy['Rating'], errors='coerce')
+        df_copy['Rating'] = df_copy['Rating'].round(1) 
+
+        df_copy['Colors'] = df_copy['Colors'].str.split(' ').str.get(0) 
+        df_copy['Colors'] = df_copy['Colors'].replace('N/A', np.nan)
+        df_copy['Colors'] = pd.to_numeric(df_copy['Colors'], errors='coerce')
+        df_copy['Colors'] = df_copy['Colors'].fillna(1).astype(int)
+
+        df_copy['Size'] = df_copy['Size'].str.replace('Size: ', '', regex=False)
+        df_copy['Size'] = df_copy['Size'].str.strip(',') 
+        df_copy['Size'] = df_copy['Size'].replace('N/A', np.nan)
+
+        df_copy['Gender'] = df_copy['Gender'].str.replace('Gender: ', '', regex=False)
+        df_copy['Gender'] = df_copy['Gender'].str.strip(',')
+        df_copy['Gender'] = df_copy['Gender'].replace('N/A', np.nan)
+
+        df_copy = df_copy.dropna(subset=['Title', 'Price (IDR)', 'Rating', 'Size', 'Gender'])
+
+        df_copy = df_copy.drop_duplicates()
+
+        df_copy['Price (IDR)'] = df_copy['Price (IDR)'].astype('float64')
+        df_copy['Rating'] = df_copy['Rating'].astype('float64')
+        df_copy['Colors'] = df_copy['Colors'].astype('int64')
+        df_copy['Title'] = df_copy['Title'].astype('string')
+        df_copy['Size'] = df_copy['Size'].astype('string')
+        df_copy['Gender'] = df_copy['Gender'].astype('string')
+        df_copy['timestamp'] = pd.to_datetime(df_copy['timestamp'])
+        
+        final_columns = ['Title', 'Price (IDR)', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp']
+        df_final = df_copy[final_columns]
+        
+        df_final.columns = ['title', 'Price', 'Rating', 'colors', 'size', 'gender', 'timestamp']
+        
+        logger.info(f"Transformasi selesai. {len(df_final)} data bersih tersisa.")
+        return df_final
+        
+    except Exception as e:
+        logger.error(f"Terjadi error saat transformasi data: {e}")
+        return pd.DataFrame(columns=['title', 'Price', 'Rating', 'colors', 'size', 'gender', 'timestamp'])
+
+def timed(func, df: pd.DataFrame):
+    """Menjalankan transformasi dan mengembalikan (hasil, durasi detik)."""
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    warnings.simplefilter('ignore', FutureWarning)
+
+    print(f"{'rows':>10} {'legacy rows/s':>14} {'new rows/s':>12} {'speedup':>8} {'same':>5}")
+    for rows in args.rows:
+        raw = make_raw_frame(rows)
+        old, old_time = timed(legacy_transform_data, raw)
+        new, new_time = timed(transform_data, raw)
+        same = old.astype({'size': 'string', 'gender': 'string'}).equals(
+            new.astype({'size': 'string', 'gender': 'string'}))
+        print(f"{rows:>10} {rows / old_time:>14.0f} {rows / new_time:>12.0f} "
+              f"{old_time / new_time:>7.1f}x {str(same):>5}")
+
+if __name__ == '__main__':
+    main()
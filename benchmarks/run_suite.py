@@ -0,0 +1,115 @@
+"""
+Suite benchmark ETL offline: katalog sintetis disajikan dari server HTTP lokal,
+lalu extract -> transform -> sink diukur per tahap. Tidak butuh jaringan,
+sehingga bisa dijalankan di CI.
+
+Cara menjalankan:
+    python -m benchmarks.run_suite --pages 50 500 5000 --workers 8 --latency 0.02
+    python -m benchmarks.run_suite --pages 50 --sinks csv parquet --json report.json
+    python -m benchmarks.run_suite --pages 5000 --workers 16 --parse-processes 8
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+from utils.extract import extract_data
+from utils.transform import transform_data
+from utils.load import load_to_csv, load_to_parquet, load_to_postgres_upsert
+from benchmarks.synthetic import SyntheticCatalog
+from benchmarks.server import CatalogServer
+
+def peak_rss_mb() -> float:
+    """Peak RSS proses sejauh ini dalam MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def timed(func, *args, **kwargs):
+    """Menjalankan fungsi dan mengembalikan (hasil, durasi detik)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def run_case(pages: int, args, workdir: str) -> dict:
+    """Menjalankan satu ukuran katalog dan mengembalikan hasil pengukuran."""
+    catalog = SyntheticCatalog(pages, cards_per_page=args.cards, malformed_ratio=args.malformed, seed=args.seed)
+    result = {'pages': pages, 'stages': {}}
+
+    with CatalogServer(catalog, latency=args.latency, jitter=args.jitter) as server:
+        raw_df, seconds = timed(extract_data, server.base_url, pages, max_workers=args.workers,
+                                parser=args.parser, parse_processes=args.parse_processes)
+        result['bytes'] = server.stats['bytes']
+    result['stages']['extract'] = {'seconds': seconds, 'rows': len(raw_df), 'peak_rss_mb': peak_rss_mb()}
+
+    cleaned_df, seconds = timed(transform_data, raw_df)
+    result['stages']['transform'] = {'seconds': seconds, 'rows': len(cleaned_df), 'peak_rss_mb': peak_rss_mb()}
+    del raw_df
+
+    sinks = {
+        'csv': lambda: load_to_csv(cleaned_df, os.path.join(workdir, f'products_{pages}.csv')),
+        'parquet': lambda: load_to_parquet(cleaned_df, os.path.join(workdir, f'parquet_{pages}'), mode='overwrite'),
+        'postgres': lambda: load_to_postgres_upsert(cleaned_df, args.db_url, f'bench_products_{pages}'),
+    }
+    for name in args.sinks:
+        _, seconds = timed(sinks[name])
+        result['stages'][f'load_{name}'] = {'seconds': seconds, 'rows': len(cleaned_df), 'peak_rss_mb': peak_rss_mb()}
+
+    for stage in result['stages'].values():
+        stage['rows_per_sec'] = stage['rows'] / stage['seconds'] if stage['seconds'] else None
+    extract_seconds = result['stages']['extract']['seconds']
+    result['pages_per_sec'] = pages / extract_seconds if extract_seconds else None
+    result['expected_valid_rows'] = catalog.expected_counts()['valid'] if args.verify else None
+    return result
+
+def print_report(results: list) -> None:
+    """Mencetak ringkasan hasil benchmark sebagai tabel."""
+    print(f"{'pages':>7} {'stage':<15} {'seconds':>9} {'rows':>9} {'rows/s':>11} {'peakRSS MB':>11}")
+    for result in results:
+        for name, stage in result['stages'].items():
+            rows_per_sec = f"{stage['rows_per_sec']:.0f}" if stage['rows_per_sec'] else '-'
+            print(f"{result['pages']:>7} {name:<15} {stage['seconds']:>9.3f} {stage['rows']:>9} "
+                  f"{rows_per_sec:>11} {stage['peak_rss_mb']:>11.1f}")
+        print(f"{result['pages']:>7} {'pages/s':<15} {result['pages_per_sec']:>9.1f}")
+        if result['expected_valid_rows'] is not None:
+            actual = result['stages']['transform']['rows']
+            status = 'OK' if actual == result['expected_valid_rows'] else 'MISMATCH'
+            print(f"{result['pages']:>7} {'verify':<15} {status} ({actual}/{result['expected_valid_rows']} baris bersih)")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='+', default=[50, 500])
+    parser.add_argument('--cards', type=int, default=20, help='Kartu per halaman.')
+    parser.add_argument('--malformed', type=float, default=0.05, help='Proporsi kartu rusak.')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--latency', type=float, default=0.0, help='Latensi buatan per request (detik).')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Jitter latensi maksimum (detik).')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--parser', default='lxml')
+    parser.add_argument('--parse-processes', type=int, default=0,
+                        help='Jumlah proses parser (0 = parsing di thread fetch).')
+    parser.add_argument('--sinks', nargs='*', default=['csv', 'parquet'], choices=['csv', 'parquet', 'postgres'])
+    parser.add_argument('--db-url', help='URL PostgreSQL untuk sink postgres.')
+    parser.add_argument('--verify', action='store_true', help='Bandingkan jumlah baris bersih dengan katalog.')
+    parser.add_argument('--json', help='Simpan hasil ke file JSON.')
+    return parser
+
+def main(argv=None) -> list:
+    args = build_parser().parse_args(argv)
+    if 'postgres' in args.sinks and not args.db_url:
+        raise SystemExit("--db-url wajib diisi untuk sink postgres.")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [run_case(pages, args, workdir) for pages in args.pages]
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return results
+
+if __name__ == '__main__':
+    logging.getLogger().setLevel(logging.WARNING)
+    main()
@@ -0,0 +1,92 @@
+"""
+Server HTTP lokal yang menyajikan SyntheticCatalog sebagai pengganti
+https://fashion-studio.dicoding.dev, dengan latensi buatan opsional.
+"""
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class _CatalogHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        if server.latency or server.jitter:
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+
+        path = self.path.split('?', 1)[0]
+        page = 1 if path == '/' else None
+        if path.startswith('/page') and path[5:].isdigit():
+            page = int(path[5:])
+
+        html = server.catalog.render_page(page) if page else None
+        with server.stats_lock:
+            server.stats['requests'] += 1
+        if html is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = html.encode('utf-8')
+        with server.stats_lock:
+            server.stats['bytes'] += len(body)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class CatalogServer:
+    """
+    Menjalankan server katalog di thread latar pada port acak 127.0.0.1.
+
+    Contoh:
+        with CatalogServer(SyntheticCatalog(50), latency=0.05) as server:
+            extract_data(server.base_url, 50)
+
+    Args:
+        catalog (SyntheticCatalog): Katalog yang disajikan.
+        latency (float): Jeda tetap (detik) per request.
+        jitter (float): Tambahan jeda acak maksimum (detik) per request.
+    """
+
+    def __init__(self, catalog, latency: float = 0.0, jitter: float = 0.0):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _CatalogHandler)
+        self._server.daemon_threads = True
+        self._server.catalog = catalog
+        self._server.latency = latency
+        self._server.jitter = jitter
+        self._server.stats = {'requests': 0, 'bytes': 0}
+        self._server.stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> dict:
+        return dict(self._server.stats)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='catalog-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
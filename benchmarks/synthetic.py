@@ -0,0 +1,115 @@
+"""
+Generator katalog fashion-studio sintetis untuk benchmark dan test offline.
+
+Markup mengikuti situs asli ('div.collection-card' berisi 'div.product-details').
+Setiap halaman dibuat deterministik dari seed dan nomor halaman, sehingga katalog
+50.000 halaman tidak perlu disimpan di memori.
+"""
+import random
+
+CARD_TEMPLATE = """
+    <div class="collection-card">
+        <div style="position: relative;">
+            <img src="https://picsum.photos/280/350?random={uid}" class="collection-image" alt="{title}">
+        </div>
+        <div class="product-details">
+            {title_html}
+            <div class="price-container"><span class="price">{price}</span></div>
+            <p style="font-size: 14px; color: #777;">Rating: ⭐ {rating} / 5</p>
+            <p style="font-size: 14px; color: #777;">{colors} Colors</p>
+            <p style="font-size: 14px; color: #777;">Size: {size}</p>
+            <p style="font-size: 14px; color: #777;">Gender: {gender}</p>
+        </div>
+    </div>
+"""
+
+BROKEN_CARD_TEMPLATE = """
+    <div class="collection-card">
+        <div style="position: relative;">
+            <img src="https://picsum.photos/280/350?random={uid}" class="collection-image" alt="Broken">
+        </div>
+    </div>
+"""
+
+PAGE_TEMPLATE = """<html><head><title>Fashion Studio</title></head><body>
+<div class="collection-grid" id="collectionList">{cards}</div>
+<ul class="pagination">{pagination}</ul>
+</body></html>"""
+
+PRODUCT_TYPES = ['T-shirt', 'Hoodie', 'Pants', 'Outerwear', 'Jacket', 'Shirt', 'Sweater', 'Crewneck']
+SIZES = ['S', 'M', 'L', 'XL', 'XXL']
+GENDERS = ['Men', 'Women', 'Unisex']
+MALFORMED_KINDS = ['unknown_product', 'invalid_rating', 'missing_details']
+
+class SyntheticCatalog:
+    """
+    Katalog sintetis dengan jumlah halaman dan proporsi kartu rusak yang bisa diatur.
+
+    Args:
+        pages (int): Jumlah halaman katalog.
+        cards_per_page (int): Jumlah kartu per halaman.
+        malformed_ratio (float): Proporsi kartu rusak (0.0 - 1.0).
+        seed (int): Seed agar isi halaman selalu sama antar run.
+    """
+
+    def __init__(self, pages: int, cards_per_page: int = 20, malformed_ratio: float = 0.05, seed: int = 42):
+        self.pages = pages
+        self.cards_per_page = cards_per_page
+        self.malformed_ratio = malformed_ratio
+        self.seed = seed
+
+    def _cards(self, page: int):
+        """Menghasilkan (jenis, html) setiap kartu di satu halaman."""
+        rng = random.Random(self.seed * 1_000_003 + page)
+        for i in range(self.cards_per_page):
+            uid = (page - 1) * self.cards_per_page + i
+            kind = rng.choice(MALFORMED_KINDS) if rng.random() < self.malformed_ratio else 'valid'
+            if kind == 'missing_details':
+                yield kind, BROKEN_CARD_TEMPLATE.format(uid=uid)
+                continue
+
+            title = f"{rng.choice(PRODUCT_TYPES)} {uid}"
+            price = f"${rng.uniform(10, 500):.2f}"
+            rating = f"{rng.uniform(1, 5):.1f}"
+            if kind == 'unknown_product':
+                title, price = 'Unknown Product', 'Price Unavailable'
+            elif kind == 'invalid_rating':
+                rating = 'Invalid Rating'
+
+            yield kind, CARD_TEMPLATE.format(
+                uid=uid,
+                title=title,
+                title_html=f'<h3 class="product-title">{title}</h3>',
+                price=price,
+                rating=rating,
+                colors=rng.randint(1, 5),
+                size=rng.choice(SIZES),
+                gender=rng.choice(GENDERS),
+            )
+
+    def _pagination(self, page: int) -> str:
+        """Membuat kontrol pagination seperti situs asli."""
+        items = []
+        if page > 1:
+            previous = '/' if page == 2 else f'/page{page - 1}'
+            items.append(f'<li class="page-item previous"><a class="page-link" href="{previous}">Previous</a></li>')
+        items.append(f'<li class="page-item current"><span class="page-link">Page {page} of {self.pages}</span></li>')
+        if page < self.pages:
+            items.append(f'<li class="page-item next"><a class="page-link" href="/page{page + 1}">Next</a></li>')
+        return ''.join(items)
+
+    def render_page(self, page: int) -> str:
+        """Mengembalikan HTML halaman `page`, atau None jika di luar katalog."""
+        if page < 1 or page > self.pages:
+            return None
+        cards = ''.join(html for _, html in self._cards(page))
+        return PAGE_TEMPLATE.format(cards=cards, pagination=self._pagination(page))
+
+    def expected_counts(self) -> dict:
+        """Menghitung jumlah kartu total dan kartu valid (lolos transform) di seluruh katalog."""
+        counts = {'cards': 0, 'valid': 0}
+        for page in range(1, self.pages + 1):
+            for kind, _ in self._cards(page):
+                counts['cards'] += 1
+                counts['valid'] += kind == 'valid'
+        return counts
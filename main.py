@@ -1,36 +1,410 @@
 import os
+import io
+import argparse
+import asyncio
 import logging
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from dotenv import load_dotenv
-from utils.extract import extract_data
+from utils.extract import extract_data, iter_extract_batches
 from utils.transform import transform_data
-from utils.load import load_to_csv, load_to_gdrive, load_to_postgres
+from utils.load import (load_to_csv, load_to_gdrive, sync_to_gdrive, load_to_postgres, load_to_postgres_upsert,
+                        load_to_parquet, load_to_history, load_to_query_snapshot, publish_query_snapshot,
+                        postgres_engine)
+from utils.pipeline import run_streaming_pipeline
+from utils.cache import PageCache
+from utils.checkpoint import CheckpointStore
+from utils.archive import PageArchive
+from utils.identity import ProductIndex, changed_rows
+from utils.metrics import RunMetrics
+from utils.dispatch import dispatch_loads
+from utils.profiling import StageProfiler
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def main():
-    """Fungsi utama untuk menjalankan pipeline ETL."""
-    
+DEFAULT_BASE_URL = "https://fashion-studio.dicoding.dev"
+SINK_NAMES = ('csv', 'gdrive', 'postgres', 'parquet', 'history', 'query')
+
+# Konfigurasi (dan variabel lingkungannya) yang wajib ada untuk tiap sink.
+SINK_SETTINGS = {
+    'csv': {'csv_file_path': 'CSV_FILE_PATH'},
+    'gdrive': {'gsheet_id': 'GSHEET_ID', 'service_account_file': 'SERVICE_ACCOUNT_FILE'},
+    'postgres': {'db_url': 'DB_URL', 'db_table_name': 'DB_TABLE_NAME'},
+    'parquet': {'parquet_dir': 'PARQUET_DIR'},
+    'history': {'history_path': 'HISTORY_PATH'},
+    'query': {'query_snapshot_path': 'QUERY_SNAPSHOT_PATH'},
+}
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    """
+    Membaca argumen CLI. Setiap opsi yang tidak diberikan memakai variabel
+    lingkungan (.env) yang sama seperti sebelumnya.
+
+    Args:
+        argv (list): Argumen CLI; None = sys.argv[1:].
+    """
     load_dotenv()
-    
-    DB_URL = os.getenv('DB_URL')
-    GSHEET_ID = os.getenv('GSHEET_ID')
-    SERVICE_ACCOUNT_FILE = os.getenv('SERVICE_ACCOUNT_FILE')
-    CSV_FILE_PATH = os.getenv('CSV_FILE_PATH')
-    DB_TABLE_NAME = os.getenv('DB_TABLE_NAME')
-    
-    if not all([DB_URL, GSHEET_ID, SERVICE_ACCOUNT_FILE, CSV_FILE_PATH, DB_TABLE_NAME]):
-        logging.error("Satu atau lebih variabel lingkungan (.env) tidak diatur. Pipeline berhenti.")
+    default_sinks = os.getenv('SINKS')
+    if default_sinks:
+        default_sinks = [name.strip() for name in default_sinks.split(',') if name.strip()]
+    else:
+        default_sinks = ['csv', 'gdrive', 'postgres'] + (['parquet'] if os.getenv('PARQUET_DIR') else []) \
+            + (['history'] if os.getenv('HISTORY_PATH') else []) \
+            + (['query'] if os.getenv('QUERY_SNAPSHOT_PATH') else [])
+
+    parser = argparse.ArgumentParser(description="ETL Pipeline katalog Fashion Studio.")
+    parser.add_argument('--base-url', default=os.getenv('BASE_URL', DEFAULT_BASE_URL),
+                        help='URL dasar situs (env BASE_URL).')
+    parser.add_argument('--pages', type=int, default=int(os.getenv('TOTAL_PAGES')) if os.getenv('TOTAL_PAGES') else None,
+                        help='Batas jumlah halaman; jumlah halaman dibaca dari pagination lalu dibatasi nilai ini '
+                             '(env TOTAL_PAGES).')
+    parser.add_argument('--sinks', nargs='+', choices=SINK_NAMES, default=default_sinks,
+                        help='Sink tujuan load (env SINKS, dipisah koma). Default: csv gdrive postgres '
+                             '(+ parquet/history jika PARQUET_DIR/HISTORY_PATH diatur).')
+    parser.add_argument('--csv-file', default=os.getenv('CSV_FILE_PATH'), help='File CSV output (env CSV_FILE_PATH).')
+    parser.add_argument('--parquet-dir', default=os.getenv('PARQUET_DIR'), help='Folder dataset Parquet (env PARQUET_DIR).')
+    parser.add_argument('--history-path', default=os.getenv('HISTORY_PATH'),
+                        help='Database riwayat harga/rating (env HISTORY_PATH).')
+    parser.add_argument('--query-snapshot', default=os.getenv('QUERY_SNAPSHOT_PATH'),
+                        help='File Parquet snapshot untuk layanan query utils.query (env QUERY_SNAPSHOT_PATH).')
+    parser.add_argument('--max-workers', type=int, default=int(os.getenv('MAX_WORKERS', '8')),
+                        help='Thread fetch (env MAX_WORKERS).')
+    parser.add_argument('--parser', choices=('bs4', 'lxml'), default=os.getenv('PARSER_BACKEND', 'lxml'),
+                        help='Backend parser HTML (env PARSER_BACKEND).')
+    parser.add_argument('--engine', choices=('thread', 'async'), default=os.getenv('EXTRACT_ENGINE') or 'thread',
+                        help='Mesin extract (env EXTRACT_ENGINE).')
+    parser.add_argument('--role', choices=('worker', 'coordinator'), default=os.getenv('CRAWL_ROLE'),
+                        help='Peran pada crawl terdistribusi (env CRAWL_ROLE).')
+    parser.add_argument('--run-id', default=os.getenv('RUN_ID'), help='ID run (env RUN_ID).')
+    parser.add_argument('--archive-dir', default=os.getenv('ARCHIVE_DIR'),
+                        help='Folder arsip halaman mentah (.warc.gz) (env ARCHIVE_DIR).')
+    parser.add_argument('--replay', default=os.getenv('REPLAY_SNAPSHOT'),
+                        help="Proses ulang snapshot arsip (ID atau 'latest') tanpa jaringan (env REPLAY_SNAPSHOT).")
+    parser.add_argument('--profile-dir', default=os.getenv('PROFILE_DIR'),
+                        help='Aktifkan profil CPU/memori per tahap; artefak ditulis ke <folder>/<run ID> (env PROFILE_DIR).')
+    args = parser.parse_args(argv)
+    # argparse tidak memeriksa default (dari SINKS) terhadap `choices`.
+    unknown = [name for name in args.sinks if name not in SINK_SETTINGS]
+    if unknown:
+        parser.error(f"SINKS berisi sink tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(SINK_NAMES)}).")
+    return args
+
+def load_config(args: argparse.Namespace = None):
+    """
+    Menyusun konfigurasi run dari argumen CLI dan variabel lingkungan (.env).
+    Hanya konfigurasi sink yang dipilih yang wajib ada.
+
+    Args:
+        args (argparse.Namespace): Hasil parse_args(); None = hanya dari variabel lingkungan.
+
+    Returns:
+        tuple atau None: (config, metrics), atau None jika konfigurasi wajib belum diatur.
+    """
+    if args is None:
+        args = parse_args([])
+
+    settings = {
+        'csv_file_path': args.csv_file,
+        'gsheet_id': os.getenv('GSHEET_ID'),
+        'service_account_file': os.getenv('SERVICE_ACCOUNT_FILE'),
+        'db_url': os.getenv('DB_URL'),
+        'db_table_name': os.getenv('DB_TABLE_NAME'),
+        'parquet_dir': args.parquet_dir,
+        'history_path': args.history_path,
+        'query_snapshot_path': args.query_snapshot,
+    }
+    missing = [env_name for sink in args.sinks for key, env_name in SINK_SETTINGS[sink].items() if not settings[key]]
+    if missing:
+        logging.error(f"Konfigurasi sink belum diatur: {', '.join(missing)}. Pipeline berhenti.")
+        return None
+    if args.replay and not args.archive_dir:
+        logging.error("--replay membutuhkan --archive-dir (ARCHIVE_DIR). Pipeline berhenti.")
+        return None
+    if args.role == 'coordinator' and not os.getenv('WORK_QUEUE_URL'):
+        logging.error("CRAWL_ROLE=coordinator membutuhkan WORK_QUEUE_URL. Pipeline berhenti.")
+        return None
+    if args.engine == 'async':
+        if args.role == 'coordinator':
+            logging.error("CRAWL_ROLE=coordinator tidak didukung mesin async (EXTRACT_ENGINE=async). Pipeline berhenti.")
+            return None
+        if args.replay:
+            logging.error("--replay (REPLAY_SNAPSHOT) tidak didukung mesin async (EXTRACT_ENGINE=async); "
+                          "replay memakai mesin thread. Pipeline berhenti.")
+            return None
+        ignored = [name for name, value in (('PAGE_CACHE_PATH', os.getenv('PAGE_CACHE_PATH')),
+                                            ('CHECKPOINT_PATH', os.getenv('CHECKPOINT_PATH')),
+                                            ('STREAM_BATCH_PAGES', int(os.getenv('STREAM_BATCH_PAGES', '0')) > 0),
+                                            ('ARCHIVE_DIR', args.archive_dir))
+                   if value]
+        if ignored:
+            logging.warning(f"{', '.join(ignored)} hanya didukung mesin thread; diabaikan pada mesin async.")
+    elif int(os.getenv('STREAM_BATCH_PAGES', '0')) > 0 and args.role != 'coordinator':
+        unsupported = [setting for sink, setting, enabled in (
+            ('postgres', 'POSTGRES_LOAD_MODE=upsert', os.getenv('POSTGRES_LOAD_MODE') == 'upsert'),
+            ('gdrive', 'GSHEET_LOAD_MODE=diff', os.getenv('GSHEET_LOAD_MODE') == 'diff'),
+        ) if sink in args.sinks and enabled]
+        if unsupported:
+            logging.error(f"{', '.join(unsupported)} tidak didukung mode streaming (STREAM_BATCH_PAGES). "
+                          f"Pipeline berhenti.")
+            return None
+        if os.getenv('IDENTITY_INDEX_PATH'):
+            logging.warning("IDENTITY_INDEX_PATH tidak dipakai pada mode streaming (STREAM_BATCH_PAGES); diabaikan.")
+
+    PAGE_CACHE_PATH = os.getenv('PAGE_CACHE_PATH')
+    CHECKPOINT_PATH = os.getenv('CHECKPOINT_PATH')
+    IDENTITY_INDEX_PATH = os.getenv('IDENTITY_INDEX_PATH')
+    metrics = RunMetrics(run_id=args.run_id)
+
+    config = {
+        'base_url': args.base_url,
+        'total_pages': args.pages,
+        'sinks': list(dict.fromkeys(args.sinks)),
+        'engine': args.engine,
+        'max_workers': args.max_workers,
+        'async_concurrency': int(os.getenv('ASYNC_CONCURRENCY', '100')),
+        'stream_batch_pages': int(os.getenv('STREAM_BATCH_PAGES', '0')),
+        'parser': args.parser,
+        'parse_processes': int(os.getenv('PARSE_PROCESSES', '0')),
+        'page_cache': PageCache(PAGE_CACHE_PATH) if PAGE_CACHE_PATH else None,
+        'checkpoint': CheckpointStore(CHECKPOINT_PATH, metrics.run_id) if CHECKPOINT_PATH else None,
+        'archive': PageArchive(args.archive_dir) if args.archive_dir else None,
+        'replay': args.replay,
+        **settings,
+        'gsheet_load_mode': os.getenv('GSHEET_LOAD_MODE', 'replace'),
+        'postgres_load_mode': os.getenv('POSTGRES_LOAD_MODE', 'replace'),
+        'load_timeout': float(os.getenv('LOAD_TIMEOUT')) if os.getenv('LOAD_TIMEOUT') else None,
+        'identity_index': ProductIndex(IDENTITY_INDEX_PATH) if IDENTITY_INDEX_PATH else None,
+        'metrics_dir': os.getenv('METRICS_DIR'),
+        'profiler': StageProfiler(os.path.join(args.profile_dir, metrics.run_id)) if args.profile_dir else None,
+        'crawl_role': args.role,
+        'work_queue_url': os.getenv('WORK_QUEUE_URL'),
+        'pages_per_item': int(os.getenv('PAGES_PER_ITEM', '10')),
+        'lease_seconds': float(os.getenv('LEASE_SECONDS', '300')),
+    }
+
+    logging.info(f"Memulai ETL Pipeline (run ID: {metrics.run_id})...")
+    if config['checkpoint'] is not None:
+        logging.info(f"Checkpoint aktif di {CHECKPOINT_PATH}. Jalankan ulang dengan RUN_ID={metrics.run_id} "
+                     f"untuk melanjutkan run ini jika terhenti.")
+    return config, metrics
+
+def write_metrics(config: dict, metrics: RunMetrics) -> None:
+    """Menulis laporan metrik run jika METRICS_DIR diatur, dan artefak profil jika PROFILE_DIR diatur."""
+    if config['metrics_dir']:
+        metrics.write_json(os.path.join(config['metrics_dir'], f"run_{metrics.run_id}.json"))
+        metrics.write_prometheus(os.path.join(config['metrics_dir'], "etl.prom"))
+    if config['profiler'] is not None:
+        config['profiler'].write()
+
+def close_resources(config: dict) -> None:
+    """Menutup cache halaman, checkpoint, indeks identitas, dan arsip yang dibuka load_config()."""
+    for key in ('page_cache', 'checkpoint', 'identity_index', 'archive'):
+        if config[key] is not None:
+            config[key].close()
+
+def complete_checkpoint(config: dict, failed_sinks: list) -> None:
+    """
+    Menandai run checkpoint selesai hanya jika semua sink berhasil. Jika ada sink
+    yang gagal, run dibiarkan bisa dilanjutkan agar load bisa diulang dengan RUN_ID yang sama.
+    """
+    checkpoint = config['checkpoint']
+    if checkpoint is None:
+        return
+    if failed_sinks:
+        logging.warning(f"Sink {', '.join(failed_sinks)} gagal; run tidak ditandai selesai. Jalankan ulang dengan "
+                        f"RUN_ID={checkpoint.run_id} untuk mengulang load dari checkpoint.")
         return
+    checkpoint.mark_complete()
 
-    BASE_URL = "https://fashion-studio.dicoding.dev"
-    TOTAL_PAGES = 50
+def profile_stage(config: dict, name: str, cpu: bool = True):
+    """Context manager profil tahap `name` jika mode profil aktif; tanpa efek jika tidak."""
+    return config['profiler'].stage(name, cpu=cpu) if config['profiler'] is not None else nullcontext()
 
-    logging.info("Memulai ETL Pipeline...")
+def main(argv: list = None):
+    """
+    Fungsi utama untuk menjalankan pipeline ETL.
+
+    Contoh: `python main.py --sinks csv --csv-file products.csv --pages 5`.
+    """
+    args = parse_args(argv)
+    if args.role == 'worker':
+        main_worker(args)
+        return
+    loaded = load_config(args)
+    if loaded is None:
+        return
+    config, metrics = loaded
+    try:
+        if config['engine'] == 'async':
+            asyncio.run(run_pipeline_async(config, metrics))
+        else:
+            run_pipeline(config, metrics)
+    finally:
+        write_metrics(config, metrics)
+        close_resources(config)
+
+def main_worker(args: argparse.Namespace):
+    """
+    Menjalankan worker crawl terdistribusi (--role worker). Worker hanya
+    butuh WORK_QUEUE_URL dan RUN_ID yang sama dengan coordinator; konfigurasi
+    sink tidak diperlukan karena load dilakukan coordinator.
+    """
+    from utils.distributed import WorkQueue, run_worker
+
+    queue_url = os.getenv('WORK_QUEUE_URL')
+    if not queue_url or not args.run_id:
+        logging.error("Worker membutuhkan WORK_QUEUE_URL dan RUN_ID (--run-id). Worker berhenti.")
+        return
+    queue = WorkQueue(queue_url, args.run_id, lease_seconds=float(os.getenv('LEASE_SECONDS', '300')))
+    run_worker(queue, max_workers=args.max_workers, parser=args.parser, wait_for_work=True)
+
+async def main_async(argv: list = None):
+    """
+    Versi async dari main() untuk dijalankan di dalam event loop yang sudah ada,
+    misalnya job runner async: `await main_async([])`. Extract selalu memakai
+    mesin asyncio.
+    """
+    args = parse_args(argv)
+    args.engine = 'async'
+    loaded = load_config(args)
+    if loaded is None:
+        return
+    config, metrics = loaded
+    try:
+        await run_pipeline_async(config, metrics)
+    finally:
+        await asyncio.to_thread(write_metrics, config, metrics)
+        close_resources(config)
+
+def run_pipeline(config: dict, metrics: RunMetrics) -> None:
+    """
+    Menjalankan tahap extract, transform, dan load sambil mencatat metrik.
+
+    Args:
+        config (dict): Konfigurasi run yang disusun oleh load_config().
+        metrics (RunMetrics): Penampung metrik run.
+    """
+    if config['crawl_role'] == 'coordinator':
+        run_coordinated_crawl(config, metrics)
+        return
+
+    if config['stream_batch_pages'] > 0:
+        logging.info(f"Mode streaming aktif ({config['stream_batch_pages']} halaman per batch).")
+        batches = iter_extract_batches(config['base_url'], config['total_pages'],
+                                       batch_pages=config['stream_batch_pages'],
+                                       max_workers=config['max_workers'], parser=config['parser'],
+                                       parse_processes=config['parse_processes'],
+                                       cache=config['page_cache'], checkpoint=config['checkpoint'],
+                                       archive=config['archive'], replay=config['replay'],
+                                       metrics=metrics)
+        engine = None
+        try:
+            # Satu engine PostgreSQL untuk semua batch, bukan engine baru per batch.
+            engine = postgres_engine(config['db_url']) if 'postgres' in config['sinks'] else None
+            streaming_sinks = {
+                'csv': partial(load_to_csv, file_path=config['csv_file_path']),
+                'gdrive': partial(load_to_gdrive, sheet_id=config['gsheet_id'],
+                                  creds_path=config['service_account_file']),
+                'postgres': partial(load_to_postgres, db_url=config['db_url'], table_name=config['db_table_name'],
+                                    engine=engine),
+                'parquet': partial(load_to_parquet, base_dir=config['parquet_dir']),
+                'history': partial(load_to_history, path=config['history_path']),
+                'query': partial(load_to_query_snapshot, path=config['query_snapshot_path']),
+            }
+            sinks = [streaming_sinks[name] for name in config['sinks']]
+            if config['profiler'] is not None:
+                # Sink berjalan di thread load-consumer; setiap panggilan per batch diprofil dan dijumlahkan.
+                sinks = [config['profiler'].wrap(f"load_{name}", sink) for name, sink in zip(config['sinks'], sinks)]
+            # Sink diprofil dengan cProfile di thread load-consumer, jadi tahap streaming hanya mencatat waktu dan memori.
+            with metrics.stage('streaming'), profile_stage(config, 'streaming', cpu=False):
+                summary = run_streaming_pipeline(batches, sinks, metrics=metrics)
+            failed_sinks = list(summary['failed_sinks'])
+            if 'query' in config['sinks']:
+                # Batch snapshot query ditulis ke staging; layanan query baru melihatnya setelah semua batch masuk.
+                if 'load_to_query_snapshot' in failed_sinks:
+                    logging.warning("Sink query gagal; snapshot query lama tidak diganti.")
+                elif not publish_query_snapshot(config['query_snapshot_path']):
+                    failed_sinks.append('load_to_query_snapshot')
+        except Exception as e:
+            logging.error(f"Error besar pada pipeline streaming: {e}")
+            return
+        finally:
+            if engine is not None:
+                engine.dispose()
+        complete_checkpoint(config, failed_sinks)
+        logging.info("="*30)
+        logging.info("ETL Pipeline Selesai.")
+        return
 
     logging.info("="*30)
     logging.info("[1/3] Memulai Tahap Extract...")
     try:
-        raw_df = extract_data(BASE_URL, TOTAL_PAGES)
+        with metrics.stage('extract'), profile_stage(config, 'extract'):
+            raw_df = extract_data(config['base_url'], config['total_pages'], max_workers=config['max_workers'],
+                                  parser=config['parser'], parse_processes=config['parse_processes'],
+                                  cache=config['page_cache'], checkpoint=config['checkpoint'],
+                                  archive=config['archive'], replay=config['replay'],
+                                  metrics=metrics)
+        if raw_df.empty:
+            logging.warning("Ekstraksi tidak menghasilkan data. Pipeline berhenti.")
+            return
+        logging.info(f"Extract Selesai. {len(raw_df)} data mentah didapat.")
+    except Exception as e:
+        logging.error(f"Error besar pada Tahap Extract: {e}")
+        return
+
+    transform_and_load(raw_df, config, metrics)
+
+def run_coordinated_crawl(config: dict, metrics: RunMetrics) -> None:
+    """
+    Tahap extract terdistribusi: halaman dibagi ke worker lewat antrian kerja
+    di WORK_QUEUE_URL, lalu hasil semua worker digabung menjadi satu snapshot
+    sebelum transform dan load.
+
+    Args:
+        config (dict): Konfigurasi run yang disusun oleh load_config().
+        metrics (RunMetrics): Penampung metrik run.
+    """
+    from utils.distributed import WorkQueue, run_coordinator
+
+    logging.info("="*30)
+    logging.info(f"[1/3] Memulai Tahap Extract terdistribusi (run ID: {metrics.run_id})...")
+    queue = WorkQueue(config['work_queue_url'], metrics.run_id, lease_seconds=config['lease_seconds'])
+    try:
+        with metrics.stage('extract'), profile_stage(config, 'extract'):
+            raw_df = run_coordinator(queue, config['base_url'], config['total_pages'],
+                                     pages_per_item=config['pages_per_item'])
+        if raw_df.empty:
+            logging.warning("Ekstraksi tidak menghasilkan data. Pipeline berhenti.")
+            return
+        logging.info(f"Extract Selesai. {len(raw_df)} data mentah didapat dari semua worker.")
+    except Exception as e:
+        logging.error(f"Error besar pada Tahap Extract terdistribusi: {e}")
+        return
+
+    transform_and_load(raw_df, config, metrics)
+
+async def run_pipeline_async(config: dict, metrics: RunMetrics) -> None:
+    """
+    Seperti run_pipeline, tetapi tahap extract memakai mesin asyncio
+    (extract_data_async) di event loop pemanggil. Transform dan load dijalankan
+    di thread terpisah agar event loop tidak terblokir.
+
+    Args:
+        config (dict): Konfigurasi run yang disusun oleh load_config().
+        metrics (RunMetrics): Penampung metrik run.
+    """
+    from utils.async_extract import extract_data_async
+
+    logging.info("="*30)
+    logging.info("[1/3] Memulai Tahap Extract (async)...")
+    parse_executor = ProcessPoolExecutor(config['parse_processes']) if config['parse_processes'] > 0 else None
+    try:
+        with metrics.stage('extract'), profile_stage(config, 'extract'):
+            raw_df = await extract_data_async(config['base_url'], config['total_pages'],
+                                              concurrency=config['async_concurrency'], parser=config['parser'],
+                                              parse_executor=parse_executor, metrics=metrics)
         if raw_df.empty:
             logging.warning("Ekstraksi tidak menghasilkan data. Pipeline berhenti.")
             return
@@ -38,33 +412,97 @@ def main():
     except Exception as e:
         logging.error(f"Error besar pada Tahap Extract: {e}")
         return
+    finally:
+        if parse_executor is not None:
+            parse_executor.shutdown()
+
+    await asyncio.to_thread(transform_and_load, raw_df, config, metrics)
+
+def transform_and_load(raw_df, config: dict, metrics: RunMetrics) -> None:
+    """
+    Tahap transform dan load untuk data mentah hasil extract (sinkron maupun async).
 
+    Args:
+        raw_df (pd.DataFrame): Data mentah hasil extract.
+        config (dict): Konfigurasi run.
+        metrics (RunMetrics): Penampung metrik run.
+    """
     logging.info("="*30)
     logging.info("[2/3] Memulai Tahap Transform...")
     try:
-        cleaned_df = transform_data(raw_df)
+        with metrics.stage('transform'), profile_stage(config, 'transform'):
+            cleaned_df = transform_data(raw_df, metrics=metrics)
         if cleaned_df.empty:
             logging.warning("Transformasi tidak menghasilkan data (mungkin semua data invalid). Pipeline berhenti.")
             return
         logging.info(f"Transform Selesai. {len(cleaned_df)} data bersih siap di-load.")
         logging.info("Contoh data bersih:")
         logging.info(f"\n{cleaned_df.head()}")
-        logging.info(f"\nInfo Tipe Data:\n{cleaned_df.info()}")
+        info_buffer = io.StringIO()
+        cleaned_df.info(buf=info_buffer)
+        logging.info(f"\nInfo Tipe Data:\n{info_buffer.getvalue()}")
     except Exception as e:
         logging.error(f"Error besar pada Tahap Transform: {e}")
         return
 
+    changes = None
+    # Indeks identitas mencerminkan isi tabel PostgreSQL tujuan upsert, jadi hanya dipakai untuk sink itu.
+    postgres_delta = 'postgres' in config['sinks'] and config['postgres_load_mode'] == 'upsert'
+    if config['identity_index'] is not None and not postgres_delta:
+        logging.warning("IDENTITY_INDEX_PATH hanya dipakai untuk sink postgres dengan POSTGRES_LOAD_MODE=upsert; "
+                        "indeks produk tidak dipakai pada run ini.")
+    elif config['identity_index'] is not None:
+        with metrics.stage('identity'), profile_stage(config, 'identity'):
+            changes = config['identity_index'].classify(cleaned_df)
+
     logging.info("="*30)
     logging.info("[3/3] Memulai Tahap Load...")
 
-    load_to_csv(cleaned_df, CSV_FILE_PATH)
+    sinks = {}
+    if 'csv' in config['sinks']:
+        sinks['csv'] = partial(load_to_csv, file_path=config['csv_file_path'])
+    if 'gdrive' in config['sinks']:
+        gdrive_load = sync_to_gdrive if config['gsheet_load_mode'] == 'diff' else load_to_gdrive
+        sinks['gdrive'] = partial(gdrive_load, sheet_id=config['gsheet_id'], creds_path=config['service_account_file'])
+    if 'postgres' in config['sinks']:
+        if config['postgres_load_mode'] == 'upsert' and changes is not None:
+            # Dengan indeks identitas, PostgreSQL hanya menerima baris baru/berubah dan kunci yang hilang.
+            delta = changed_rows(changes)
+            sinks['postgres'] = lambda df: load_to_postgres_upsert(delta, config['db_url'], config['db_table_name'],
+                                                                   delete_keys=changes['deleted'])
+        elif config['postgres_load_mode'] == 'upsert':
+            sinks['postgres'] = partial(load_to_postgres_upsert, db_url=config['db_url'],
+                                        table_name=config['db_table_name'], delete_missing=True)
+        else:
+            sinks['postgres'] = partial(load_to_postgres, db_url=config['db_url'], table_name=config['db_table_name'])
+    if 'parquet' in config['sinks']:
+        sinks['parquet'] = partial(load_to_parquet, base_dir=config['parquet_dir'], mode='overwrite')
+    if 'history' in config['sinks']:
+        sinks['history'] = partial(load_to_history, path=config['history_path'])
+    if 'query' in config['sinks']:
+        sinks['query'] = partial(load_to_query_snapshot, path=config['query_snapshot_path'])
+
+    max_workers = None
+    if config['profiler'] is not None:
+        # tracemalloc mencatat semua thread, jadi sink diprofil satu per satu.
+        sinks = {name: config['profiler'].wrap(f"load_{name}", sink) for name, sink in sinks.items()}
+        max_workers = 1
+
+    with metrics.stage('load'):
+        results = dispatch_loads(cleaned_df, sinks, timeout=config['load_timeout'], max_workers=max_workers,
+                                 metrics=metrics)
 
-    load_to_gdrive(cleaned_df, GSHEET_ID, SERVICE_ACCOUNT_FILE)
+    for name, result in results.items():
+        logging.info(f"Sink {name}: {result['status']} ({result['seconds']:.2f} detik)")
 
-    load_to_postgres(cleaned_df, DB_URL, DB_TABLE_NAME)
-    
+    if changes is not None:
+        if results['postgres']['status'] == 'ok':
+            config['identity_index'].commit(changes)
+        else:
+            logging.warning("Sink postgres gagal; indeks produk tidak diperbarui agar delta dikirim ulang run berikutnya.")
+    complete_checkpoint(config, [name for name, result in results.items() if result['status'] != 'ok'])
     logging.info("="*30)
     logging.info("ETL Pipeline Selesai.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
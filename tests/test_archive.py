@@ -0,0 +1,74 @@
+import gzip
+import pandas as pd
+import pytest
+import requests
+from datetime import datetime
+from benchmarks.synthetic import SyntheticCatalog
+from benchmarks.server import CatalogServer
+from utils.archive import PageArchive
+from utils.extract import extract_data
+from tests.test_extract import MOCK_PAGE_2_HTML
+
+def test_archive_roundtrip(tmp_path):
+    """Test halaman yang diarsipkan bisa dibaca ulang apa adanya dan file tetap gzip/WARC yang valid."""
+    archive = PageArchive(str(tmp_path))
+    snapshot = archive.begin('http://example.com', datetime(2024, 5, 1, 8, 0, 0))
+    archive.record(snapshot, 'http://example.com/', 200, 'Kaos Biru — Rp 10.000'.encode('utf-8'), 'utf-8')
+    archive.record(snapshot, 'http://example.com/page2', 404, b'Not Found', None)
+
+    assert snapshot == '2024-05-01T08-00-00'
+    assert archive.read(snapshot, 'http://example.com/') == {
+        'status': 200, 'charset': 'utf-8', 'body': 'Kaos Biru — Rp 10.000'.encode('utf-8')}
+    assert archive.read(snapshot, 'http://example.com/page2')['status'] == 404
+    assert archive.read(snapshot, 'http://example.com/page3') is None
+    archive.close()
+
+    with gzip.open(tmp_path / f'{snapshot}.warc.gz', 'rb') as file:
+        assert file.read().count(b'WARC/1.1\r\nWARC-Type: response') == 2
+
+def test_replay_matches_live_extract(tmp_path):
+    """Test replay dari arsip menghasilkan DataFrame yang sama (termasuk timestamp) tanpa request HTTP."""
+    catalog = SyntheticCatalog(4, cards_per_page=5, malformed_ratio=0.2, seed=3)
+    archive = PageArchive(str(tmp_path))
+
+    with CatalogServer(catalog) as server:
+        live = extract_data(server.base_url, total_pages=None, max_workers=2, parser='lxml', archive=archive)
+        requests_sent = server.stats['requests']
+        replayed = extract_data(server.base_url, total_pages=6, max_workers=3, parser='bs4',
+                                archive=archive, replay='latest')
+        assert server.stats['requests'] == requests_sent
+
+    assert len(live) == 20
+    pd.testing.assert_frame_equal(replayed, live)
+
+def test_replay_rejects_unknown_snapshot_and_other_site(tmp_path):
+    """Test replay menolak snapshot yang tidak ada atau milik base URL lain."""
+    archive = PageArchive(str(tmp_path))
+    archive.begin('http://example.com', datetime(2024, 5, 1))
+
+    with pytest.raises(ValueError):
+        extract_data('http://example.com', archive=archive, replay='2023-01-01T00-00-00')
+    with pytest.raises(ValueError):
+        extract_data('http://other.example.com', archive=archive, replay='latest')
+    with pytest.raises(ValueError):
+        extract_data('http://example.com', replay='latest')
+
+def test_replay_keeps_error_pages_as_errors(tmp_path, requests_mock):
+    """Test halaman 5xx dan request gagal di-replay sebagai error (dilewati), bukan 404 yang menghentikan crawl."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    pagination = '<ul class="pagination"><li><span class="page-link">Page 1 of 4</span></li></ul>'
+    requests_mock.get(f"{base_url}/", text=MOCK_PAGE_2_HTML.replace('</body>', pagination + '</body>'))
+    requests_mock.get(f"{base_url}/page2", status_code=503)
+    requests_mock.get(f"{base_url}/page3", exc=requests.ConnectionError)
+    requests_mock.get(f"{base_url}/page4", text=MOCK_PAGE_2_HTML)
+    archive = PageArchive(str(tmp_path))
+
+    live = extract_data(base_url, max_retries=0, archive=archive)
+    assert archive.read(archive.resolve('latest'), f"{base_url}/page2")['status'] == 503
+    requests_mock.reset_mock()
+    replayed = extract_data(base_url, archive=archive, replay='latest')
+    archive.close()
+
+    assert requests_mock.call_count == 0
+    assert len(live) == 4
+    pd.testing.assert_frame_equal(replayed, live)
@@ -0,0 +1,36 @@
+import asyncio
+import pandas as pd
+import pytest
+from benchmarks.synthetic import SyntheticCatalog
+from benchmarks.server import CatalogServer
+from utils.async_extract import extract_data_async
+from utils.extract import extract_data
+
+@pytest.fixture(scope='module')
+def catalog_server():
+    """Server katalog lokal dengan 5 halaman (sebagian kartu rusak)."""
+    with CatalogServer(SyntheticCatalog(5, cards_per_page=6, malformed_ratio=0.2, seed=11)) as server:
+        yield server
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_extract_data_async_matches_sync(catalog_server, parser):
+    """Test mesin async menghasilkan baris yang sama dengan extract_data, termasuk berhenti di 404."""
+    expected = extract_data(catalog_server.base_url, total_pages=8, max_workers=2, parser=parser)
+    df = asyncio.run(extract_data_async(catalog_server.base_url, total_pages=8, concurrency=4, parser=parser))
+
+    assert len(df) == 30
+    pd.testing.assert_frame_equal(df.drop(columns='timestamp'), expected.drop(columns='timestamp'))
+    assert df['timestamp'].nunique() == 1
+
+def test_extract_data_async_discovers_pages(catalog_server):
+    """Test total_pages=None membaca pagination dan tidak meminta halaman di luar katalog."""
+    before = catalog_server.stats['requests']
+    df = asyncio.run(extract_data_async(catalog_server.base_url, total_pages=None, parser='lxml'))
+
+    assert len(df) == 30
+    assert catalog_server.stats['requests'] - before == 5
+
+def test_extract_data_async_invalid_concurrency():
+    """Test concurrency kurang dari 1 ditolak."""
+    with pytest.raises(ValueError):
+        asyncio.run(extract_data_async("http://127.0.0.1:1", total_pages=1, concurrency=0))
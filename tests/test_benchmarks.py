@@ -0,0 +1,100 @@
+from benchmarks.synthetic import SyntheticCatalog
+from benchmarks.server import CatalogServer
+from benchmarks import run_suite
+from utils.extract import extract_data
+from utils.transform import transform_data
+
+def test_synthetic_catalog_is_deterministic():
+    """Test halaman sintetis selalu sama untuk seed yang sama dan 404 di luar katalog."""
+    catalog = SyntheticCatalog(3, cards_per_page=5, malformed_ratio=0.5, seed=7)
+
+    assert catalog.render_page(2) == SyntheticCatalog(3, cards_per_page=5, malformed_ratio=0.5, seed=7).render_page(2)
+    assert catalog.render_page(4) is None
+    assert catalog.expected_counts()['cards'] == 15
+
+def test_extract_against_local_server():
+    """Test extract + transform terhadap server lokal sesuai jumlah kartu valid katalog."""
+    catalog = SyntheticCatalog(6, cards_per_page=8, malformed_ratio=0.3, seed=1)
+
+    with CatalogServer(catalog) as server:
+        raw_df = extract_data(server.base_url, total_pages=10, max_workers=3, parser='lxml')
+
+    assert len(raw_df) == 48
+    assert len(transform_data(raw_df)) == catalog.expected_counts()['valid']
+
+def test_run_suite_smoke(tmp_path):
+    """Test suite benchmark berjalan offline dan menulis laporan JSON."""
+    report = tmp_path / 'report.json'
+    results = run_suite.main(['--pages', '3', '--cards', '4', '--workers', '2',
+                              '--sinks', 'csv', 'parquet', '--verify', '--json', str(report)])
+
+    stages = results[0]['stages']
+    assert set(stages) == {'extract', 'transform', 'load_csv', 'load_parquet'}
+    assert stages['transform']['rows'] == results[0]['expected_valid_rows']
+    assert report.exists()
+
+def test_extract_discovers_pages_from_local_server():
+    """Test pagination katalog sintetis menjadwalkan tepat jumlah halaman yang ada."""
+    catalog = SyntheticCatalog(7, cards_per_page=3, malformed_ratio=0.0, seed=3)
+
+    with CatalogServer(catalog) as server:
+        raw_df = extract_data(server.base_url, total_pages=None, max_workers=4, parser='lxml')
+        requests_sent = server.stats['requests']
+
+    assert len(raw_df) == 21
+    assert requests_sent == 7
+
+def test_bench_extract_frame_smoke():
+    """Test benchmark pembentukan DataFrame berjalan dan kedua cara menghasilkan frame yang sama."""
+    from benchmarks import bench_extract_frame
+
+    results = bench_extract_frame.main(['--rows', '1000'])
+
+    assert results[0]['same'] is True
+
+def test_bench_async_smoke():
+    """Test benchmark async vs thread berjalan offline dan kedua mesin menghasilkan baris yang sama."""
+    from benchmarks import bench_async
+
+    results = bench_async.main(['--pages', '3', '--cards', '2', '--latency', '0',
+                                '--workers', '2', '--concurrency', '4'])
+
+    assert [result['engine'] for result in results] == ['thread', 'async']
+    assert all(result['same'] for result in results)
+
+def test_parse_importtime_keeps_top_level_modules():
+    """Test parser output -X importtime hanya menjumlahkan import top-level."""
+    from benchmarks.bench_importtime import parse_importtime
+
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       100 |        150 |   json.decoder\n"
+              "import time:       200 |       2000 | json\n")
+
+    assert parse_importtime(stderr) == {'json': 0.002}
+
+def test_bench_archive_smoke():
+    """Test benchmark arsip berjalan offline dan replay menghasilkan frame yang sama dengan crawl live."""
+    from benchmarks import bench_archive
+
+    results = bench_archive.main(['--pages', '3', '--cards', '2', '--latency', '0', '--workers', '2'])
+
+    assert [result['mode'] for result in results] == ['live', 'replay']
+    assert all(result['same'] for result in results)
+
+def test_bench_history_smoke():
+    """Test benchmark riwayat harga berjalan dan hanya menyimpan perubahan."""
+    from benchmarks import bench_history
+
+    result = bench_history.main(['--products', '200', '--snapshots', '3', '--change', '0.1', '--queries', '5'])
+
+    assert 200 <= result['observations'] < 600
+    assert result['price_changes_rows'] > 0
+
+def test_bench_query_smoke():
+    """Test benchmark layanan query berjalan dan hasilnya sama dengan filter pandas."""
+    from benchmarks import bench_query
+
+    results = bench_query.main(['--products', '2000', '--repeat', '3'])
+
+    assert len(results) == len(bench_query.QUERIES)
+    assert all(result['same'] for result in results)
@@ -0,0 +1,74 @@
+import pytest
+import utils.parsers
+from utils.cache import PageCache
+from utils.extract import extract_data
+from tests.test_extract import MOCK_PAGE_2_HTML, MOCK_PAGE_3_HTML
+
+BASE_URL = "https://fashion-studio.dicoding.dev"
+
+@pytest.fixture
+def page_cache(tmp_path):
+    """Fixture cache halaman di folder sementara."""
+    cache = PageCache(str(tmp_path / "pages.sqlite"))
+    yield cache
+    cache.close()
+
+def test_cache_put_and_get(page_cache):
+    """Test entri cache tersimpan beserta validator dan produknya."""
+    page_cache.put(f"{BASE_URL}/", '"abc"', 'Mon, 01 Jan 2024 00:00:00 GMT', 'hash', [{'Title': 'A'}])
+    entry = page_cache.get(f"{BASE_URL}/")
+
+    assert entry['products'] == [{'Title': 'A'}]
+    assert page_cache.conditional_headers(entry) == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+    }
+    assert page_cache.get(f"{BASE_URL}/page2") is None
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test eviction berbasis ukuran menghapus entri yang paling lama tidak dipakai."""
+    cache = PageCache(str(tmp_path / "pages.sqlite"), max_bytes=150)
+    products = [{'Title': 'x' * 40}]
+    cache.put('a', None, None, 'h1', products)
+    cache.put('b', None, None, 'h2', products)
+    cache.touch('a')
+    cache.put('c', None, None, 'h3', products)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert cache.total_bytes() <= 150
+    cache.close()
+
+def test_extract_data_revalidates_with_304(requests_mock, page_cache):
+    """
+    Test run kedua mengirim If-None-Match dan memakai ulang hasil parsing saat 304.
+    Halaman 1 selalu diambil utuh untuk membaca pagination, tetapi tidak di-parse ulang.
+    """
+    requests_mock.get(f"{BASE_URL}/", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{BASE_URL}/page2", text=MOCK_PAGE_3_HTML, headers={'ETag': '"v1"'})
+    first = extract_data(BASE_URL, total_pages=2, cache=page_cache)
+
+    requests_mock.get(f"{BASE_URL}/page2", status_code=304)
+    second = extract_data(BASE_URL, total_pages=2, cache=page_cache)
+
+    page2_requests = [r for r in requests_mock.request_history if r.url == f"{BASE_URL}/page2"]
+    assert page2_requests[-1].headers['If-None-Match'] == '"v1"'
+    assert list(second['Title']) == list(first['Title']) == ['T-shirt 2', 'Hoodie 3']
+    assert page_cache.stats['not_modified'] == 1
+    assert page_cache.stats['unchanged'] == 1
+
+def test_extract_data_skips_parse_when_body_unchanged(requests_mock, page_cache, monkeypatch):
+    """Test body dengan hash sama tidak di-parse ulang."""
+    requests_mock.get(f"{BASE_URL}/", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{BASE_URL}/page2", text=MOCK_PAGE_3_HTML)
+    extract_data(BASE_URL, total_pages=2, cache=page_cache)
+
+    def fail_parse(html):
+        raise AssertionError("parser tidak boleh dipanggil")
+
+    monkeypatch.setitem(utils.parsers.PARSER_BACKENDS, 'bs4', fail_parse)
+    df = extract_data(BASE_URL, total_pages=2, cache=page_cache)
+
+    assert list(df['Title']) == ['T-shirt 2', 'Hoodie 3']
+    assert page_cache.stats['unchanged'] == 2
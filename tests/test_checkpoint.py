@@ -0,0 +1,72 @@
+import pytest
+from datetime import datetime
+from utils.checkpoint import CheckpointStore
+from utils.extract import extract_data
+from tests.test_extract import MOCK_PAGE_2_HTML, MOCK_PAGE_3_HTML
+
+BASE_URL = "https://fashion-studio.dicoding.dev"
+
+def test_checkpoint_record_and_get(tmp_path):
+    """Test hanya halaman berstatus selesai yang dikembalikan dari checkpoint."""
+    store = CheckpointStore(str(tmp_path / "checkpoint.sqlite"), 'run-1')
+    timestamp = datetime(2024, 1, 1, 8, 0)
+    assert store.start(BASE_URL, timestamp) == timestamp
+
+    store.record(1, 'ok', [{'Title': 'A'}])
+    store.record(2, 'error', [])
+
+    assert store.get(1) == {'page': 1, 'status': 'ok', 'products': [{'Title': 'A'}]}
+    assert store.get(2) is None
+    assert store.get(3) is None
+    store.close()
+
+def test_checkpoint_resume_keeps_timestamp_and_rejects_other_site(tmp_path):
+    """Test run yang dilanjutkan memakai timestamp awal dan base URL yang sama."""
+    path = str(tmp_path / "checkpoint.sqlite")
+    first = CheckpointStore(path, 'run-1')
+    first.start(BASE_URL, datetime(2024, 1, 1, 8, 0))
+    first.set_total_pages(7)
+    first.close()
+
+    resumed = CheckpointStore(path, 'run-1')
+    assert resumed.start(BASE_URL, datetime(2024, 1, 2)) == datetime(2024, 1, 1, 8, 0)
+    assert resumed.total_pages == 7
+    with pytest.raises(ValueError):
+        resumed.start("https://example.com", datetime(2024, 1, 2))
+    resumed.close()
+
+def test_checkpoint_rejects_completed_run(tmp_path):
+    """Test run yang sudah ditandai selesai tidak bisa dilanjutkan dengan run ID yang sama."""
+    path = str(tmp_path / "checkpoint.sqlite")
+    first = CheckpointStore(path, 'run-1')
+    first.start(BASE_URL, datetime(2024, 1, 1, 8, 0))
+    first.mark_complete()
+    first.close()
+
+    again = CheckpointStore(path, 'run-1')
+    with pytest.raises(ValueError, match="sudah selesai"):
+        again.start(BASE_URL, datetime(2024, 1, 2))
+    again.close()
+
+def test_extract_data_resumes_only_missing_pages(tmp_path, requests_mock):
+    """Test run ulang dengan run ID yang sama hanya mengambil halaman yang gagal atau belum ada."""
+    path = str(tmp_path / "checkpoint.sqlite")
+    requests_mock.get(f"{BASE_URL}/", text=MOCK_PAGE_2_HTML.replace('T-shirt 2', 'Jacket 1'))
+    requests_mock.get(f"{BASE_URL}/page2", status_code=500)
+    requests_mock.get(f"{BASE_URL}/page3", text=MOCK_PAGE_3_HTML)
+
+    store = CheckpointStore(path, 'run-1')
+    first = extract_data(BASE_URL, total_pages=3, max_retries=0, checkpoint=store)
+    store.close()
+    assert list(first['Title']) == ['Jacket 1', 'Hoodie 3']
+
+    requests_mock.reset_mock()
+    requests_mock.get(f"{BASE_URL}/page2", text=MOCK_PAGE_2_HTML)
+    store = CheckpointStore(path, 'run-1')
+    resumed = extract_data(BASE_URL, total_pages=3, max_retries=0, checkpoint=store)
+    store.close()
+
+    assert [request.path for request in requests_mock.request_history] == ['/page2']
+    assert list(resumed['Title']) == ['Jacket 1', 'Hoodie 3', 'T-shirt 2', 'Hoodie 3']
+    assert resumed['timestamp'].nunique() == 1
+    assert resumed['timestamp'].iloc[0] == first['timestamp'].iloc[0]
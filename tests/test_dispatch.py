@@ -0,0 +1,81 @@
+import threading
+import time
+import pandas as pd
+import pytest
+from utils.dispatch import dispatch_loads
+from utils.metrics import RunMetrics
+
+@pytest.fixture
+def clean_df():
+    return pd.DataFrame({'title': ['A', 'B'], 'price': [160000.0, 320000.0]})
+
+def test_dispatch_loads_runs_sinks_concurrently(clean_df):
+    """Test semua sink berjalan bersamaan dan menerima DataFrame yang sama (tanpa salinan)."""
+    barrier = threading.Barrier(3, timeout=5)
+    received = []
+
+    def sink(df):
+        received.append(df)
+        barrier.wait()
+        return True
+
+    results = dispatch_loads(clean_df, {'csv': sink, 'gdrive': sink, 'postgres': sink})
+
+    assert {name: result['status'] for name, result in results.items()} == {
+        'csv': 'ok', 'gdrive': 'ok', 'postgres': 'ok'
+    }
+    assert all(df is clean_df for df in received)
+
+def test_dispatch_loads_isolates_failures(clean_df, caplog):
+    """Test exception, nilai False, dan timeout hanya memengaruhi sink yang bersangkutan."""
+    release = threading.Event()
+
+    def broken(df):
+        raise RuntimeError("boom")
+
+    def slow(df):
+        release.wait(5)
+        return True
+
+    metrics = RunMetrics()
+    try:
+        results = dispatch_loads(clean_df, {
+            'csv': lambda df: True,
+            'gdrive': broken,
+            'postgres': lambda df: False,
+            'parquet': slow,
+        }, timeout={'parquet': 0.1}, metrics=metrics)
+    finally:
+        release.set()
+
+    assert results['csv']['status'] == 'ok'
+    assert results['gdrive'] == {'status': 'error', 'seconds': results['gdrive']['seconds'], 'error': 'boom'}
+    assert results['postgres']['status'] == 'error'
+    assert results['parquet']['status'] == 'timeout'
+    assert "Error tidak terduga pada sink gdrive: boom" in caplog.text
+    assert metrics.sinks['csv']['status'] == 'ok'
+    assert metrics.sinks['parquet']['status'] == 'timeout'
+    assert metrics.sinks['csv']['rows'] == 2
+
+def test_dispatch_loads_timeout_does_not_block_others(clean_df):
+    """Test sink lambat tidak menahan hasil sink lain melewati batas waktunya."""
+    release = threading.Event()
+
+    def slow(df):
+        release.wait(5)
+        return True
+
+    start = time.perf_counter()
+    try:
+        results = dispatch_loads(clean_df, {'slow': slow, 'fast': lambda df: True}, timeout=0.2)
+    finally:
+        release.set()
+
+    assert time.perf_counter() - start < 2
+    assert results['slow']['status'] == 'timeout'
+    assert results['fast']['status'] == 'ok'
+
+def test_dispatch_loads_invalid_workers(clean_df):
+    """Test max_workers di bawah 1 ditolak."""
+    with pytest.raises(ValueError):
+        dispatch_loads(clean_df, {'csv': lambda df: True}, max_workers=0)
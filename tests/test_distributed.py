@@ -0,0 +1,84 @@
+import threading
+import pandas as pd
+import pytest
+from benchmarks.synthetic import SyntheticCatalog
+from benchmarks.server import CatalogServer
+from utils.distributed import WorkQueue, merge_results, run_coordinator, run_worker
+from utils.extract import extract_data
+
+@pytest.fixture(scope='module')
+def catalog_server():
+    """Server katalog lokal dengan 5 halaman (sebagian kartu rusak)."""
+    with CatalogServer(SyntheticCatalog(5, cards_per_page=6, malformed_ratio=0.2, seed=11)) as server:
+        yield server
+
+@pytest.fixture
+def queue_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'queue.db'}"
+
+def test_workers_merge_matches_extract_data(catalog_server, queue_url):
+    """Test dua worker paralel menghasilkan snapshot yang sama dengan extract_data, termasuk berhenti di 404."""
+    expected = extract_data(catalog_server.base_url, total_pages=8, parser='lxml')
+    coordinator = WorkQueue(queue_url, 'run-1')
+    coordinator.plan(catalog_server.base_url, total_pages=8, pages_per_item=2)
+
+    workers = [threading.Thread(target=run_worker, args=(WorkQueue(queue_url, 'run-1'),),
+                                kwargs={'worker_id': f'w{i}', 'max_workers': 2}) for i in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    df = run_coordinator(coordinator, catalog_server.base_url, total_pages=8, pages_per_item=2, poll_interval=0.1)
+    assert coordinator.progress() == {'done': 4}
+    assert len(df) == 30
+    pd.testing.assert_frame_equal(df.drop(columns='timestamp'), expected.drop(columns='timestamp'))
+    assert df['timestamp'].nunique() == 1
+
+def test_coordinator_plans_discovered_page_count(catalog_server, queue_url):
+    """Test coordinator membaca jumlah halaman dari pagination sebelum membagi item ke worker."""
+    worker = threading.Thread(target=run_worker, args=(WorkQueue(queue_url, 'run-1'),),
+                              kwargs={'worker_id': 'w0', 'poll_interval': 0.1, 'wait_for_work': True})
+    worker.start()
+    coordinator = WorkQueue(queue_url, 'run-1')
+    df = run_coordinator(coordinator, catalog_server.base_url, pages_per_item=2, poll_interval=0.1)
+    worker.join()
+
+    assert coordinator.run_info()['total_pages'] == 5
+    assert coordinator.progress() == {'done': 3}
+    assert len(df) == 30
+
+def test_plan_is_idempotent(queue_url):
+    """Test plan ulang tidak menggandakan item maupun mengganti timestamp run."""
+    queue = WorkQueue(queue_url, 'run-1')
+    assert queue.plan('http://example.com', 25, pages_per_item=10) == 3
+    timestamp = queue.run_info()['extraction_timestamp']
+    assert queue.plan('http://example.com', 25, pages_per_item=10) == 3
+    assert queue.run_info()['extraction_timestamp'] == timestamp
+
+def test_expired_lease_is_reassigned(queue_url):
+    """Test lease kedaluwarsa diambil worker lain dan hasil worker lama ditolak."""
+    queue = WorkQueue(queue_url, 'run-1', lease_seconds=-1)
+    queue.plan('http://example.com', 2, pages_per_item=2)
+
+    stale = queue.lease('stale')
+    fresh = queue.lease('fresh')
+    assert fresh['item_id'] == stale['item_id']
+    assert fresh['attempts'] == 2
+
+    results = [{'page': 1, 'status': 'ok', 'products': [{'title': 'A'}]}]
+    assert queue.complete(stale, 'stale', results) is False
+    assert queue.complete(fresh, 'fresh', results) is True
+    assert list(queue.iter_results()) == results
+
+def test_item_fails_after_max_attempts(queue_url):
+    """Test item yang lease-nya terus kedaluwarsa ditandai 'failed' setelah max_attempts."""
+    queue = WorkQueue(queue_url, 'run-1', lease_seconds=-1, max_attempts=2)
+    queue.plan('http://example.com', 1)
+
+    assert queue.lease('a') is not None
+    assert queue.lease('b') is not None
+    assert queue.lease('c') is None
+    assert queue.progress() == {'failed': 1}
+    assert queue.is_finished()
+    assert merge_results(queue).empty
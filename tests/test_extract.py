@@ -1,7 +1,7 @@
 import pytest
 import requests_mock
 import pandas as pd
-from utils.extract import extract_data
+from utils.extract import extract_data, ProductBuffer
 from datetime import datetime
 
 MOCK_HOME_PAGE_HTML = """
@@ -41,7 +41,12 @@ MOCK_PAGE_3_HTML = """
 </body></html>
 """
 
-def test_extract_data(requests_mock):
+@pytest.fixture(params=['bs4', 'lxml'])
+def parser_backend(request):
+    """Fixture untuk menjalankan test ekstraksi dengan setiap backend parser."""
+    return request.param
+
+def test_extract_data(requests_mock, parser_backend):
     """Test fungsi extract_data (integrasi)."""
     base_url = "https://fashion-studio.dicoding.dev"
 
@@ -51,7 +56,7 @@ def test_extract_data(requests_mock):
 
     requests_mock.get(f"{base_url}/page3", text=MOCK_PAGE_3_HTML)
 
-    df = extract_data(base_url, total_pages=3)
+    df = extract_data(base_url, total_pages=3, parser=parser_backend)
     
     assert isinstance(df, pd.DataFrame)
     assert len(df) == 2
@@ -69,7 +74,7 @@ def test_extract_data(requests_mock):
     assert df.loc[1, 'Title'] == 'Hoodie 3'
     assert df.loc[1, 'Price'] == '$496.88'
 
-def test_extract_data_stop_on_404(requests_mock):
+def test_extract_data_stop_on_404(requests_mock, parser_backend):
     """Test bahwa ekstraksi berhenti jika halaman 404."""
     base_url = "https://fashion-studio.dicoding.dev"
     
@@ -79,15 +84,161 @@ def test_extract_data_stop_on_404(requests_mock):
     requests_mock.get(f"{base_url}/page3", text=MOCK_PAGE_2_HTML)
 
 
-    df = extract_data(base_url, total_pages=3)
+    df = extract_data(base_url, total_pages=3, parser=parser_backend)
     
     assert df.empty 
 
-def test_extract_data_no_data(requests_mock):
+def test_extract_data_no_data(requests_mock, parser_backend):
     """Test jika tidak ada data sama sekali."""
     base_url = "https://fashion-studio.dicoding.dev"
     requests_mock.get(f"{base_url}/", text=MOCK_HOME_PAGE_HTML)
     requests_mock.get(f"{base_url}/page2", text=MOCK_PAGE_3_HTML)
 
-    df = extract_data(base_url, total_pages=2)
-    assert df.empty
\ No newline at end of file
+    df = extract_data(base_url, total_pages=2, parser=parser_backend)
+    assert df.empty
+
+def test_extract_data_concurrent_keeps_page_order(requests_mock, parser_backend):
+    """Test mode konkuren menghasilkan baris dengan urutan halaman yang sama."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    requests_mock.get(f"{base_url}/", text=MOCK_PAGE_2_HTML.replace('T-shirt 2', 'Jacket 1'))
+    requests_mock.get(f"{base_url}/page2", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{base_url}/page3", text=MOCK_PAGE_3_HTML)
+    requests_mock.get(f"{base_url}/page4", text=MOCK_PAGE_2_HTML)
+
+    df = extract_data(base_url, total_pages=4, max_workers=4, parser=parser_backend)
+
+    assert list(df['Title']) == ['Jacket 1', 'Hoodie 3', 'T-shirt 2', 'Hoodie 3']
+
+def test_extract_data_concurrent_stop_on_404(requests_mock, parser_backend):
+    """Test mode konkuren tetap berhenti pada halaman 404."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    requests_mock.get(f"{base_url}/", text=MOCK_HOME_PAGE_HTML)
+    requests_mock.get(f"{base_url}/page2", status_code=404)
+    requests_mock.get(f"{base_url}/page3", text=MOCK_PAGE_2_HTML)
+
+    df = extract_data(base_url, total_pages=3, max_workers=3, parser=parser_backend)
+
+    assert df.empty
+
+def test_extract_data_parse_processes_matches_in_thread(requests_mock, parser_backend):
+    """Test parsing di process pool menghasilkan baris yang sama dengan parsing di thread fetch."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    requests_mock.get(f"{base_url}/", text=MOCK_PAGE_2_HTML.replace('T-shirt 2', 'Jacket 1'))
+    requests_mock.get(f"{base_url}/page2", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{base_url}/page3", text=MOCK_PAGE_3_HTML)
+
+    expected = extract_data(base_url, total_pages=3, max_workers=2, parser=parser_backend)
+    df = extract_data(base_url, total_pages=3, max_workers=2, parser=parser_backend, parse_processes=2)
+
+    pd.testing.assert_frame_equal(df.drop(columns='timestamp'), expected.drop(columns='timestamp'))
+
+def test_extract_data_invalid_parse_processes():
+    """Test parse_processes negatif ditolak."""
+    with pytest.raises(ValueError):
+        extract_data("https://fashion-studio.dicoding.dev", total_pages=1, parse_processes=-1)
+
+def test_extract_data_retries_transient_errors(requests_mock):
+    """Test 5xx dan 429 dicoba ulang sampai halaman berhasil diambil."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    requests_mock.get(f"{base_url}/", [
+        {'status_code': 503},
+        {'status_code': 429, 'headers': {'Retry-After': '0'}},
+        {'text': MOCK_PAGE_2_HTML},
+    ])
+
+    df = extract_data(base_url, total_pages=1, retry_backoff=0)
+
+    assert list(df['Title']) == ['T-shirt 2', 'Hoodie 3']
+    assert requests_mock.call_count == 3
+
+def test_extract_data_logs_non_404_http_error(requests_mock, caplog):
+    """Test HTTP error selain 404 dicatat lalu halaman dilewati."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    requests_mock.get(f"{base_url}/", status_code=403)
+    requests_mock.get(f"{base_url}/page2", text=MOCK_PAGE_2_HTML)
+
+    df = extract_data(base_url, total_pages=2, retry_backoff=0)
+
+    assert len(df) == 2
+    assert "HTTP error saat mengambil halaman 1" in caplog.text
+
+def test_extract_data_discovers_page_count(requests_mock):
+    """Test jumlah halaman dibaca dari pagination dan halaman 1 tidak diambil dua kali."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    pagination = '<ul class="pagination"><li><span class="page-link">Page 1 of 2</span></li></ul>'
+    requests_mock.get(f"{base_url}/", text=MOCK_PAGE_2_HTML.replace('</body>', pagination + '</body>'))
+    requests_mock.get(f"{base_url}/page2", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{base_url}/page3", text=MOCK_PAGE_2_HTML)
+
+    df = extract_data(base_url, total_pages=None)
+
+    assert len(df) == 4
+    assert [request.path for request in requests_mock.request_history] == ['/', '/page2']
+
+def test_extract_data_lone_next_link_does_not_end_crawl(requests_mock):
+    """Test pager yang hanya berisi tautan "Next" tidak dianggap jumlah halaman; crawl berhenti di 404."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    for page in range(1, 6):
+        pager = f'<ul class="pagination"><li class="next"><a href="/page{page + 1}">Next</a></li></ul>'
+        path = '/' if page == 1 else f'/page{page}'
+        requests_mock.get(f"{base_url}{path}", text=MOCK_PAGE_2_HTML.replace('</body>', pager + '</body>'))
+    requests_mock.get(f"{base_url}/page6", status_code=404)
+
+    assert len(extract_data(base_url)) == 10
+    assert requests_mock.request_history[-1].path == '/page6'
+
+def test_extract_data_total_pages_caps_discovered_count(requests_mock):
+    """Test total_pages hanya membatasi jumlah halaman dari pagination, tidak menggantikannya."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    pagination = '<ul class="pagination"><li><span class="page-link">Page 1 of 3</span></li></ul>'
+    requests_mock.get(f"{base_url}/", text=MOCK_PAGE_2_HTML.replace('</body>', pagination + '</body>'))
+    requests_mock.get(f"{base_url}/page2", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{base_url}/page3", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{base_url}/page4", text=MOCK_PAGE_2_HTML)
+
+    assert len(extract_data(base_url, total_pages=10)) == 6
+    assert [request.path for request in requests_mock.request_history] == ['/', '/page2', '/page3']
+
+    requests_mock.reset_mock()
+    assert len(extract_data(base_url, total_pages=2)) == 4
+    assert [request.path for request in requests_mock.request_history] == ['/', '/page2']
+
+def test_product_buffer_matches_list_of_dicts():
+    """Test ProductBuffer menghasilkan DataFrame yang sama dengan DataFrame dari list dict."""
+    timestamp = datetime(2024, 1, 1, 12, 30)
+    products = [
+        {'Title': 'A', 'Price': '$1.00', 'Rating': 'r', 'Colors': 'c', 'Size': 's', 'Gender': 'g'},
+        {'Title': 'B', 'Price': '$2.00', 'Rating': 'r', 'Colors': 'c', 'Size': 's', 'Gender': 'g'},
+    ]
+    buffer = ProductBuffer(timestamp)
+    buffer.extend(products[:1])
+    buffer.extend(products[1:])
+
+    expected = pd.DataFrame([dict(product, timestamp=timestamp) for product in products])
+    assert len(buffer) == 2
+    pd.testing.assert_frame_equal(buffer.to_frame(), expected)
+    assert len(buffer) == 0
+
+def test_extract_data_unknown_parser():
+    """Test backend parser yang tidak dikenal ditolak."""
+    with pytest.raises(ValueError):
+        extract_data("https://fashion-studio.dicoding.dev", total_pages=1, parser='regex')
+
+def test_extract_data_invalid_workers():
+    """Test max_workers kurang dari 1 ditolak."""
+    with pytest.raises(ValueError):
+        extract_data("https://fashion-studio.dicoding.dev", total_pages=1, max_workers=0)
+
+def test_iter_extract_batches(requests_mock, parser_backend):
+    """Test ekstraksi streaming menghasilkan batch per halaman dengan timestamp yang sama."""
+    from utils.extract import iter_extract_batches
+    base_url = "https://fashion-studio.dicoding.dev"
+    requests_mock.get(f"{base_url}/", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{base_url}/page2", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{base_url}/page3", text=MOCK_PAGE_3_HTML)
+
+    batches = list(iter_extract_batches(base_url, total_pages=3, batch_pages=1, parser=parser_backend))
+
+    assert len(batches) == 2
+    assert all(len(batch) == 2 for batch in batches)
+    assert batches[0].loc[0, 'timestamp'] == batches[1].loc[0, 'timestamp']
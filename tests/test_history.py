@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.history import PriceHistory
+
+def _snapshot(timestamp: str, prices: list, ratings: list = None) -> pd.DataFrame:
+    rows = len(prices)
+    return pd.DataFrame({
+        'title': [f'Product {i}' for i in range(rows)],
+        'Price': prices,
+        'Rating': ratings or [4.5] * rows,
+        'colors': [3] * rows,
+        'size': ['M'] * rows,
+        'gender': ['Men'] * rows,
+        'timestamp': pd.Timestamp(timestamp),
+    })
+
+@pytest.fixture
+def history(tmp_path):
+    store = PriceHistory(str(tmp_path / 'history.sqlite'))
+    yield store
+    store.close()
+
+def test_append_stores_only_changes(history):
+    """Test snapshot yang sama tidak menambah observasi; hanya produk berubah yang disimpan."""
+    assert history.append(_snapshot('2024-01-31 10:00', [100.0, 200.0, 300.0])) == 3
+    assert history.append(_snapshot('2024-02-01 10:00', [100.0, 200.0, 300.0])) == 0
+    assert history.append(_snapshot('2024-02-02 10:00', [100.0, 250.0, 300.0], [4.5, 4.5, 3.9])) == 2
+    assert len(history) == 5
+
+    with pytest.raises(ValueError):
+        history.append(_snapshot('2024-01-01 10:00', [1.0]))
+
+def test_product_history_spans_partitions(history):
+    """Test riwayat satu produk lintas partisi bulanan dan pembatasan rentang waktu."""
+    history.append(_snapshot('2024-01-31 10:00', [100.0, 200.0]))
+    history.append(_snapshot('2024-02-15 10:00', [110.0, 200.0]))
+    history.append(_snapshot('2024-03-01 10:00', [120.0, np.nan]))
+
+    result = history.product_history('product 0', 'M', 'Men')
+    assert result['Price'].tolist() == [100.0, 110.0, 120.0]
+    assert result['timestamp'].iloc[-1] == pd.Timestamp('2024-03-01 10:00')
+
+    ranged = history.product_history('Product 0', 'M', 'Men', start='2024-02-01', end='2024-02-29')
+    assert ranged['Price'].tolist() == [100.0, 110.0]
+    assert ranged['timestamp'].tolist() == [pd.Timestamp('2024-02-01'), pd.Timestamp('2024-02-15 10:00')]
+    assert history.product_history('Product 1', 'M', 'Men')['Price'].isna().tolist() == [False, True]
+
+def test_product_history_includes_value_in_effect_at_start(history):
+    """Test produk yang harganya tidak berubah selama rentang tetap mengembalikan nilai yang berlaku saat start."""
+    for observed_at in ('2024-01-10 10:00', '2024-02-10 10:00', '2024-03-10 10:00'):
+        history.append(_snapshot(observed_at, [100.0]))
+
+    ranged = history.product_history('Product 0', 'M', 'Men', start='2024-02-01', end='2024-03-31')
+    assert ranged['Price'].tolist() == [100.0]
+    assert ranged['timestamp'].tolist() == [pd.Timestamp('2024-02-01')]
+    assert history.product_history('Product 0', 'M', 'Men', end='2023-12-31').empty
+
+def test_price_changes_since(history):
+    """Test perubahan harga sejak T berisi harga lama dan baru, tanpa produk baru maupun perubahan rating."""
+    history.append(_snapshot('2024-01-31 10:00', [100.0, 200.0]))
+    history.append(_snapshot('2024-02-15 10:00', [110.0, 200.0], [4.5, 4.0]))
+    history.append(_snapshot('2024-03-01 10:00', [110.0, 150.0, 999.0]))
+
+    changes = history.price_changes('2024-02-01')
+    assert changes[['title', 'old_price', 'Price']].values.tolist() == [
+        ['Product 0', 100.0, 110.0], ['Product 1', 200.0, 150.0]]
+    assert history.price_changes('2024-03-01', until='2024-03-01 10:00')['title'].tolist() == ['Product 1']
+    assert history.price_changes('2025-01-01').empty
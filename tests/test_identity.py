@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+from utils.identity import ProductIndex, changed_rows, product_fingerprint
+
+def make_clean(rows):
+    """Membuat DataFrame bersih dari list (title, price, rating, size, gender)."""
+    titles, prices, ratings, sizes, genders = zip(*rows)
+    return pd.DataFrame({
+        'title': list(titles),
+        'Price': list(prices),
+        'Rating': list(ratings),
+        'colors': [3] * len(rows),
+        'size': pd.Categorical(sizes),
+        'gender': pd.Categorical(genders),
+        'timestamp': pd.Timestamp('2024-01-01'),
+    })
+
+@pytest.fixture
+def product_index(tmp_path):
+    """Fixture indeks produk di folder sementara."""
+    index = ProductIndex(str(tmp_path / "products.sqlite"))
+    yield index
+    index.close()
+
+def test_fingerprint_normalizes_title():
+    """Test fingerprint tidak peka huruf besar/kecil dan spasi, tetapi peka ukuran."""
+    df = make_clean([('T-Shirt  1', 1.0, 4.0, 'M', 'Men'), (' t-shirt 1', 2.0, 3.0, 'M', 'Men'),
+                     ('T-Shirt 1', 1.0, 4.0, 'L', 'Men')])
+    fingerprints = product_fingerprint(df)
+
+    assert fingerprints[0] == fingerprints[1]
+    assert fingerprints[0] != fingerprints[2]
+
+def test_classify_and_commit(product_index):
+    """Test run kedua mengelompokkan baris menjadi baru, berubah, tetap, dan hilang."""
+    first = make_clean([('A', 10.0, 4.0, 'M', 'Men'), ('B', 20.0, 4.5, 'L', 'Women'), ('C', 30.0, 3.0, 'S', 'Men')])
+    changes = product_index.classify(first)
+    assert len(changes['inserted']) == 3
+    product_index.commit(changes)
+
+    second = make_clean([('A', 10.0, 4.0, 'M', 'Men'), ('B', 25.0, 4.5, 'L', 'Women'), ('D', 5.0, 5.0, 'M', 'Men')])
+    changes = product_index.classify(second)
+
+    assert list(changes['inserted']['title']) == ['D']
+    assert list(changes['updated']['title']) == ['B']
+    assert list(changes['unchanged']['title']) == ['A']
+    assert changes['deleted'].to_dict('records') == [{'title': 'C', 'size': 'S', 'gender': 'Men'}]
+    assert list(changed_rows(changes).columns) == list(second.columns)
+
+    product_index.commit(changes)
+    assert len(product_index) == 3
+    changes = product_index.classify(second)
+    assert len(changes['unchanged']) == 3
+    assert changes['deleted'].empty
+
+def test_classify_deletes_old_raw_key_when_title_changes_case(product_index):
+    """Test produk yang judul aslinya berganti huruf besar/kecil mengirim kunci lama ke 'deleted'."""
+    product_index.commit(product_index.classify(make_clean([('Shirt A', 10.0, 4.0, 'M', 'Men'),
+                                                            ('Shirt B', 20.0, 4.0, 'M', 'Men')])))
+
+    changes = product_index.classify(make_clean([('shirt  a', 12.0, 4.0, 'M', 'Men'),
+                                                 ('Shirt B', 25.0, 4.0, 'M', 'Men')]))
+
+    assert list(changes['updated']['title']) == ['shirt  a', 'Shirt B']
+    assert changes['deleted'].to_dict('records') == [{'title': 'Shirt A', 'size': 'M', 'gender': 'Men'}]
+    product_index.commit(changes)
+    assert len(product_index) == 2
+    assert product_index.classify(make_clean([('shirt  a', 12.0, 4.0, 'M', 'Men'),
+                                              ('Shirt B', 25.0, 4.0, 'M', 'Men')]))['deleted'].empty
+
+def test_classify_without_commit_keeps_index(product_index):
+    """Test classify saja tidak mengubah indeks (commit ditunda sampai sink sukses)."""
+    product_index.classify(make_clean([('A', 10.0, 4.0, 'M', 'Men')]))
+
+    assert len(product_index) == 0
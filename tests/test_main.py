@@ -0,0 +1,184 @@
+import json
+import subprocess
+import sys
+import pandas as pd
+import pytest
+import main
+from benchmarks.synthetic import SyntheticCatalog
+from benchmarks.server import CatalogServer
+
+_ENV_VARS = ['SINKS', 'BASE_URL', 'TOTAL_PAGES', 'CSV_FILE_PATH', 'PARQUET_DIR', 'GSHEET_ID', 'SERVICE_ACCOUNT_FILE',
+             'DB_URL', 'DB_TABLE_NAME', 'CRAWL_ROLE', 'EXTRACT_ENGINE', 'RUN_ID', 'PAGE_CACHE_PATH',
+             'CHECKPOINT_PATH', 'IDENTITY_INDEX_PATH', 'METRICS_DIR', 'STREAM_BATCH_PAGES', 'ARCHIVE_DIR', 'REPLAY_SNAPSHOT',
+             'HISTORY_PATH', 'PROFILE_DIR', 'QUERY_SNAPSHOT_PATH']
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in _ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+
+def test_load_config_requires_only_selected_sinks():
+    """Test hanya konfigurasi sink yang dipilih yang wajib ada."""
+    assert main.load_config(main.parse_args([])) is None
+    assert main.load_config(main.parse_args(['--sinks', 'csv'])) is None
+
+    config, _ = main.load_config(main.parse_args(['--sinks', 'csv', 'csv', '--csv-file', 'out.csv', '--pages', '3']))
+    assert config['sinks'] == ['csv']
+    assert config['total_pages'] == 3
+    assert config['base_url'] == main.DEFAULT_BASE_URL
+
+def test_load_config_async_engine_rejects_or_warns_unsupported_options(tmp_path, monkeypatch, caplog):
+    """Test mesin async menolak peran coordinator dan memperingatkan opsi khusus mesin thread."""
+    monkeypatch.setenv('WORK_QUEUE_URL', str(tmp_path / 'queue.sqlite'))
+    base = ['--sinks', 'csv', '--csv-file', 'out.csv', '--engine', 'async']
+    assert main.load_config(main.parse_args(base + ['--role', 'coordinator'])) is None
+    assert main.load_config(main.parse_args(base + ['--archive-dir', str(tmp_path), '--replay', 'latest'])) is None
+    assert "--replay (REPLAY_SNAPSHOT) tidak didukung mesin async" in caplog.text
+
+    monkeypatch.setenv('CHECKPOINT_PATH', str(tmp_path / 'checkpoint.sqlite'))
+    monkeypatch.setenv('STREAM_BATCH_PAGES', '2')
+    config, _ = main.load_config(main.parse_args(base))
+    main.close_resources(config)
+    assert "CHECKPOINT_PATH, STREAM_BATCH_PAGES hanya didukung mesin thread" in caplog.text
+
+def test_load_config_streaming_rejects_snapshot_only_load_modes(monkeypatch, caplog):
+    """Test mode streaming menolak upsert PostgreSQL dan diff Google Sheets alih-alih mengabaikannya diam-diam."""
+    monkeypatch.setenv('STREAM_BATCH_PAGES', '2')
+    monkeypatch.setenv('DB_URL', 'postgresql://localhost/test')
+    monkeypatch.setenv('DB_TABLE_NAME', 'products')
+    monkeypatch.setenv('POSTGRES_LOAD_MODE', 'upsert')
+    assert main.load_config(main.parse_args(['--sinks', 'postgres'])) is None
+    assert "POSTGRES_LOAD_MODE=upsert tidak didukung mode streaming" in caplog.text
+
+    monkeypatch.setenv('POSTGRES_LOAD_MODE', 'replace')
+    config, _ = main.load_config(main.parse_args(['--sinks', 'postgres']))
+    assert config['stream_batch_pages'] == 2
+
+def test_parse_args_rejects_unknown_sinks_from_env(monkeypatch, capsys):
+    """Test sink tidak dikenal dari SINKS dilaporkan lewat error argparse, bukan KeyError."""
+    monkeypatch.setenv('SINKS', 'csv,sheets')
+    with pytest.raises(SystemExit) as error:
+        main.parse_args([])
+    assert error.value.code == 2
+    assert "sink tidak dikenal: sheets" in capsys.readouterr().err
+
+    monkeypatch.setenv('SINKS', 'csv, parquet')
+    assert main.parse_args([]).sinks == ['csv', 'parquet']
+
+def test_main_csv_only_run(tmp_path):
+    """Test run CSV saja lewat CLI terhadap server lokal, tanpa variabel sink lain."""
+    catalog = SyntheticCatalog(3, cards_per_page=4, malformed_ratio=0.0, seed=5)
+    csv_path = tmp_path / 'products.csv'
+
+    with CatalogServer(catalog) as server:
+        main.main(['--base-url', server.base_url, '--pages', '5', '--sinks', 'csv', '--csv-file', str(csv_path)])
+
+    assert len(pd.read_csv(csv_path)) == catalog.expected_counts()['valid']
+
+def test_import_main_skips_heavy_sink_dependencies():
+    """Test import main tidak memuat Google API, SQLAlchemy, maupun aiohttp."""
+    code = ("import sys, main; "
+            "print(','.join(m for m in ('googleapiclient', 'google.oauth2', 'sqlalchemy', 'aiohttp') if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == ''
+
+def test_main_profile_mode_writes_stage_artifacts(tmp_path):
+    """Test --profile-dir menulis profil per tahap, termasuk setiap sink."""
+    catalog = SyntheticCatalog(2, cards_per_page=4, malformed_ratio=0.0, seed=5)
+
+    with CatalogServer(catalog) as server:
+        main.main(['--base-url', server.base_url, '--pages', '3', '--sinks', 'csv', '--csv-file',
+                   str(tmp_path / 'products.csv'), '--profile-dir', str(tmp_path / 'profiles'), '--run-id', 'run-a'])
+
+    run_dir = tmp_path / 'profiles' / 'run-a'
+    assert {'extract.prof', 'transform.prof', 'load_csv.prof', 'profile.json'} <= {p.name for p in run_dir.iterdir()}
+
+def test_main_profile_mode_profiles_streaming_sinks(tmp_path, monkeypatch):
+    """Test --profile-dir pada mode streaming ikut memprofil sink di thread load-consumer."""
+    monkeypatch.setenv('STREAM_BATCH_PAGES', '1')
+    catalog = SyntheticCatalog(3, cards_per_page=4, malformed_ratio=0.0, seed=5)
+
+    with CatalogServer(catalog) as server:
+        main.main(['--base-url', server.base_url, '--pages', '3', '--sinks', 'csv', '--csv-file',
+                   str(tmp_path / 'products.csv'), '--profile-dir', str(tmp_path / 'profiles'), '--run-id', 'run-s'])
+
+    report = json.loads((tmp_path / 'profiles' / 'run-s' / 'profile.json').read_text(encoding='utf-8'))
+    assert report['stages']['load_csv']['calls'] == 3
+    assert report['stages']['streaming']['cpu_top'] == []
+    assert (tmp_path / 'profiles' / 'run-s' / 'load_csv.prof').exists()
+    assert len(pd.read_csv(tmp_path / 'products.csv')) == catalog.expected_counts()['valid']
+
+def test_main_streaming_publishes_query_snapshot_once(tmp_path, monkeypatch):
+    """Test mode streaming menulis batch snapshot query ke staging lalu menerbitkannya sekali di akhir."""
+    monkeypatch.setenv('STREAM_BATCH_PAGES', '1')
+    snapshot_path = tmp_path / 'query.parquet'
+    catalog = SyntheticCatalog(3, cards_per_page=4, malformed_ratio=0.0, seed=5)
+
+    with CatalogServer(catalog) as server:
+        main.main(['--base-url', server.base_url, '--pages', '3', '--sinks', 'query',
+                   '--query-snapshot', str(snapshot_path)])
+
+    assert len(pd.read_parquet(snapshot_path)) == catalog.expected_counts()['valid']
+    assert not (tmp_path / 'query.parquet.staging').exists()
+
+def test_main_closes_opened_resources(tmp_path, monkeypatch):
+    """Test main menutup cache, checkpoint, indeks identitas, dan arsip setelah run."""
+    closed = []
+    for resource in (main.PageCache, main.CheckpointStore, main.ProductIndex, main.PageArchive):
+        monkeypatch.setattr(resource, 'close', lambda self, name=resource.__name__: closed.append(name))
+    monkeypatch.setenv('PAGE_CACHE_PATH', str(tmp_path / 'cache.sqlite'))
+    monkeypatch.setenv('CHECKPOINT_PATH', str(tmp_path / 'checkpoint.sqlite'))
+    monkeypatch.setenv('IDENTITY_INDEX_PATH', str(tmp_path / 'identity.sqlite'))
+    catalog = SyntheticCatalog(2, cards_per_page=4, malformed_ratio=0.0, seed=5)
+
+    with CatalogServer(catalog) as server:
+        main.main(['--base-url', server.base_url, '--pages', '2', '--sinks', 'csv', '--csv-file',
+                   str(tmp_path / 'products.csv'), '--archive-dir', str(tmp_path / 'archive')])
+
+    assert sorted(closed) == ['CheckpointStore', 'PageArchive', 'PageCache', 'ProductIndex']
+
+def test_identity_index_follows_postgres_delta_sink(tmp_path, monkeypatch):
+    """Test indeks identitas hanya maju jika sink postgres (upsert) berhasil menulis delta."""
+    index_path = tmp_path / 'identity.sqlite'
+    monkeypatch.setenv('IDENTITY_INDEX_PATH', str(index_path))
+    monkeypatch.setenv('DB_URL', 'postgresql://localhost/test')
+    monkeypatch.setenv('DB_TABLE_NAME', 'products')
+    monkeypatch.setenv('POSTGRES_LOAD_MODE', 'upsert')
+    outcomes = []
+    monkeypatch.setattr(main, 'load_to_postgres_upsert', lambda df, *args, **kwargs: outcomes.pop(0))
+    catalog = SyntheticCatalog(2, cards_per_page=4, malformed_ratio=0.0, seed=5)
+
+    def indexed(sinks, outcome=None):
+        if 'postgres' in sinks:
+            outcomes.append(outcome)
+        main.main(['--base-url', server.base_url, '--pages', '2', '--sinks', *sinks,
+                   '--csv-file', str(tmp_path / 'products.csv')])
+        index = main.ProductIndex(str(index_path))
+        try:
+            return len(index)
+        finally:
+            index.close()
+
+    with CatalogServer(catalog) as server:
+        assert indexed(['csv']) == 0
+        assert indexed(['csv', 'postgres'], outcome=False) == 0
+        assert indexed(['csv', 'postgres'], outcome=True) == catalog.expected_counts()['valid']
+    assert outcomes == []
+
+def test_failed_load_leaves_checkpoint_run_resumable(tmp_path, monkeypatch, caplog):
+    """Test run dengan sink gagal tidak ditandai selesai, sehingga RUN_ID yang sama bisa mengulang load."""
+    monkeypatch.setenv('CHECKPOINT_PATH', str(tmp_path / 'checkpoint.sqlite'))
+    catalog = SyntheticCatalog(2, cards_per_page=4, malformed_ratio=0.0, seed=5)
+    csv_path = tmp_path / 'products.csv'
+
+    with CatalogServer(catalog) as server:
+        args = ['--base-url', server.base_url, '--pages', '2', '--sinks', 'csv', '--run-id', 'r1']
+        main.main(args + ['--csv-file', str(tmp_path / 'missing' / 'products.csv')])
+        assert "run tidak ditandai selesai" in caplog.text
+
+        main.main(args + ['--csv-file', str(csv_path)])
+        assert len(pd.read_csv(csv_path)) == catalog.expected_counts()['valid']
+
+        caplog.clear()
+        main.main(args + ['--csv-file', str(csv_path)])
+        assert "sudah selesai" in caplog.text
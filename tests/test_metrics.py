@@ -0,0 +1,104 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from datetime import datetime
+from utils.metrics import RunMetrics
+from utils.extract import extract_data
+from utils.transform import transform_data
+from tests.test_extract import MOCK_PAGE_2_HTML, MOCK_PAGE_3_HTML
+
+def test_run_metrics_summary():
+    """Test ringkasan agregat halaman, transform, dan sink."""
+    metrics = RunMetrics(run_id='test')
+    metrics.record_page(1, 'ok', fetch_seconds=0.2, bytes_received=1000, parse_seconds=0.01, cards=20)
+    metrics.record_page(2, 'error', fetch_seconds=0.4)
+    metrics.record_transform_step('invalid_price', 3)
+    metrics.record_transform_step('invalid_price', 2)
+    metrics.record_sink('csv', 0.5, 100)
+    metrics.record_sink('csv', 0.5, 100)
+
+    summary = metrics.summary()
+
+    assert summary['extract']['pages_by_status'] == {'ok': 1, 'error': 1}
+    assert summary['extract']['bytes'] == 1000
+    assert summary['extract']['cards'] == 20
+    assert summary['extract']['fetch_seconds_max'] == 0.4
+    assert summary['transform']['rows_dropped'] == {'invalid_price': 5}
+    assert summary['load']['csv'] == {'seconds': 1.0, 'rows': 200, 'rows_per_sec': 200.0, 'status': 'ok'}
+
+def test_run_metrics_sink_error_status_is_sticky():
+    """Test status error sink tetap tercatat walaupun batch berikutnya sukses (mode streaming)."""
+    metrics = RunMetrics()
+    metrics.record_sink('postgres', 0.1, 10, 'error')
+    metrics.record_sink('postgres', 0.1, 10)
+
+    assert metrics.summary()['load']['postgres']['status'] == 'error'
+
+def test_run_metrics_concurrent_writes_to_shared_file(tmp_path):
+    """Test beberapa run yang menulis etl.prom yang sama bersamaan tidak saling merusak file sementara."""
+    path = str(tmp_path / 'etl.prom')
+    runs = [RunMetrics(run_id=f"run-{i}") for i in range(8)]
+
+    def write(metrics):
+        for _ in range(20):
+            metrics.write_prometheus(path)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, runs))
+
+    assert '# TYPE etl_run_start_timestamp_seconds gauge' in (tmp_path / 'etl.prom').read_text()
+    assert [p.name for p in tmp_path.iterdir()] == ['etl.prom']
+
+def test_run_metrics_writes_json_and_prometheus(tmp_path):
+    """Test laporan JSON dan textfile Prometheus ditulis."""
+    metrics = RunMetrics(run_id='test')
+    metrics.record_page(1, 'ok', fetch_seconds=0.1, bytes_received=10, cards=2)
+    metrics.record_sink('csv', 0.1, 2)
+    with metrics.stage('extract'):
+        pass
+
+    metrics.write_json(str(tmp_path / 'run.json'))
+    metrics.write_prometheus(str(tmp_path / 'etl.prom'))
+
+    report = json.loads((tmp_path / 'run.json').read_text())
+    assert report['run_id'] == 'test'
+    assert report['pages'][0]['cards'] == 2
+    prom = (tmp_path / 'etl.prom').read_text()
+    assert 'etl_extract_pages{status="ok"} 1' in prom
+    assert 'etl_load_success{sink="csv"} 1' in prom
+    assert '# TYPE etl_stage_duration_seconds gauge' in prom
+
+def test_extract_data_records_page_metrics(requests_mock):
+    """Test extract_data mencatat latensi, byte, dan jumlah kartu per halaman."""
+    base_url = "https://fashion-studio.dicoding.dev"
+    requests_mock.get(f"{base_url}/", text=MOCK_PAGE_2_HTML)
+    requests_mock.get(f"{base_url}/page2", text=MOCK_PAGE_3_HTML)
+    metrics = RunMetrics()
+
+    extract_data(base_url, total_pages=2, metrics=metrics)
+
+    pages = sorted(metrics.pages, key=lambda record: record['page'])
+    assert [(p['page'], p['status'], p['cards']) for p in pages] == [(1, 'ok', 2), (2, 'empty', 0)]
+    assert pages[0]['bytes'] == len(MOCK_PAGE_2_HTML.encode('utf-8'))
+    assert pages[0]['parse_seconds'] > 0
+
+def test_transform_data_records_dropped_rows():
+    """Test transform_data mencatat baris yang dibuang per langkah."""
+    df = pd.DataFrame({
+        'Title': ['Unknown Product', 'A', 'B', 'C', 'C'],
+        'Price': ['Price Unavailable', 'Price Unavailable', '$1.00', '$2.00', '$2.00'],
+        'Rating': ['Rating: ⭐ 4.0 / 5', 'Rating: ⭐ 4.0 / 5', 'Rating: ⭐ Invalid Rating / 5',
+                   'Rating: ⭐ 4.0 / 5', 'Rating: ⭐ 4.0 / 5'],
+        'Colors': ['3 Colors'] * 5,
+        'Size': ['Size: M,'] * 5,
+        'Gender': ['Gender: Men,'] * 5,
+        'timestamp': [datetime(2024, 1, 1)] * 5
+    })
+    metrics = RunMetrics()
+
+    transform_data(df, metrics=metrics)
+
+    assert metrics.summary()['transform']['rows_dropped'] == {
+        'unknown_title': 1, 'invalid_price': 1, 'invalid_rating': 1,
+        'missing_size': 0, 'missing_gender': 0, 'duplicate': 1,
+    }
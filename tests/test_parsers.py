@@ -0,0 +1,50 @@
+import pytest
+from utils.parsers import parse_products_bs4, parse_products_lxml, get_parser, parse_rows, rows_to_products, parse_page_count
+from tests.test_extract import MOCK_PAGE_2_HTML, MOCK_HOME_PAGE_HTML
+
+MOCK_MALFORMED_HTML = """
+<html><body>
+    <div class="collection-card featured">
+        <div class="product-details">
+            <h3 class="product-title">Pants <b>7</b></h3>
+            <p>Rating: ⭐ Invalid Rating / 5</p>
+            <p>Size: XL,</p>
+        </div>
+    </div>
+    <div class="collection-card"></div>
+</body></html>
+"""
+
+@pytest.mark.parametrize('html', [MOCK_PAGE_2_HTML, MOCK_HOME_PAGE_HTML, MOCK_MALFORMED_HTML, ''])
+def test_parsers_produce_identical_rows(html):
+    """Test backend lxml menghasilkan baris yang sama persis dengan backend bs4."""
+    assert parse_products_lxml(html) == parse_products_bs4(html)
+
+def test_parser_defaults_for_missing_fields():
+    """Test nilai default dipakai jika elemen kartu tidak ada."""
+    products = parse_products_lxml(MOCK_MALFORMED_HTML)
+
+    assert products[0]['Title'] == 'Pants7'
+    assert products[0]['Price'] == 'Price Unavailable'
+    assert products[0]['Size'] == 'Size: XL,'
+    assert products[1]['Title'] == 'Unknown Product'
+    assert products[1]['Gender'] == 'N/A'
+
+def test_get_parser_unknown():
+    """Test nama backend yang tidak dikenal."""
+    with pytest.raises(ValueError):
+        get_parser('regex')
+
+@pytest.mark.parametrize('name', ['bs4', 'lxml'])
+def test_parse_rows_roundtrip(name):
+    """Test baris ringkas dari bytes mentah kembali menjadi dict produk yang sama."""
+    rows = parse_rows(name, MOCK_PAGE_2_HTML.encode('utf-8'), 'utf-8')
+
+    assert all(isinstance(row, tuple) for row in rows)
+    assert rows_to_products(rows) == parse_products_bs4(MOCK_PAGE_2_HTML)
+
+def test_parse_page_count():
+    """Test jumlah halaman dibaca dari teks pagination atau tautan halaman."""
+    assert parse_page_count('<span class="page-link">Page 1 of 50</span>') == 50
+    assert parse_page_count('<a href="/page2">2</a><a href="/page7">Next</a>') is None
+    assert parse_page_count(MOCK_HOME_PAGE_HTML) is None
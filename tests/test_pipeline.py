@@ -0,0 +1,71 @@
+import pandas as pd
+from datetime import datetime
+from utils.metrics import RunMetrics
+from utils.pipeline import run_streaming_pipeline
+
+def make_batch(titles):
+    """Membuat batch data mentah sederhana."""
+    return pd.DataFrame({
+        'Title': titles,
+        'Price': ['$10.00'] * len(titles),
+        'Rating': ['Rating: ⭐ 4.0 / 5'] * len(titles),
+        'Colors': ['3 Colors'] * len(titles),
+        'Size': ['Size: M,'] * len(titles),
+        'Gender': ['Gender: Men,'] * len(titles),
+        'timestamp': [datetime(2024, 1, 1)] * len(titles)
+    })
+
+def test_run_streaming_pipeline():
+    """Test batch bersih dikirim ke sink berurutan dengan flag append dan dedup lintas batch."""
+    calls = []
+
+    def sink(df, append):
+        calls.append((list(df['title']), append))
+
+    batches = [make_batch(['A', 'B']), make_batch(['B', 'C']), make_batch(['A'])]
+    summary = run_streaming_pipeline(iter(batches), [sink], queue_size=1)
+
+    assert calls == [(['A', 'B'], False), (['C'], True)]
+    assert summary == {'batches': 3, 'raw_rows': 5, 'clean_rows': 3, 'failed_sinks': []}
+
+def test_run_streaming_pipeline_sink_error_isolated(caplog):
+    """Test error pada satu sink tidak menghentikan sink lain."""
+    received = []
+
+    def bad_sink(df, append):
+        raise RuntimeError("boom")
+
+    def good_sink(df, append):
+        received.append(len(df))
+
+    run_streaming_pipeline(iter([make_batch(['A'])]), [bad_sink, good_sink])
+
+    assert received == [1]
+    assert "boom" in caplog.text
+
+def test_run_streaming_pipeline_skips_sink_after_first_batch_failure(caplog):
+    """Test sink yang gagal pada batch pertama (replace) tidak lagi menerima batch append."""
+    calls = []
+
+    def flaky_sink(df, append):
+        calls.append(append)
+        if not append:
+            raise RuntimeError("replace gagal")
+
+    batches = [make_batch(['A']), make_batch(['B']), make_batch(['C'])]
+    run_streaming_pipeline(iter(batches), [flaky_sink], queue_size=1)
+
+    assert calls == [False]
+    assert "gagal pada batch pertama" in caplog.text
+
+def test_run_streaming_pipeline_sink_returning_false_is_error(caplog):
+    """Test sink yang mengembalikan False dicatat sebagai error di metrik dan log."""
+    metrics = RunMetrics()
+
+    def failing_sink(df, append):
+        return False
+
+    run_streaming_pipeline(iter([make_batch(['A'])]), [failing_sink], metrics=metrics)
+
+    assert metrics.summary()['load']['failing_sink']['status'] == 'error'
+    assert "melaporkan kegagalan" in caplog.text
@@ -0,0 +1,78 @@
+import cProfile
+import json
+import pstats
+import threading
+import pandas as pd
+from utils.profiling import StageProfiler, _PeakSampler, diff_profiles, main
+
+def _build_frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame({'Price': range(rows), 'title': ['Produk'] * rows})
+
+def test_stage_records_cpu_and_memory(tmp_path):
+    """Test setiap tahap menghasilkan file .prof serta ringkasan CPU dan memori."""
+    profiler = StageProfiler(str(tmp_path))
+    with profiler.stage('transform'):
+        frame = _build_frame(200_000)
+    load = profiler.wrap('load_csv', lambda df: df['title'].tolist())
+    assert len(load(frame)) == 200_000
+    report_path = profiler.write()
+
+    report = json.loads(open(report_path, encoding='utf-8').read())
+    assert set(report['stages']) == {'transform', 'load_csv'}
+    for name in ('transform', 'load_csv'):
+        stage = report['stages'][name]
+        assert stage['seconds'] > 0
+        assert stage['cpu_top']
+        assert stage['memory']['peak_bytes'] > 0
+        assert pstats.Stats(str(tmp_path / f"{name}.prof")).total_calls > 0
+    transform_memory = report['stages']['transform']['memory']
+    assert transform_memory['net_bytes'] > 1_000_000
+    assert any(site['site'].startswith('tests/test_profiling.py') for site in transform_memory['top_project_allocations'])
+
+def test_repeated_stage_accumulates(tmp_path):
+    """Test tahap yang dipanggil berkali-kali (sink per batch) dijumlahkan, bukan ditimpa."""
+    profiler = StageProfiler(str(tmp_path))
+    load = profiler.wrap('load_csv', lambda df, append=False: df['title'].tolist())
+    for rows in (1_000, 100_000, 1_000):
+        load(_build_frame(rows), append=True)
+    report = json.loads(open(profiler.write(), encoding='utf-8').read())
+
+    stage = report['stages']['load_csv']
+    assert stage['calls'] == 3
+    assert pstats.Stats(str(tmp_path / 'load_csv.prof')).total_calls > 0
+    assert stage['memory']['peak_bytes'] > 100_000 * 8
+
+def test_stage_without_cpu_profiler(tmp_path, monkeypatch):
+    """Test tahap tanpa cProfile (atau saat profiler lain sudah aktif) tetap mencatat waktu dan memori."""
+    profiler = StageProfiler(str(tmp_path))
+    with profiler.stage('streaming', cpu=False):
+        _build_frame(50_000)
+
+    def busy(self):
+        raise ValueError("Another profiling tool is already active")
+    monkeypatch.setattr(cProfile.Profile, 'enable', busy)
+    with profiler.stage('load_csv'):
+        _build_frame(50_000)
+    report = json.loads(open(profiler.write(), encoding='utf-8').read())
+
+    for name in ('streaming', 'load_csv'):
+        assert report['stages'][name]['cpu_top'] == []
+        assert report['stages'][name]['memory']['peak_bytes'] > 0
+        assert not (tmp_path / f"{name}.prof").exists()
+    assert not any(isinstance(thread, _PeakSampler) for thread in threading.enumerate())
+
+def test_diff_profiles_between_runs(tmp_path, capsys):
+    """Test diff dua run melaporkan selisih per tahap dan bisa dijalankan sebagai CLI."""
+    for run, rows in (('base', 10_000), ('new', 300_000)):
+        profiler = StageProfiler(str(tmp_path / run))
+        with profiler.stage('transform'):
+            frame = _build_frame(rows)
+        profiler.write()
+    del frame
+
+    diff = diff_profiles(str(tmp_path / 'base'), str(tmp_path / 'new'))
+    assert diff['transform']['peak_bytes']['delta'] > 0
+    assert diff['transform']['functions']
+
+    main([str(tmp_path / 'base'), str(tmp_path / 'new' / 'profile.json')])
+    assert 'transform' in capsys.readouterr().out
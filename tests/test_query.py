@@ -0,0 +1,88 @@
+import json
+import urllib.error
+import urllib.request
+import pandas as pd
+import pytest
+import os
+from utils.load import load_to_query_snapshot, publish_query_snapshot
+from utils.query import QueryServer, QueryService
+from benchmarks.bench_identity import make_clean_frame
+
+@pytest.fixture
+def snapshot_df():
+    """Fixture untuk menyediakan snapshot bersih sintetis."""
+    return make_clean_frame(2000, seed=3)
+
+def test_query_matches_pandas_filters(snapshot_df):
+    """Test hasil filter kategori dan rentang sama dengan filter pandas biasa."""
+    service = QueryService(snapshot_df)
+
+    result = service.query(gender='Women', size=['M', 'L'], max_price=2_000_000, min_rating=4.0)
+
+    expected = snapshot_df[(snapshot_df['gender'] == 'Women') & snapshot_df['size'].isin(['M', 'L'])
+                           & (snapshot_df['Price'] <= 2_000_000) & (snapshot_df['Rating'] >= 4.0)]
+    assert result['total'] == len(expected)
+    assert [item['title'] for item in result['items']] == expected['title'].tolist()
+    assert service.query(gender='Nobody')['total'] == 0
+
+def test_query_top_k_sorting(snapshot_df):
+    """Test top-k menurut kolom urutan, termasuk urutan menurun."""
+    service = QueryService(snapshot_df)
+
+    by_rating = service.query(gender='Men', sort='-Rating', limit=5)['items']
+    expected = snapshot_df[snapshot_df['gender'] == 'Men']['Rating'].nlargest(5).tolist()
+    assert [item['Rating'] for item in by_rating] == expected
+
+    cheapest = service.query(min_rating=3.0, sort='Price', limit=3)['items']
+    assert [item['Price'] for item in cheapest] == \
+        snapshot_df[snapshot_df['Rating'] >= 3.0]['Price'].nsmallest(3).tolist()
+
+    priciest = service.query(min_price=1_000_000, max_price=3_000_000, sort='-Price', limit=4)['items']
+    in_band = snapshot_df[snapshot_df['Price'].between(1_000_000, 3_000_000)]
+    assert [item['title'] for item in priciest] == \
+        in_band.sort_values('Price', ascending=False, kind='stable')['title'].head(4).tolist()
+
+    with pytest.raises(ValueError):
+        service.query(sort='title')
+
+def test_snapshot_hot_swap_from_sink_file(tmp_path, snapshot_df):
+    """Test layanan mengganti snapshot hanya saat file utuh diterbitkan (termasuk batch streaming), dan query lama tetap utuh."""
+    path = str(tmp_path / 'query.parquet')
+    service = QueryService()
+    assert service.reload(path) is False
+
+    assert load_to_query_snapshot(snapshot_df, path) is True
+    assert service.reload(path) is True
+    old_snapshot = service.snapshot
+    assert old_snapshot.version == 1 and old_snapshot.rows == len(snapshot_df)
+    assert service.reload(path) is False
+
+    cheaper = snapshot_df.assign(Price=snapshot_df['Price'] / 2)
+    assert load_to_query_snapshot(cheaper.iloc[:1000], path, append=False) is True
+    assert load_to_query_snapshot(cheaper.iloc[1000:], path, append=True) is True
+    assert service.reload(path) is False
+    assert publish_query_snapshot(path) is True
+    assert not os.path.exists(f"{path}.staging")
+    assert service.reload(path) is True
+
+    assert service.snapshot.version == 2
+    assert service.query(max_price=200_000)['total'] == (cheaper['Price'] <= 200_000).sum()
+    assert old_snapshot.select(max_price=200_000)[1] == (snapshot_df['Price'] <= 200_000).sum()
+
+def test_http_endpoint(snapshot_df):
+    """Test endpoint HTTP /products dan /health."""
+    service = QueryService(snapshot_df)
+
+    with QueryServer(service) as server:
+        with urllib.request.urlopen(f"{server.base_url}/products?gender=Women,Unisex&sort=-Price&limit=2") as response:
+            payload = json.loads(response.read())
+        with urllib.request.urlopen(f"{server.base_url}/health") as response:
+            health = json.loads(response.read())
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{server.base_url}/products?min_price=abc")
+
+    expected = snapshot_df[snapshot_df['gender'].isin(['Women', 'Unisex'])]['Price'].nlargest(2).tolist()
+    assert [item['Price'] for item in payload['items']] == expected
+    assert set(payload['items'][0]) == set(pd.Index(snapshot_df.columns))
+    assert health['rows'] == len(snapshot_df)
+    assert error.value.code == 400
@@ -0,0 +1,29 @@
+from utils.ratelimit import AdaptiveRateLimiter, parse_retry_after
+
+def test_rate_limiter_backs_off_and_recovers():
+    """Test jarak antar request naik saat 429 dan turun kembali setelah request sukses."""
+    limiter = AdaptiveRateLimiter(max_interval=1.0)
+
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.interval == 0.2
+    assert limiter.throttled == 2
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.interval == 0.0
+
+def test_rate_limiter_respects_retry_after_and_cap():
+    """Test Retry-After dipakai sebagai jarak minimum tanpa melewati max_interval."""
+    limiter = AdaptiveRateLimiter(max_interval=5.0)
+
+    limiter.on_throttle(retry_after=3)
+    assert limiter.interval == 3
+    limiter.on_throttle(retry_after=0)
+    assert limiter.interval == 5.0
+
+def test_parse_retry_after():
+    """Test header Retry-After berupa detik dibaca, format lain diabaikan."""
+    assert parse_retry_after('2') == 2.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') is None
+    assert parse_retry_after(None) is None
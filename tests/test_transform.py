@@ -63,4 +63,43 @@ def test_transform_empty_dataframe():
     """Test jika input DataFrame kosong."""
     empty_df = pd.DataFrame(columns=['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp'])
     cleaned_df = transform_data(empty_df)
-    assert cleaned_df.empty
\ No newline at end of file
+    assert cleaned_df.empty
+
+def test_transform_data_dedup_across_batches(raw_data):
+    """Test deduplikasi lintas batch dengan seen_hashes."""
+    seen = set()
+    first = transform_data(raw_data, seen_hashes=seen)
+    second = transform_data(raw_data, seen_hashes=seen)
+
+    assert len(first) == 2
+    assert second.empty
+    assert len(seen) == 2
+
+def test_transform_data_compact_dtypes(raw_data):
+    """Test kolom berkardinalitas rendah bertipe category dan index baris asli dipertahankan."""
+    cleaned_df = transform_data(raw_data)
+
+    assert isinstance(cleaned_df['size'].dtype, pd.CategoricalDtype)
+    assert isinstance(cleaned_df['gender'].dtype, pd.CategoricalDtype)
+    assert list(cleaned_df['size']) == ['M', 'L']
+    assert list(cleaned_df['gender']) == ['Women', 'Unisex']
+    assert list(cleaned_df['colors']) == [3, 3]
+    assert list(cleaned_df.index) == [0, 2]
+
+def test_transform_data_unparseable_price_dropped():
+    """Test harga yang tidak bisa di-parse hanya membuang baris tersebut."""
+    df = pd.DataFrame({
+        'Title': ['Pants 1', 'Pants 2'],
+        'Price': ['$1,250.50', 'call us'],
+        'Rating': ['Rating: ⭐ 4.5 / 5', 'Rating: ⭐ 4.5 / 5'],
+        'Colors': ['N/A', '2 Colors'],
+        'Size': ['Size: S,', 'Size: S,'],
+        'Gender': ['Gender: Men,', 'Gender: Men,'],
+        'timestamp': [datetime.now()] * 2
+    })
+
+    cleaned_df = transform_data(df, exchange_rate=10)
+
+    assert list(cleaned_df['title']) == ['Pants 1']
+    assert cleaned_df.iloc[0]['Price'] == 12505.0
+    assert cleaned_df.iloc[0]['colors'] == 1
@@ -0,0 +1,200 @@
+import gzip
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SNAPSHOT_FORMAT = '%Y-%m-%dT%H-%M-%S'
+INDEX_FILE = 'index.sqlite'
+
+def _warc_record(url: str, status: int, body: bytes, charset: str, fetched_at: float) -> bytes:
+    """Menyusun satu record WARC 'response' (header WARC + header HTTP + body)."""
+    content_type = f"text/html; charset={charset}" if charset else "text/html"
+    http_block = (f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+    warc_date = datetime.fromtimestamp(fetched_at, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    warc_head = (f"WARC/1.1\r\nWARC-Type: response\r\nWARC-Target-URI: {url}\r\nWARC-Date: {warc_date}\r\n"
+                 f"Content-Type: application/http; msgtype=response\r\n"
+                 f"Content-Length: {len(http_block)}\r\n\r\n").encode('utf-8')
+    return warc_head + http_block + b"\r\n\r\n"
+
+def _record_body(record: bytes) -> bytes:
+    """Mengambil body HTTP dari record WARC hasil _warc_record."""
+    warc_head, _, rest = record.partition(b"\r\n\r\n")
+    length = next(int(line.split(b':', 1)[1]) for line in warc_head.split(b"\r\n")
+                  if line.lower().startswith(b'content-length:'))
+    _, _, body = rest[:length].partition(b"\r\n\r\n")
+    return body
+
+class PageArchive:
+    """
+    Arsip halaman mentah append-only untuk memproses ulang snapshot tanpa jaringan.
+
+    Setiap snapshot (satu run extract) ditulis ke `<directory>/<snapshot>.warc.gz`:
+    setiap halaman adalah satu record WARC 'response' yang dikompresi sebagai
+    member gzip tersendiri, sehingga file tetap bisa dibaca tool WARC biasa dan
+    satu halaman bisa didekompresi tanpa membaca halaman lain. Offset dan
+    panjang setiap member disimpan di indeks SQLite (`index.sqlite`).
+
+    Saat replay, file snapshot di-memory-map dan setiap halaman dibaca langsung
+    dari offset-nya, aman dipanggil dari banyak thread sekaligus.
+    """
+
+    def __init__(self, directory: str, compresslevel: int = 6):
+        """
+        Args:
+            directory (str): Folder arsip (file .warc.gz per snapshot dan indeksnya).
+            compresslevel (int): Level kompresi gzip (1 = tercepat, 9 = terkecil).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.compresslevel = compresslevel
+        self._lock = threading.Lock()
+        self._writers = {}
+        self._maps = {}
+        self._indexes = {}
+        self._conn = sqlite3.connect(os.path.join(directory, INDEX_FILE), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                snapshot TEXT PRIMARY KEY,
+                base_url TEXT NOT NULL,
+                extraction_timestamp TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                snapshot TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                charset TEXT,
+                offset INTEGER NOT NULL,
+                length INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (snapshot, url)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def path_for(self, snapshot: str) -> str:
+        """Lokasi file .warc.gz untuk snapshot."""
+        return os.path.join(self.directory, f"{snapshot}.warc.gz")
+
+    def begin(self, base_url: str, extraction_timestamp: datetime) -> str:
+        """
+        Mendaftarkan snapshot baru (atau melanjutkan snapshot dengan timestamp yang sama,
+        misalnya run yang dilanjutkan dari checkpoint).
+
+        Returns:
+            str: ID snapshot.
+        """
+        snapshot = extraction_timestamp.strftime(SNAPSHOT_FORMAT)
+        with self._lock:
+            row = self._conn.execute("SELECT base_url FROM snapshots WHERE snapshot = ?", (snapshot,)).fetchone()
+            if row is None:
+                self._conn.execute("INSERT INTO snapshots VALUES (?, ?, ?, ?)",
+                                   (snapshot, base_url, extraction_timestamp.isoformat(), time.time()))
+                self._conn.commit()
+            elif row[0] != base_url:
+                raise ValueError(f"Snapshot {snapshot} milik {row[0]}, bukan {base_url}.")
+        logging.info(f"Halaman mentah diarsipkan ke {self.path_for(snapshot)}")
+        return snapshot
+
+    def record(self, snapshot: str, url: str, status: int, body: bytes, charset: str = None) -> None:
+        """Menambahkan satu halaman ke akhir arsip snapshot lalu mencatat offset-nya di indeks."""
+        fetched_at = time.time()
+        member = gzip.compress(_warc_record(url, status, body, charset, fetched_at), compresslevel=self.compresslevel)
+        with self._lock:
+            writer = self._writers.get(snapshot)
+            if writer is None:
+                writer = self._writers[snapshot] = open(self.path_for(snapshot), 'ab')
+            offset = writer.seek(0, os.SEEK_END)
+            writer.write(member)
+            writer.flush()
+            self._conn.execute("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               (snapshot, url, status, charset, offset, len(member), fetched_at))
+            self._conn.commit()
+            if snapshot in self._indexes:
+                self._indexes[snapshot][url] = (offset, len(member), status, charset)
+
+    def snapshots(self) -> list:
+        """Daftar ID snapshot di arsip, terurut dari yang terlama."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT snapshot FROM snapshots ORDER BY snapshot")]
+
+    def resolve(self, snapshot: str) -> str:
+        """Memvalidasi ID snapshot; 'latest' berarti snapshot terbaru."""
+        snapshots = self.snapshots()
+        if snapshot == 'latest':
+            if not snapshots:
+                raise ValueError(f"Arsip {self.directory} belum berisi snapshot.")
+            return snapshots[-1]
+        if snapshot not in snapshots:
+            raise ValueError(f"Snapshot {snapshot} tidak ada di arsip {self.directory}.")
+        return snapshot
+
+    def snapshot_info(self, snapshot: str) -> dict:
+        """Data snapshot: {'snapshot', 'base_url', 'extraction_timestamp' (datetime), 'pages'}."""
+        with self._lock:
+            base_url, extraction_timestamp = self._conn.execute(
+                "SELECT base_url, extraction_timestamp FROM snapshots WHERE snapshot = ?", (snapshot,)
+            ).fetchone()
+            pages = self._conn.execute("SELECT COUNT(*) FROM records WHERE snapshot = ?", (snapshot,)).fetchone()[0]
+        return {'snapshot': snapshot, 'base_url': base_url,
+                'extraction_timestamp': datetime.fromisoformat(extraction_timestamp), 'pages': pages}
+
+    def _index(self, snapshot: str) -> dict:
+        """Indeks {url: (offset, length, status, charset)} snapshot, dimuat sekali ke memori."""
+        with self._lock:
+            index = self._indexes.get(snapshot)
+            if index is None:
+                rows = self._conn.execute(
+                    "SELECT url, offset, length, status, charset FROM records WHERE snapshot = ?", (snapshot,)
+                )
+                index = self._indexes[snapshot] = {url: tuple(entry) for url, *entry in rows}
+            return index
+
+    def _map(self, snapshot: str, end: int) -> mmap.mmap:
+        """Memory map file snapshot yang mencakup byte sampai `end` (di-map ulang jika file bertambah)."""
+        with self._lock:
+            mapped = self._maps.get(snapshot)
+            if mapped is None or len(mapped) < end:
+                if snapshot in self._writers:
+                    self._writers[snapshot].flush()
+                with open(self.path_for(snapshot), 'rb') as file:
+                    mapped = self._maps[snapshot] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            return mapped
+
+    def read(self, snapshot: str, url: str):
+        """
+        Membaca satu halaman dari arsip.
+
+        Returns:
+            dict atau None: {'status', 'charset', 'body'}, atau None jika URL tidak diarsipkan.
+        """
+        entry = self._index(snapshot).get(url)
+        if entry is None:
+            return None
+        offset, length, status, charset = entry
+        member = self._map(snapshot, offset + length)[offset:offset + length]
+        return {'status': status, 'charset': charset, 'body': _record_body(gzip.decompress(member))}
+
+    def close(self) -> None:
+        """Menutup file arsip, memory map, dan koneksi indeks."""
+        with self._lock:
+            for writer in self._writers.values():
+                writer.close()
+            for mapped in self._maps.values():
+                mapped.close()
+            self._writers, self._maps, self._indexes = {}, {}, {}
+            self._conn.close()
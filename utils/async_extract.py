@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import random
+import time
+from concurrent.futures import Executor
+from datetime import datetime
+import aiohttp
+import pandas as pd
+from utils.extract import FALLBACK_TOTAL_PAGES, ProductBuffer, build_page_url, page_action
+from utils.metrics import RunMetrics
+from utils.parsers import get_parser, parse_page_count, parse_rows, rows_to_products
+from utils.ratelimit import parse_retry_after
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+_RETRYABLE_EXCEPTIONS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+async def _get(ctx: dict, shop_url: str, stats: dict):
+    """
+    GET satu URL dengan percobaan ulang untuk timeout, gangguan koneksi, 5xx, dan 429.
+
+    Returns:
+        tuple: (status HTTP, body bytes, charset).
+    """
+    start = time.perf_counter()
+    for attempt in range(ctx['max_retries'] + 1):
+        delay = ctx['retry_backoff'] * (2 ** attempt)
+        try:
+            async with ctx['session'].get(shop_url) as response:
+                body = await response.read()
+                status, charset = response.status, response.charset
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        except _RETRYABLE_EXCEPTIONS as e:
+            if attempt >= ctx['max_retries']:
+                raise
+            logging.warning(f"Request {shop_url} gagal ({e!r}). Mencoba ulang ({attempt + 1}/{ctx['max_retries']})...")
+            await asyncio.sleep(delay + random.uniform(0, delay))
+            continue
+
+        if (status == 429 or status >= 500) and attempt < ctx['max_retries']:
+            logging.warning(f"Server membalas {status} untuk {shop_url}. "
+                            f"Mencoba ulang ({attempt + 1}/{ctx['max_retries']})...")
+            wait = retry_after if status == 429 and retry_after is not None else delay + random.uniform(0, delay)
+            await asyncio.sleep(wait)
+            continue
+        break
+
+    stats['fetch_seconds'] = time.perf_counter() - start
+    stats['bytes'] = len(body)
+    return status, body, charset
+
+async def _parse(ctx: dict, body: bytes, charset: str, stats: dict) -> list:
+    """Menyerahkan parsing ke executor agar event loop tidak terblokir."""
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    rows = await loop.run_in_executor(ctx['parse_executor'], parse_rows, ctx['parser'], body, charset)
+    stats['parse_seconds'] = time.perf_counter() - start
+    return rows_to_products(rows)
+
+async def _scrape_page(ctx: dict, page: int) -> dict:
+    """
+    Versi async dari utils.extract._scrape_page.
+
+    Returns:
+        dict: {'page', 'status', 'products'} dengan status 'ok', 'empty', 'not_found', atau 'error'.
+    """
+    shop_url = build_page_url(ctx['base_url'], page)
+    stats = {'fetch_seconds': 0.0, 'bytes': 0, 'parse_seconds': 0.0}
+    result = {'page': page, 'status': 'error', 'products': []}
+
+    async with ctx['semaphore']:
+        logging.info(f"Scraping halaman: {page}/{ctx['total_pages']} - {shop_url}")
+        try:
+            prefetched = ctx['prefetched'].pop(shop_url, None)
+            status, body, charset = prefetched or await _get(ctx, shop_url, stats)
+            if status == 404:
+                result = {'page': page, 'status': 'not_found', 'products': []}
+            elif status >= 400:
+                logging.error(f"HTTP error saat mengambil halaman {page}: status {status}")
+            else:
+                products = await _parse(ctx, body, charset, stats)
+                result = {'page': page, 'status': 'ok' if products else 'empty', 'products': products}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"Request Gagal mengambil halaman {page}: {e!r}")
+        except Exception as e:
+            logging.error(f"Error tidak terduga saat parsing halaman {page}: {e}")
+
+    if ctx['metrics'] is not None:
+        ctx['metrics'].record_page(page, result['status'], stats['fetch_seconds'], stats['bytes'],
+                                   stats['parse_seconds'], len(result['products']))
+    return result
+
+async def _discover_total_pages(ctx: dict):
+    """Membaca jumlah halaman dari pagination halaman 1 (response disimpan untuk dipakai ulang)."""
+    shop_url = build_page_url(ctx['base_url'], 1)
+    try:
+        status, body, charset = await _get(ctx, shop_url, {})
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logging.warning(f"Gagal membaca pagination dari {shop_url}: {e!r}")
+        return None
+    if status >= 400:
+        logging.warning(f"Gagal membaca pagination dari {shop_url}: status {status}")
+        return None
+    ctx['prefetched'][shop_url] = (status, body, charset)
+    return parse_page_count(body.decode(charset or 'utf-8', errors='replace'))
+
+async def extract_data_async(base_url: str, total_pages: int = None, concurrency: int = 100,
+                             session: aiohttp.ClientSession = None, timeout: float = 10,
+                             parser: str = 'bs4', parse_executor: Executor = None,
+                             max_retries: int = 3, retry_backoff: float = 0.5,
+                             metrics: RunMetrics = None) -> pd.DataFrame:
+    """
+    Mesin ekstraksi asyncio: semua halaman diambil di satu event loop dengan
+    paling banyak `concurrency` request berjalan bersamaan, sementara parsing
+    diserahkan ke executor sehingga event loop tetap responsif.
+
+    Baris yang dihasilkan sama dengan extract_data (urutan halaman, aturan
+    berhenti 404/halaman kosong, kolom, dan timestamp tunggal). Cache halaman
+    dan checkpoint hanya tersedia di extract_data.
+
+    Args:
+        base_url (str): URL dasar situs.
+        total_pages (int): Batas jumlah halaman; jumlah halaman selalu dibaca dari
+            pagination dan dibatasi nilai ini. None = tanpa batas.
+        concurrency (int): Jumlah request maksimum yang berjalan bersamaan.
+        session (aiohttp.ClientSession): Session yang dipakai ulang; dibuat otomatis jika None.
+        timeout (float): Timeout total per request dalam detik.
+        parser (str): Backend parser HTML, 'bs4' atau 'lxml'.
+        parse_executor (Executor): Executor untuk parsing; None = thread pool bawaan loop.
+            Berikan ProcessPoolExecutor agar parsing memakai banyak core.
+        max_retries (int): Percobaan ulang untuk timeout, gangguan koneksi, 5xx, dan 429.
+        retry_backoff (float): Jeda dasar exponential backoff (detik).
+        metrics (RunMetrics): Penampung metrik per halaman.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency minimal 1.")
+    get_parser(parser)
+
+    own_session = session is None
+    if own_session:
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout))
+
+    ctx = {
+        'session': session,
+        'base_url': base_url,
+        'total_pages': total_pages,
+        'parser': parser,
+        'parse_executor': parse_executor,
+        'semaphore': asyncio.Semaphore(concurrency),
+        'max_retries': max_retries,
+        'retry_backoff': retry_backoff,
+        'metrics': metrics,
+        'prefetched': {},
+    }
+    buffer = ProductBuffer(datetime.now())
+    tasks = []
+    try:
+        discovered = await _discover_total_pages(ctx)
+        if discovered is None:
+            if total_pages is None:
+                total_pages = FALLBACK_TOTAL_PAGES
+                logging.warning(f"Pagination tidak ditemukan. Memakai batas {total_pages} halaman.")
+        else:
+            logging.info(f"Pagination menunjukkan {discovered} halaman.")
+            total_pages = discovered if total_pages is None else min(discovered, total_pages)
+        ctx['total_pages'] = total_pages
+
+        logging.info(f"Memulai ekstraksi async dari {base_url} untuk {total_pages} halaman "
+                     f"({concurrency} request bersamaan).")
+        tasks = [asyncio.create_task(_scrape_page(ctx, page)) for page in range(1, total_pages + 1)]
+
+        for task in tasks:
+            result = await task
+            action = page_action(result)
+            if action == 'stop':
+                break
+            if action == 'keep':
+                buffer.extend(result['products'])
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_session:
+            await session.close()
+
+    logging.info(f"Ekstraksi async selesai. Total {len(buffer)} data mentah didapat.")
+    if not len(buffer):
+        logging.warning("Tidak ada data yang berhasil diekstrak.")
+        return pd.DataFrame()
+    return buffer.to_frame()
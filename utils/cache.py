@@ -0,0 +1,140 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class PageCache:
+    """
+    Cache halaman persisten (SQLite) yang dikunci dengan URL.
+
+    Setiap entri menyimpan ETag, Last-Modified, hash SHA-256 dari body, dan
+    hasil parsing halaman tersebut. Saat halaman diminta lagi, extractor
+    mengirim request kondisional; jika server menjawab 304 atau body-nya
+    tidak berubah, produk hasil parsing sebelumnya dipakai ulang tanpa parsing.
+
+    Jika total ukuran entri melebihi `max_bytes`, entri yang paling lama tidak
+    dipakai dihapus lebih dulu.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            path (str): Lokasi file database cache.
+            max_bytes (int): Batas total ukuran data produk yang disimpan.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = {'miss': 0, 'not_modified': 0, 'unchanged': 0, 'changed': 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                products TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_last_access ON pages (last_access)")
+        self._conn.commit()
+
+    def record(self, outcome: str) -> None:
+        """Mencatat hasil lookup cache ('miss', 'not_modified', 'unchanged', 'changed')."""
+        with self._lock:
+            self.stats[outcome] += 1
+
+    @staticmethod
+    def hash_body(body: bytes) -> str:
+        """Menghitung hash konten body halaman."""
+        return hashlib.sha256(body).hexdigest()
+
+    def get(self, url: str):
+        """
+        Mengambil entri cache untuk URL.
+
+        Returns:
+            dict atau None: {'etag', 'last_modified', 'body_hash', 'products'}.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body_hash, products FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body_hash, products = row
+        return {
+            'etag': etag,
+            'last_modified': last_modified,
+            'body_hash': body_hash,
+            'products': json.loads(products),
+        }
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        """Membuat header If-None-Match/If-Modified-Since dari entri cache."""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url: str, etag: str, last_modified: str, body_hash: str, products: list) -> None:
+        """Menyimpan (atau mengganti) entri cache, lalu menjalankan eviction jika perlu."""
+        payload = json.dumps(products, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body_hash, payload, len(payload.encode('utf-8')), time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str, etag: str = None, last_modified: str = None) -> None:
+        """Memperbarui waktu akses (dan validator baru jika ada) untuk entri yang dipakai ulang."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET last_access = ?, etag = COALESCE(?, etag), "
+                "last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (time.time(), etag, last_modified, url),
+            )
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        """Total ukuran data produk yang tersimpan."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM pages").fetchone()[0]
+
+    def _evict(self) -> None:
+        """Menghapus entri paling lama tidak dipakai sampai total ukuran <= max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size_bytes FROM pages ORDER BY last_access").fetchall()
+        stale = []
+        for url, size_bytes in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((url,))
+            total -= size_bytes
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", stale)
+        logging.info(f"Cache halaman: {len(stale)} entri dihapus (batas {self.max_bytes} byte).")
+
+    def close(self) -> None:
+        """Menutup koneksi database cache."""
+        with self._lock:
+            self._conn.close()
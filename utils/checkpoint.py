@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DONE_STATUSES = ('ok', 'empty', 'not_found')
+
+class CheckpointStore:
+    """
+    Checkpoint crawl persisten (SQLite) untuk satu run ID.
+
+    Setiap halaman yang selesai dicatat beserta status dan hasil parsing-nya.
+    Jika crawl berhenti di tengah jalan, menjalankan ulang dengan run ID yang
+    sama hanya mengambil halaman yang belum tercatat atau berstatus 'error';
+    halaman lain dibaca dari checkpoint. Timestamp ekstraksi dan jumlah halaman
+    hasil discovery juga disimpan agar hasil run lanjutan konsisten.
+    """
+
+    def __init__(self, path: str, run_id: str):
+        """
+        Args:
+            path (str): Lokasi file database checkpoint.
+            run_id (str): ID run; dipakai ulang untuk melanjutkan crawl.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                base_url TEXT NOT NULL,
+                extraction_timestamp TEXT NOT NULL,
+                total_pages INTEGER,
+                created_at REAL NOT NULL,
+                completed_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                run_id TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                products TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, page)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def start(self, base_url: str, extraction_timestamp: datetime) -> datetime:
+        """
+        Mendaftarkan run baru atau melanjutkan run yang sudah ada.
+
+        Returns:
+            datetime: Timestamp ekstraksi run (milik run awal jika dilanjutkan).
+
+        Raises:
+            ValueError: Jika run ID dibuat untuk base URL lain atau run tersebut
+                sudah selesai (gunakan run ID baru untuk crawl ulang).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT base_url, extraction_timestamp, completed_at FROM runs WHERE run_id = ?", (self.run_id,)
+            ).fetchone()
+            if row is None:
+                self._conn.execute(
+                    "INSERT INTO runs (run_id, base_url, extraction_timestamp, created_at) VALUES (?, ?, ?, ?)",
+                    (self.run_id, base_url, extraction_timestamp.isoformat(), time.time()),
+                )
+                self._conn.commit()
+                return extraction_timestamp
+
+            if row[0] != base_url:
+                raise ValueError(f"Run {self.run_id} dibuat untuk {row[0]}, bukan {base_url}.")
+            if row[2] is not None:
+                raise ValueError(f"Run {self.run_id} sudah selesai pada "
+                                 f"{datetime.fromtimestamp(row[2]).isoformat(timespec='seconds')}; "
+                                 f"gunakan RUN_ID baru untuk crawl ulang.")
+            done = self._conn.execute(
+                "SELECT COUNT(*) FROM pages WHERE run_id = ? AND status IN (?, ?, ?)",
+                (self.run_id, *DONE_STATUSES),
+            ).fetchone()[0]
+        logging.info(f"Melanjutkan run {self.run_id}: {done} halaman sudah ada di checkpoint.")
+        return datetime.fromisoformat(row[1])
+
+    @property
+    def total_pages(self):
+        """Jumlah halaman hasil discovery yang tersimpan, atau None."""
+        with self._lock:
+            row = self._conn.execute("SELECT total_pages FROM runs WHERE run_id = ?", (self.run_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_total_pages(self, total_pages: int) -> None:
+        """Menyimpan jumlah halaman hasil discovery."""
+        with self._lock:
+            self._conn.execute("UPDATE runs SET total_pages = ? WHERE run_id = ?", (total_pages, self.run_id))
+            self._conn.commit()
+
+    def get(self, page: int):
+        """
+        Mengambil hasil halaman yang sudah selesai.
+
+        Returns:
+            dict atau None: {'page', 'status', 'products'}; None jika halaman belum
+            pernah selesai (termasuk yang terakhir berstatus 'error').
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, products FROM pages WHERE run_id = ? AND page = ?", (self.run_id, page)
+            ).fetchone()
+        if row is None or row[0] not in DONE_STATUSES:
+            return None
+        return {'page': page, 'status': row[0], 'products': json.loads(row[1])}
+
+    def record(self, page: int, status: str, products: list) -> None:
+        """Mencatat hasil satu halaman (status 'error' akan diambil ulang saat resume)."""
+        payload = json.dumps(products, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (self.run_id, page, status, payload, time.time()),
+            )
+            self._conn.commit()
+
+    def mark_complete(self) -> None:
+        """Menandai run selesai (extract, transform, dan load sudah dijalankan)."""
+        with self._lock:
+            self._conn.execute("UPDATE runs SET completed_at = ? WHERE run_id = ?", (time.time(), self.run_id))
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Menutup koneksi database checkpoint."""
+        with self._lock:
+            self._conn.close()
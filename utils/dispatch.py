@@ -0,0 +1,89 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def _sink_timeout(timeout, name: str):
+    """Batas waktu untuk satu sink; `timeout` boleh berupa angka atau dict per sink."""
+    if isinstance(timeout, dict):
+        return timeout.get(name)
+    return timeout
+
+def dispatch_loads(df, sinks: dict, timeout=None, max_workers: int = None, metrics=None) -> dict:
+    """
+    Menjalankan beberapa sink secara bersamaan atas DataFrame yang sama.
+
+    Setiap sink menerima objek DataFrame yang sama (tanpa salinan per sink),
+    sehingga sink wajib memperlakukannya sebagai read-only. Kegagalan atau
+    keterlambatan satu sink tidak menahan sink lainnya.
+
+    Args:
+        df (pd.DataFrame): DataFrame bersih yang akan di-load.
+        sinks (dict): Nama sink -> callable `sink(df)`, misalnya
+            {'csv': functools.partial(load_to_csv, file_path='products.csv')}.
+            Sink yang mengembalikan False dianggap gagal.
+        timeout (float atau dict): Batas waktu dalam detik, berlaku untuk semua
+            sink atau per nama sink. None berarti menunggu sampai selesai.
+        max_workers (int): Jumlah thread; default satu thread per sink.
+        metrics (RunMetrics): Jika diberikan, durasi dan status setiap sink dicatat.
+
+    Returns:
+        dict: Nama sink -> {'status': 'ok' | 'error' | 'timeout', 'seconds', 'error'}.
+
+    Catatan:
+        Thread Python tidak bisa dihentikan paksa. Sink yang melewati batas waktu
+        ditandai 'timeout' dan tidak ditunggu lagi, tetapi tetap berjalan di
+        latar belakang sampai selesai sendiri.
+    """
+    if not sinks:
+        return {}
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("max_workers minimal 1.")
+
+    rows = len(df)
+    results = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(sinks), thread_name_prefix='load')
+    start = time.perf_counter()
+
+    def run(sink):
+        sink_start = time.perf_counter()
+        outcome = sink(df)
+        return outcome, time.perf_counter() - sink_start
+
+    try:
+        futures = {name: executor.submit(run, sink) for name, sink in sinks.items()}
+
+        for name, future in futures.items():
+            limit = _sink_timeout(timeout, name)
+            remaining = None if limit is None else max(0.0, limit - (time.perf_counter() - start))
+            result = {'status': 'ok', 'seconds': None, 'error': None}
+            try:
+                outcome, result['seconds'] = future.result(timeout=remaining)
+                if outcome is False:
+                    result['status'] = 'error'
+                    result['error'] = 'sink melaporkan kegagalan'
+            except FutureTimeoutError:
+                future.cancel()
+                result['status'] = 'timeout'
+                result['seconds'] = time.perf_counter() - start
+                result['error'] = f"melewati batas waktu {limit} detik"
+                logging.error(f"Sink {name} melewati batas waktu {limit} detik.")
+            except Exception as e:
+                result['status'] = 'error'
+                result['seconds'] = time.perf_counter() - start
+                result['error'] = str(e)
+                logging.error(f"Error tidak terduga pada sink {name}: {e}")
+
+            results[name] = result
+            if metrics is not None:
+                metrics.record_sink(name, result['seconds'], rows, result['status'])
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    failed = [name for name, result in results.items() if result['status'] != 'ok']
+    if failed:
+        logging.warning(f"Load selesai dengan sink gagal: {failed}")
+    else:
+        logging.info(f"Semua sink selesai dalam {time.perf_counter() - start:.2f} detik.")
+    return results
@@ -0,0 +1,366 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import (Column, Float, Integer, MetaData, String, Table, Text, and_, create_engine, delete,
+                        func, insert, or_, select, update)
+from utils.extract import ProductBuffer, discover_total_pages, page_action, scrape_pages
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+_metadata = MetaData()
+
+crawl_runs = Table(
+    'crawl_runs', _metadata,
+    Column('run_id', String(64), primary_key=True),
+    Column('base_url', Text, nullable=False),
+    Column('extraction_timestamp', String(32), nullable=False),
+    Column('total_pages', Integer, nullable=False),
+    Column('created_at', Float, nullable=False),
+)
+
+crawl_items = Table(
+    'crawl_items', _metadata,
+    Column('run_id', String(64), primary_key=True),
+    Column('item_id', Integer, primary_key=True),
+    Column('page_start', Integer, nullable=False),
+    Column('page_end', Integer, nullable=False),
+    Column('status', String(16), nullable=False, index=True),
+    Column('worker_id', String(128)),
+    Column('lease_expires', Float),
+    Column('attempts', Integer, nullable=False, default=0),
+    Column('error', Text),
+)
+
+crawl_pages = Table(
+    'crawl_pages', _metadata,
+    Column('run_id', String(64), primary_key=True),
+    Column('page', Integer, primary_key=True),
+    Column('status', String(16), nullable=False),
+    Column('products', Text, nullable=False),
+)
+
+def default_worker_id() -> str:
+    """ID worker unik per proses: host, PID, dan akhiran acak."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+class WorkQueue:
+    """
+    Antrian kerja crawl berbasis lease di database bersama (PostgreSQL lewat
+    SQLAlchemy, atau SQLite untuk test dan satu mesin).
+
+    Coordinator memecah halaman 1..N menjadi item berisi rentang halaman. Worker
+    mengambil item dengan lease berbatas waktu dan memperpanjangnya selama
+    bekerja. Jika worker mati, lease-nya kedaluwarsa dan item diberikan ke
+    worker lain. Hasil per halaman ditulis ke tabel bersama lalu digabung
+    coordinator menjadi satu snapshot.
+
+    Pengambilan lease memakai UPDATE bersyarat (compare-and-set) sehingga aman
+    dijalankan banyak worker sekaligus tanpa fitur khusus database. Waktu lease
+    memakai jam masing-masing mesin, jadi jam antar node perlu sinkron (NTP).
+    """
+
+    def __init__(self, db_url: str, run_id: str, lease_seconds: float = 300, max_attempts: int = 3):
+        """
+        Args:
+            db_url (str): URL koneksi SQLAlchemy, misalnya postgresql://... atau sqlite:///crawl.db.
+            run_id (str): ID run crawl yang dikerjakan.
+            lease_seconds (float): Lama lease sebelum item dianggap ditinggalkan.
+            max_attempts (int): Jumlah lease maksimum per item sebelum ditandai 'failed'.
+        """
+        self.engine = create_engine(db_url)
+        self.run_id = run_id
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        _metadata.create_all(self.engine)
+
+    def plan(self, base_url: str, total_pages: int, pages_per_item: int = 10) -> int:
+        """
+        Mendaftarkan run dan membuat item kerja. Aman dipanggil ulang: run yang
+        sudah direncanakan tidak dibuat dua kali.
+
+        Returns:
+            int: Jumlah item kerja untuk run ini.
+        """
+        if pages_per_item < 1:
+            raise ValueError("pages_per_item minimal 1.")
+        with self.engine.begin() as conn:
+            existing = conn.execute(select(crawl_runs.c.run_id).where(crawl_runs.c.run_id == self.run_id)).first()
+            if existing is None:
+                conn.execute(insert(crawl_runs).values(
+                    run_id=self.run_id, base_url=base_url, extraction_timestamp=datetime.now().isoformat(),
+                    total_pages=total_pages, created_at=time.time(),
+                ))
+                items = [
+                    {'run_id': self.run_id, 'item_id': item_id, 'page_start': start,
+                     'page_end': min(start + pages_per_item - 1, total_pages), 'status': 'pending', 'attempts': 0}
+                    for item_id, start in enumerate(range(1, total_pages + 1, pages_per_item))
+                ]
+                if items:
+                    conn.execute(insert(crawl_items), items)
+            count = conn.execute(
+                select(func.count()).select_from(crawl_items).where(crawl_items.c.run_id == self.run_id)
+            ).scalar_one()
+        logging.info(f"Run {self.run_id}: {count} item kerja untuk {total_pages} halaman.")
+        return count
+
+    def run_info(self):
+        """Data run (base_url, extraction_timestamp, total_pages), atau None jika belum direncanakan."""
+        with self.engine.connect() as conn:
+            row = conn.execute(select(crawl_runs).where(crawl_runs.c.run_id == self.run_id)).first()
+        return dict(row._mapping) if row else None
+
+    def _leasable(self, now: float):
+        """Kondisi item yang boleh di-lease: pending, atau lease-nya sudah kedaluwarsa."""
+        return and_(
+            crawl_items.c.run_id == self.run_id,
+            crawl_items.c.attempts < self.max_attempts,
+            or_(crawl_items.c.status == 'pending',
+                and_(crawl_items.c.status == 'leased', crawl_items.c.lease_expires < now)),
+        )
+
+    def lease(self, worker_id: str):
+        """
+        Mengambil satu item kerja untuk worker.
+
+        Returns:
+            dict atau None: Item (item_id, page_start, page_end, attempts, ...), atau
+            None jika tidak ada item yang bisa dikerjakan saat ini.
+        """
+        for _ in range(10):
+            now = time.time()
+            with self.engine.begin() as conn:
+                conn.execute(update(crawl_items).where(
+                    crawl_items.c.run_id == self.run_id,
+                    crawl_items.c.status == 'leased',
+                    crawl_items.c.lease_expires < now,
+                    crawl_items.c.attempts >= self.max_attempts,
+                ).values(status='failed', error='lease kedaluwarsa pada percobaan terakhir'))
+
+                candidate = conn.execute(
+                    select(crawl_items.c.item_id).where(self._leasable(now))
+                    .order_by(crawl_items.c.item_id).limit(1)
+                ).first()
+                if candidate is None:
+                    return None
+
+                claimed = conn.execute(
+                    update(crawl_items)
+                    .where(self._leasable(now), crawl_items.c.item_id == candidate.item_id)
+                    .values(status='leased', worker_id=worker_id, lease_expires=now + self.lease_seconds,
+                            attempts=crawl_items.c.attempts + 1)
+                )
+                if claimed.rowcount == 1:
+                    row = conn.execute(select(crawl_items).where(
+                        crawl_items.c.run_id == self.run_id, crawl_items.c.item_id == candidate.item_id
+                    )).first()
+                    return dict(row._mapping)
+            # Item yang sama diambil worker lain lebih dulu; coba kandidat berikutnya.
+        return None
+
+    def _owned(self, item: dict, worker_id: str):
+        """Kondisi item masih di-lease oleh worker ini."""
+        return and_(
+            crawl_items.c.run_id == self.run_id,
+            crawl_items.c.item_id == item['item_id'],
+            crawl_items.c.status == 'leased',
+            crawl_items.c.worker_id == worker_id,
+        )
+
+    def renew(self, item: dict, worker_id: str) -> bool:
+        """Memperpanjang lease; False jika lease sudah hilang (diambil worker lain)."""
+        with self.engine.begin() as conn:
+            result = conn.execute(update(crawl_items).where(self._owned(item, worker_id))
+                                  .values(lease_expires=time.time() + self.lease_seconds))
+        return result.rowcount == 1
+
+    def complete(self, item: dict, worker_id: str, results: list) -> bool:
+        """
+        Menyimpan hasil per halaman dan menandai item selesai dalam satu transaksi.
+
+        Returns:
+            bool: False jika lease sudah hilang; hasilnya dibuang agar tidak ganda.
+        """
+        with self.engine.begin() as conn:
+            finished = conn.execute(update(crawl_items).where(self._owned(item, worker_id))
+                                    .values(status='done', lease_expires=None, error=None))
+            if finished.rowcount != 1:
+                logging.warning(f"Lease item {item['item_id']} sudah hilang; hasil worker {worker_id} dibuang.")
+                return False
+            pages = [result['page'] for result in results]
+            conn.execute(delete(crawl_pages).where(crawl_pages.c.run_id == self.run_id,
+                                                   crawl_pages.c.page.in_(pages)))
+            if results:
+                conn.execute(insert(crawl_pages), [
+                    {'run_id': self.run_id, 'page': result['page'], 'status': result['status'],
+                     'products': json.dumps(result['products'], ensure_ascii=False)}
+                    for result in results
+                ])
+        return True
+
+    def release(self, item: dict, worker_id: str, error: str) -> None:
+        """Mengembalikan item ke antrian (atau 'failed' jika percobaan habis)."""
+        status = 'failed' if item['attempts'] >= self.max_attempts else 'pending'
+        with self.engine.begin() as conn:
+            conn.execute(update(crawl_items).where(self._owned(item, worker_id))
+                         .values(status=status, worker_id=None, lease_expires=None, error=error))
+
+    def progress(self) -> dict:
+        """Jumlah item per status untuk run ini."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(crawl_items.c.status, func.count()).where(crawl_items.c.run_id == self.run_id)
+                .group_by(crawl_items.c.status)
+            ).all()
+        return {status: count for status, count in rows}
+
+    def is_finished(self) -> bool:
+        """True jika tidak ada lagi item pending/leased."""
+        progress = self.progress()
+        return bool(progress) and not progress.get('pending') and not progress.get('leased')
+
+    def iter_results(self):
+        """Menghasilkan hasil per halaman berurutan: {'page', 'status', 'products'}."""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(crawl_pages.c.page, crawl_pages.c.status, crawl_pages.c.products)
+                .where(crawl_pages.c.run_id == self.run_id).order_by(crawl_pages.c.page)
+            )
+            for page, status, products in rows:
+                yield {'page': page, 'status': status, 'products': json.loads(products)}
+
+def _heartbeat(queue: WorkQueue, item: dict, worker_id: str, stop: threading.Event) -> None:
+    """Memperpanjang lease secara berkala sampai `stop` di-set."""
+    while not stop.wait(queue.lease_seconds / 3):
+        if not queue.renew(item, worker_id):
+            logging.warning(f"Lease item {item['item_id']} hilang saat dikerjakan worker {worker_id}.")
+            return
+
+def run_worker(queue: WorkQueue, worker_id: str = None, max_workers: int = 4, parser: str = 'lxml',
+               poll_interval: float = 1.0, wait_for_work: bool = False, **scrape_options) -> int:
+    """
+    Menjalankan worker: lease item, scrape rentang halamannya, simpan hasil, ulangi.
+
+    Item yang masih punya halaman 'error' dikembalikan ke antrian untuk dicoba
+    lagi (sampai max_attempts); pada percobaan terakhir hasilnya disimpan apa adanya.
+
+    Args:
+        queue (WorkQueue): Antrian kerja run.
+        worker_id (str): ID worker; default dari host dan PID.
+        max_workers (int): Thread fetch per worker.
+        parser (str): Backend parser HTML.
+        poll_interval (float): Jeda (detik) saat menunggu item atau rencana run.
+        wait_for_work (bool): Jika True, worker menunggu sampai semua item run selesai
+            (berguna untuk mengambil alih lease yang kedaluwarsa); jika False, berhenti
+            begitu tidak ada item yang bisa di-lease.
+        **scrape_options: Argumen tambahan untuk scrape_pages (timeout, max_retries, ...).
+
+    Returns:
+        int: Jumlah item yang berhasil diselesaikan worker ini.
+    """
+    worker_id = worker_id or default_worker_id()
+    run = queue.run_info()
+    while run is None:
+        logging.info(f"Run {queue.run_id} belum direncanakan coordinator. Menunggu...")
+        time.sleep(poll_interval)
+        run = queue.run_info()
+
+    completed = 0
+    while True:
+        item = queue.lease(worker_id)
+        if item is None:
+            if not wait_for_work or queue.is_finished():
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logging.info(f"Worker {worker_id} mengerjakan item {item['item_id']} "
+                     f"(halaman {item['page_start']}-{item['page_end']}, percobaan {item['attempts']}).")
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=_heartbeat, args=(queue, item, worker_id, stop), daemon=True)
+        heartbeat.start()
+        try:
+            results = list(scrape_pages(run['base_url'], range(item['page_start'], item['page_end'] + 1),
+                                        max_workers=max_workers, parser=parser, **scrape_options))
+        except Exception as e:
+            stop.set()
+            heartbeat.join()
+            logging.error(f"Worker {worker_id} gagal pada item {item['item_id']}: {e}")
+            queue.release(item, worker_id, str(e))
+            continue
+        stop.set()
+        heartbeat.join()
+
+        failed_pages = [result['page'] for result in results if result['status'] == 'error']
+        if failed_pages and item['attempts'] < queue.max_attempts:
+            queue.release(item, worker_id, f"halaman gagal: {failed_pages}")
+            continue
+        if queue.complete(item, worker_id, results):
+            completed += 1
+
+    logging.info(f"Worker {worker_id} selesai: {completed} item dikerjakan.")
+    return completed
+
+def merge_results(queue: WorkQueue) -> pd.DataFrame:
+    """
+    Menggabungkan hasil semua worker menjadi satu DataFrame mentah, dengan
+    kolom, urutan halaman, aturan berhenti, dan timestamp tunggal yang sama
+    seperti extract_data.
+    """
+    run = queue.run_info()
+    if run is None:
+        raise ValueError(f"Run {queue.run_id} belum direncanakan.")
+    buffer = ProductBuffer(datetime.fromisoformat(run['extraction_timestamp']))
+    expected_page = 1
+    for result in queue.iter_results():
+        if result['page'] != expected_page:
+            logging.warning(f"Hasil halaman {expected_page}-{result['page'] - 1} tidak ada (item gagal).")
+        expected_page = result['page'] + 1
+        action = page_action(result)
+        if action == 'stop':
+            break
+        if action == 'keep':
+            buffer.extend(result['products'])
+
+    logging.info(f"Penggabungan run {queue.run_id} selesai. Total {len(buffer)} data mentah.")
+    if not len(buffer):
+        logging.warning("Tidak ada data yang berhasil diekstrak.")
+        return pd.DataFrame()
+    return buffer.to_frame()
+
+def run_coordinator(queue: WorkQueue, base_url: str, total_pages: int = None, pages_per_item: int = 10,
+                    poll_interval: float = 2.0, timeout: float = None) -> pd.DataFrame:
+    """
+    Merencanakan run, menunggu semua item selesai dikerjakan worker, lalu
+    menggabungkan hasilnya (lihat merge_results).
+
+    Args:
+        queue (WorkQueue): Antrian kerja run.
+        base_url (str): URL dasar situs.
+        total_pages (int): Batas jumlah halaman yang dibagi ke worker; jumlah halaman
+            dibaca dari pagination sebelum run direncanakan. None = tanpa batas.
+        pages_per_item (int): Jumlah halaman per item kerja.
+        poll_interval (float): Jeda (detik) antar pengecekan progres.
+        timeout (float): Batas waktu menunggu worker; None = tanpa batas.
+
+    Returns:
+        pd.DataFrame: Data mentah gabungan, siap untuk transform_data.
+    """
+    if queue.run_info() is None:
+        total_pages = discover_total_pages(base_url, cap=total_pages)
+        queue.plan(base_url, total_pages, pages_per_item)
+    start = time.monotonic()
+    while not queue.is_finished():
+        if timeout is not None and time.monotonic() - start > timeout:
+            raise TimeoutError(f"Run {queue.run_id} belum selesai setelah {timeout} detik: {queue.progress()}")
+        time.sleep(poll_interval)
+
+    progress = queue.progress()
+    if progress.get('failed'):
+        logging.warning(f"Run {queue.run_id}: {progress['failed']} item gagal setelah {queue.max_attempts} percobaan.")
+    return merge_results(queue)
@@ -1,102 +1,622 @@
+import numpy as np
 import requests
-from requests.exceptions import HTTPError  
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError
 import pandas as pd
 from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import logging
+import multiprocessing
+import random
+import time
+from utils.parsers import PRODUCT_FIELDS, get_parser, parse_rows, rows_to_products, parse_page_count
+from utils.ratelimit import AdaptiveRateLimiter, parse_retry_after
+from utils.cache import PageCache
+from utils.archive import PageArchive
+from utils.checkpoint import CheckpointStore
+from utils.metrics import RunMetrics
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def extract_data(base_url: str, total_pages: int = 50) -> pd.DataFrame:
+FALLBACK_TOTAL_PAGES = 50
+
+class ProductBuffer:
     """
-    Fungsi utama untuk extract data.
-    Menggunakan selector yang benar berdasarkan 'Inspect Element' dari user.
+    Penampung produk berorientasi kolom untuk membangun DataFrame mentah.
+
+    Setiap field disimpan dalam satu list sendiri (bukan satu dict per produk),
+    dan timestamp ekstraksi yang sama untuk semua baris disimpan sekali saja,
+    baru diperluas menjadi kolom datetime64 saat DataFrame dibentuk.
     """
-    all_products = []
-    extraction_timestamp = datetime.now()
-    
-    logging.info(f"Memulai ekstraksi data dari {base_url} untuk {total_pages} halaman.")
-    
-    for page in range(1, total_pages + 1):
 
-        if page == 1:
-            shop_url = f"{base_url}/"
-        else:
-            shop_url = f"{base_url}/page{page}"
+    def __init__(self, extraction_timestamp: datetime):
+        self.extraction_timestamp = extraction_timestamp
+        self.columns = {field: [] for field in PRODUCT_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self.columns[PRODUCT_FIELDS[0]])
+
+    def extend(self, products: list) -> None:
+        """Menambahkan produk hasil parser (dict dengan kunci PRODUCT_FIELDS)."""
+        for field, values in self.columns.items():
+            values.extend([product[field] for product in products])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Membentuk DataFrame (kolom sama dengan output extract_data) lalu mengosongkan buffer."""
+        rows = len(self)
+        if not rows:
+            return pd.DataFrame()
+        data = dict(self.columns)
+        data['timestamp'] = np.full(rows, np.datetime64(self.extraction_timestamp, 'ns'))
+        self.columns = {field: [] for field in PRODUCT_FIELDS}
+        return pd.DataFrame(data)
+
+def create_session(pool_size: int = 10) -> requests.Session:
+    """
+    Membuat requests.Session dengan connection pool bersama.
+
+    Args:
+        pool_size (int): Jumlah koneksi maksimum yang disimpan per host.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def build_page_url(base_url: str, page: int) -> str:
+    """Membentuk URL halaman katalog (halaman 1 adalah root)."""
+    if page == 1:
+        return f"{base_url}/"
+    return f"{base_url}/page{page}"
+
+def _parse_timed(ctx: dict, response: requests.Response, stats: dict) -> list:
+    """
+    Menjalankan parser dan mencatat durasinya ke `stats`.
+
+    Jika process pool parser aktif, body mentah dikirim ke pool dan thread
+    fetch hanya menunggu hasilnya, sehingga parsing tidak terkunci GIL.
+    """
+    start = time.perf_counter()
+    pool = ctx['parse_pool']
+    if pool is None:
+        products = ctx['parse_products'](response.text)
+    else:
+        rows = pool.submit(parse_rows, ctx['parser'], response.content, response.encoding).result()
+        products = rows_to_products(rows)
+    stats['parse_seconds'] = time.perf_counter() - start
+    return products
+
+def _backoff_sleep(ctx: dict, attempt: int) -> None:
+    """Jeda exponential backoff (dengan jitter) sebelum percobaan ulang."""
+    delay = ctx['retry_backoff'] * (2 ** attempt)
+    if delay > 0:
+        time.sleep(delay + random.uniform(0, delay))
 
-        logging.info(f"Scraping halaman: {page}/{total_pages} - {shop_url}")
-        
+def _replayed_response(ctx: dict, shop_url: str, stats: dict) -> requests.Response:
+    """
+    Membentuk Response dari halaman yang diarsipkan, termasuk status error yang
+    diarsipkan. URL yang tidak ada di arsip (misalnya request yang gagal karena
+    koneksi) dianggap gagal, bukan 404, agar replay tidak berhenti lebih awal.
+    """
+    start = time.perf_counter()
+    stored = ctx['archive'].read(ctx['replay'], shop_url)
+    if stored is None:
+        raise requests.RequestException(f"{shop_url} tidak ada di arsip snapshot {ctx['replay']}.")
+    response = requests.Response()
+    response.url = shop_url
+    response.status_code, response._content, response.encoding = stored['status'], stored['body'], stored['charset']
+    stats['fetch_seconds'] = time.perf_counter() - start
+    stats['bytes'] = len(response.content)
+    return response
+
+def _get(ctx: dict, shop_url: str, stats: dict, headers: dict = None) -> requests.Response:
+    """
+    GET satu URL dan mencatat latensi serta ukuran body ke `stats`.
+
+    Timeout, gangguan koneksi, dan respons 5xx dicoba ulang dengan exponential
+    backoff sampai `max_retries` kali. Respons 429 memperlambat rate limiter
+    bersama lalu dicoba ulang. Respons terakhir dikembalikan apa adanya, dan
+    dicatat ke arsip halaman jika aktif (termasuk status error). Pada mode replay, halaman dibaca dari arsip.
+    """
+    prefetched = ctx['prefetched'].pop(shop_url, None)
+    if prefetched is not None:
+        response, prefetched_stats = prefetched
+        stats.update(prefetched_stats)
+        return response
+    if ctx['replay'] is not None:
+        return _replayed_response(ctx, shop_url, stats)
+
+    limiter = ctx['rate_limiter']
+    max_retries = ctx['max_retries']
+    start = time.perf_counter()
+    for attempt in range(max_retries + 1):
+        limiter.wait()
         try:
-            response = requests.get(shop_url, timeout=10)
-            response.raise_for_status() 
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            product_cards = soup.select('div.collection-card')
-            
-            if not product_cards:
-                if page == 1:
-                    logging.warning(f"Tidak ada 'div.collection-card' di Halaman 1. Melanjutkan...")
-                    continue 
-                else:
-                    logging.warning(f"Tidak ada 'div.collection-card' di halaman {page}. Berhenti.")
-                    break
-            
-            logging.info(f"Menemukan {len(product_cards)} produk di halaman {page}.")
-
-            for card in product_cards:
-                
-                title_tag = card.find('h3', class_='product-title')
-                title = title_tag.get_text(strip=True) if title_tag else 'Unknown Product'
-                
-                price_tag = card.find(class_='price-container')
-                price = price_tag.get_text(strip=True) if price_tag else 'Price Unavailable'
-                
-                rating_raw = 'Invalid Rating'
-                colors_raw = 'N/A'
-                size_raw = 'N/A'
-                gender_raw = 'N/A'
-                
-                details_div = card.find('div', class_='product-details')
-                if details_div:
-                    p_tags = details_div.find_all('p')
-                    for p in p_tags:
-                        text = p.get_text(strip=True)
-                        if text.startswith('Rating:'):
-                            rating_raw = text
-                        elif 'Colors' in text and text.endswith('Colors'):
-                            colors_raw = text
-                        elif text.startswith('Size:'):
-                            size_raw = text
-                        elif text.startswith('Gender:'):
-                            gender_raw = text
-
-                all_products.append({
-                    'Title': title,
-                    'Price': price,
-                    'Rating': rating_raw,
-                    'Colors': colors_raw,
-                    'Size': size_raw,
-                    'Gender': gender_raw,
-                    'timestamp': extraction_timestamp
-                })
-
-        except HTTPError as e:
-            if e.response.status_code == 404:
-                logging.warning(f"Halaman {page} tidak ditemukan (404). Berhenti.")
-                break  
-                logging.error(f"HTTP Error Gagal mengambil halaman {page}: {e}")
-                continue
-        except requests.RequestException as e:
-            logging.error(f"Request Gagal mengambil halaman {page}: {e}")
-            continue 
-        except Exception as e:
-            logging.error(f"Error tidak terduga saat parsing halaman {page}: {e}")
+            response = ctx['session'].get(shop_url, timeout=ctx['timeout'], headers=headers)
+        except (requests.Timeout, requests.ConnectionError) as e:
+            if attempt >= max_retries:
+                raise
+            logging.warning(f"Request {shop_url} gagal ({e}). Mencoba ulang ({attempt + 1}/{max_retries})...")
+            _backoff_sleep(ctx, attempt)
             continue
-            
-    logging.info(f"Ekstraksi selesai. Total {len(all_products)} data mentah didapat.")
-    
-    if not all_products:
+
+        if response.status_code == 429 and attempt < max_retries:
+            limiter.on_throttle(parse_retry_after(response.headers.get('Retry-After')))
+            continue
+        if response.status_code >= 500 and attempt < max_retries:
+            logging.warning(f"Server membalas {response.status_code} untuk {shop_url}. "
+                            f"Mencoba ulang ({attempt + 1}/{max_retries})...")
+            _backoff_sleep(ctx, attempt)
+            continue
+        if response.status_code < 400:
+            limiter.on_success()
+        break
+
+    stats['fetch_seconds'] = time.perf_counter() - start
+    stats['bytes'] = len(response.content)
+    status = response.status_code
+    # Status error terakhir ikut diarsipkan agar replay menghasilkan hasil halaman yang sama.
+    # 304 tidak membawa body, tetapi request tidak dibuat kondisional saat arsip aktif.
+    if ctx['archive'] is not None and status != 304:
+        ctx['archive'].record(ctx['snapshot'], shop_url, status, response.content, response.encoding)
+    return response
+
+def _fetch_products(ctx: dict, shop_url: str, stats: dict) -> list:
+    """
+    Mengambil satu URL lalu mem-parsing produknya.
+
+    Jika cache halaman aktif, request dikirim secara kondisional dan hasil
+    parsing lama dipakai ulang saat server menjawab 304 atau body tidak berubah.
+    Saat arsip halaman aktif, request tidak dibuat kondisional (respons 304 tidak
+    membawa body untuk diarsipkan), tetapi body yang tidak berubah tetap tidak di-parse ulang.
+    """
+    cache = ctx['cache']
+
+    if cache is None or ctx['replay'] is not None:
+        response = _get(ctx, shop_url, stats)
+        response.raise_for_status()
+        return _parse_timed(ctx, response, stats)
+
+    entry = cache.get(shop_url)
+    headers = cache.conditional_headers(entry) if ctx['archive'] is None else {}
+    response = _get(ctx, shop_url, stats, headers=headers or None)
+
+    if response.status_code == 304 and entry is not None:
+        cache.record('not_modified')
+        cache.touch(shop_url, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return entry['products']
+
+    response.raise_for_status()
+    body_hash = cache.hash_body(response.content)
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+
+    if entry is not None and entry['body_hash'] == body_hash:
+        cache.record('unchanged')
+        cache.touch(shop_url, etag, last_modified)
+        return entry['products']
+
+    cache.record('changed' if entry is not None else 'miss')
+    products = _parse_timed(ctx, response, stats)
+    cache.put(shop_url, etag, last_modified, body_hash, products)
+    return products
+
+def _scrape_page(ctx: dict, page: int) -> dict:
+    """
+    Mengambil dan mem-parsing satu halaman.
+
+    Returns:
+        dict: {'page', 'status', 'products'} dengan status salah satu dari
+        'ok', 'empty', 'not_found', atau 'error'.
+    """
+    checkpoint = ctx['checkpoint']
+    if checkpoint is not None:
+        stored = checkpoint.get(page)
+        if stored is not None:
+            logging.info(f"Halaman {page} diambil dari checkpoint ({stored['status']}).")
+            return stored
+
+    shop_url = build_page_url(ctx['base_url'], page)
+    logging.info(f"Scraping halaman: {page}/{ctx['total_pages']} - {shop_url}")
+
+    if ctx['request_delay'] > 0:
+        time.sleep(ctx['request_delay'])
+
+    stats = {'fetch_seconds': 0.0, 'bytes': 0, 'parse_seconds': 0.0}
+    result = {'page': page, 'status': 'error', 'products': []}
+    try:
+        products = _fetch_products(ctx, shop_url, stats)
+        result = {'page': page, 'status': 'ok' if products else 'empty', 'products': products}
+
+    except HTTPError as e:
+        if e.response.status_code == 404:
+            result = {'page': page, 'status': 'not_found', 'products': []}
+        else:
+            logging.error(f"HTTP error saat mengambil halaman {page}: {e}")
+    except requests.RequestException as e:
+        logging.error(f"Request Gagal mengambil halaman {page}: {e}")
+    except Exception as e:
+        logging.error(f"Error tidak terduga saat parsing halaman {page}: {e}")
+
+    if ctx['metrics'] is not None:
+        ctx['metrics'].record_page(page, result['status'], stats['fetch_seconds'], stats['bytes'],
+                                   stats['parse_seconds'], len(result['products']))
+    if checkpoint is not None:
+        checkpoint.record(page, result['status'], result['products'])
+    return result
+
+def _iter_page_results(ctx: dict, max_workers: int, pages=None):
+    """
+    Menghasilkan hasil scraping per halaman, selalu berurutan sesuai nomor halaman.
+
+    Pada mode konkuren, paling banyak `max_workers * 2` halaman sedang diproses
+    sekaligus, sehingga crawl tetap terbatas dan bisa dihentikan lebih awal.
+    `pages` default-nya semua halaman 1..total_pages.
+    """
+    if pages is None:
+        pages = range(1, ctx['total_pages'] + 1)
+
+    if max_workers <= 1:
+        for page in pages:
+            yield _scrape_page(ctx, page)
+        return
+
+    window = max_workers * 2
+    page_iter = iter(pages)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='extract')
+    pending = deque()
+    try:
+        for page in page_iter:
+            pending.append(executor.submit(_scrape_page, ctx, page))
+            if len(pending) >= window:
+                break
+
+        while pending:
+            result = pending.popleft().result()
+            next_page = next(page_iter, None)
+            if next_page is not None:
+                pending.append(executor.submit(_scrape_page, ctx, next_page))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _discover_total_pages(ctx: dict):
+    """
+    Membaca jumlah halaman dari pagination halaman 1.
+
+    Response halaman 1 disimpan di `ctx['prefetched']` agar tidak diambil dua kali.
+
+    Returns:
+        int atau None: Jumlah halaman, atau None jika tidak bisa ditentukan.
+    """
+    shop_url = build_page_url(ctx['base_url'], 1)
+    stats = {'fetch_seconds': 0.0, 'bytes': 0, 'parse_seconds': 0.0}
+    try:
+        response = _get(ctx, shop_url, stats)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logging.warning(f"Gagal membaca pagination dari {shop_url}: {e}")
+        return None
+
+    ctx['prefetched'][shop_url] = (response, stats)
+    return parse_page_count(response.text)
+
+def _resolve_total_pages(ctx: dict, cap):
+    """
+    Jumlah halaman yang dijadwalkan: jumlah halaman menurut pagination, dibatasi
+    `cap` jika diberikan. Jika pagination tidak terbaca, dipakai `cap` atau
+    FALLBACK_TOTAL_PAGES. Run yang dilanjutkan dari checkpoint memakai jumlah
+    halaman yang tercatat tanpa mengambil ulang halaman 1.
+    """
+    checkpoint = ctx['checkpoint']
+    if checkpoint is not None and checkpoint.total_pages is not None:
+        return checkpoint.total_pages if cap is None else min(checkpoint.total_pages, cap)
+
+    discovered = _discover_total_pages(ctx)
+    if discovered is not None:
+        logging.info(f"Pagination menunjukkan {discovered} halaman.")
+        total_pages = discovered if cap is None else min(discovered, cap)
+    else:
+        total_pages = cap if cap is not None else FALLBACK_TOTAL_PAGES
+        logging.warning(f"Pagination tidak ditemukan. Memakai batas {total_pages} halaman.")
+    if checkpoint is not None:
+        checkpoint.set_total_pages(total_pages)
+    return total_pages
+
+def _open_context(base_url: str, total_pages, options: dict) -> dict:
+    """
+    Memvalidasi opsi lalu menyiapkan konteks extract (session, process pool parser,
+    rate limiter). Tutup dengan _close_context.
+    """
+    max_workers = options['max_workers']
+    if max_workers < 1:
+        raise ValueError("max_workers minimal 1.")
+    parse_processes = options['parse_processes']
+    if parse_processes < 0:
+        raise ValueError("parse_processes tidak boleh negatif.")
+    if options['max_retries'] < 0:
+        raise ValueError("max_retries tidak boleh negatif.")
+    parse_products = get_parser(options['parser'])
+
+    session = options['session']
+    own_session = session is None
+    if own_session:
+        session = create_session(pool_size=max_workers)
+
+    parse_pool = None
+    if parse_processes > 0:
+        # 'spawn' aman dipakai walaupun thread fetch sudah berjalan.
+        parse_pool = ProcessPoolExecutor(max_workers=parse_processes,
+                                         mp_context=multiprocessing.get_context('spawn'))
+        logging.info(f"Parsing HTML dijalankan di {parse_processes} proses.")
+
+    return {
+        'session': session,
+        'own_session': own_session,
+        'base_url': base_url,
+        'total_pages': total_pages,
+        'timeout': options['timeout'],
+        'request_delay': options['request_delay'],
+        'parser': options['parser'],
+        'parse_products': parse_products,
+        'parse_pool': parse_pool,
+        'cache': options['cache'],
+        'metrics': options['metrics'],
+        'max_retries': options['max_retries'],
+        'retry_backoff': options['retry_backoff'],
+        'rate_limiter': AdaptiveRateLimiter(),
+        'prefetched': {},
+        'checkpoint': options['checkpoint'],
+        'archive': options['archive'],
+        'snapshot': options.get('snapshot'),
+        'replay': options['replay'],
+    }
+
+def _close_context(ctx: dict) -> None:
+    """Menutup sumber daya milik konteks extract dan mencatat statistiknya."""
+    if ctx['parse_pool'] is not None:
+        ctx['parse_pool'].shutdown(wait=True, cancel_futures=True)
+    if ctx['own_session']:
+        ctx['session'].close()
+    if ctx['cache'] is not None:
+        logging.info(f"Statistik cache halaman: {ctx['cache'].stats}")
+    if ctx['rate_limiter'].throttled:
+        logging.info(f"Server membalas 429 sebanyak {ctx['rate_limiter'].throttled} kali.")
+
+def page_action(result: dict) -> str:
+    """
+    Aturan berhenti extract untuk satu hasil halaman (diproses berurutan).
+
+    Returns:
+        str: 'keep' (pakai produknya), 'skip' (lewati), atau 'stop' (hentikan crawl):
+        404 dan halaman kosong setelah halaman 1 menghentikan crawl, sedangkan error
+        dan halaman 1 yang kosong dilewati.
+    """
+    page = result['page']
+    status = result['status']
+
+    if status == 'not_found':
+        logging.warning(f"Halaman {page} tidak ditemukan (404). Berhenti.")
+        return 'stop'
+    if status == 'error':
+        return 'skip'
+    if status == 'empty':
+        if page == 1:
+            logging.warning(f"Tidak ada 'div.collection-card' di Halaman 1. Melanjutkan...")
+            return 'skip'
+        else:
+            logging.warning(f"Tidak ada 'div.collection-card' di halaman {page}. Berhenti.")
+            return 'stop'
+
+    logging.info(f"Menemukan {len(result['products'])} produk di halaman {page}.")
+    return 'keep'
+
+def _iter_page_products(base_url: str, total_pages, options: dict):
+    """
+    Menghasilkan (page, products) untuk setiap halaman valid, berurutan,
+    dan menerapkan aturan berhenti (lihat page_action).
+    Timestamp tidak ditempelkan ke setiap produk; ProductBuffer yang menambahkannya.
+
+    Jumlah halaman dibaca dari pagination situs; `total_pages` (jika diberikan)
+    hanya membatasinya (lihat _resolve_total_pages).
+    `options` berisi argumen keyword dari extract_data/iter_extract_batches.
+    """
+    ctx = _open_context(base_url, total_pages, options)
+    results = None
+    try:
+        total_pages = ctx['total_pages'] = _resolve_total_pages(ctx, total_pages)
+
+        logging.info(f"Memulai ekstraksi data dari {base_url} untuk {total_pages} halaman "
+                     f"({options['max_workers']} worker).")
+        results = _iter_page_results(ctx, options['max_workers'])
+        for result in results:
+            action = page_action(result)
+            if action == 'stop':
+                break
+            if action == 'keep':
+                yield result['page'], result['products']
+    finally:
+        if results is not None:
+            results.close()
+        _close_context(ctx)
+
+def scrape_pages(base_url: str, pages, max_workers: int = 1, session: requests.Session = None,
+                 timeout: float = 10, request_delay: float = 0.0, parser: str = 'bs4',
+                 metrics: RunMetrics = None, parse_processes: int = 0, max_retries: int = 3,
+                 retry_backoff: float = 0.5):
+    """
+    Mengambil daftar halaman tertentu dan menghasilkan hasil mentahnya berurutan,
+    tanpa aturan berhenti. Dipakai misalnya oleh worker crawl terdistribusi yang
+    hanya memegang sebagian rentang halaman.
+
+    Argumen sama dengan extract_data.
+
+    Yields:
+        dict: {'page', 'status', 'products'} per halaman.
+    """
+    options = {
+        'max_workers': max_workers, 'session': session, 'timeout': timeout,
+        'request_delay': request_delay, 'parser': parser, 'cache': None, 'metrics': metrics,
+        'parse_processes': parse_processes, 'max_retries': max_retries, 'retry_backoff': retry_backoff,
+        'checkpoint': None, 'archive': None, 'replay': None,
+    }
+    pages = list(pages)
+    ctx = _open_context(base_url, max(pages, default=0), options)
+    results = _iter_page_results(ctx, max_workers, pages)
+    try:
+        yield from results
+    finally:
+        results.close()
+        _close_context(ctx)
+
+def discover_total_pages(base_url: str, cap: int = None, session: requests.Session = None,
+                         timeout: float = 10, max_retries: int = 3, retry_backoff: float = 0.5) -> int:
+    """
+    Menentukan jumlah halaman dari pagination halaman 1 tanpa mengekstrak produk,
+    misalnya untuk membagi halaman ke worker crawl terdistribusi.
+
+    Args:
+        base_url (str): URL dasar situs.
+        cap (int): Batas jumlah halaman; None = tanpa batas.
+
+    Returns:
+        int: min(jumlah halaman menurut pagination, cap). Jika pagination tidak
+        terbaca, dipakai `cap` atau FALLBACK_TOTAL_PAGES (dengan peringatan).
+    """
+    options = {
+        'max_workers': 1, 'session': session, 'timeout': timeout,
+        'request_delay': 0.0, 'parser': 'bs4', 'cache': None, 'metrics': None,
+        'parse_processes': 0, 'max_retries': max_retries, 'retry_backoff': retry_backoff,
+        'checkpoint': None, 'archive': None, 'replay': None,
+    }
+    ctx = _open_context(base_url, cap, options)
+    try:
+        return _resolve_total_pages(ctx, cap)
+    finally:
+        _close_context(ctx)
+
+def _extraction_timestamp(base_url: str, options: dict) -> datetime:
+    """
+    Timestamp ekstraksi; run yang dilanjutkan dari checkpoint memakai timestamp awalnya,
+    dan replay memakai timestamp snapshot arsip. Juga membuka snapshot arsip baru
+    (options['snapshot']) jika arsip aktif.
+    """
+    archive = options['archive']
+    if options['replay'] is not None:
+        if archive is None:
+            raise ValueError("Mode replay membutuhkan archive.")
+        info = archive.snapshot_info(archive.resolve(options['replay']))
+        if info['base_url'] != base_url:
+            raise ValueError(f"Snapshot {info['snapshot']} milik {info['base_url']}, bukan {base_url}.")
+        options['replay'] = info['snapshot']
+        logging.info(f"Mode replay: {info['pages']} halaman dibaca dari snapshot arsip {info['snapshot']}.")
+        extraction_timestamp = info['extraction_timestamp']
+    else:
+        extraction_timestamp = datetime.now()
+
+    if options['checkpoint'] is not None:
+        extraction_timestamp = options['checkpoint'].start(base_url, extraction_timestamp)
+    if archive is not None and options['replay'] is None:
+        options['snapshot'] = archive.begin(base_url, extraction_timestamp)
+    return extraction_timestamp
+
+def extract_data(base_url: str, total_pages: int = None, max_workers: int = 1,
+                 session: requests.Session = None, timeout: float = 10,
+                 request_delay: float = 0.0, parser: str = 'bs4',
+                 cache: PageCache = None, metrics: RunMetrics = None,
+                 parse_processes: int = 0, max_retries: int = 3,
+                 retry_backoff: float = 0.5, checkpoint: CheckpointStore = None,
+                 archive: PageArchive = None, replay: str = None) -> pd.DataFrame:
+    """
+    Fungsi utama untuk extract data.
+    Menggunakan selector yang benar berdasarkan 'Inspect Element' dari user.
+
+    Args:
+        base_url (str): URL dasar situs.
+        total_pages (int): Batas jumlah halaman yang di-scrape. Jumlah halaman selalu dibaca
+            dari pagination halaman 1 sehingga hanya halaman yang ada yang dijadwalkan;
+            None = tanpa batas.
+        max_workers (int): Jumlah thread fetch paralel (1 = berurutan).
+        session (requests.Session): Session yang dipakai ulang; dibuat otomatis jika None.
+        timeout (float): Timeout per request dalam detik.
+        request_delay (float): Jeda (detik) sebelum setiap request, per worker.
+        parser (str): Backend parser HTML, 'bs4' (default) atau 'lxml' (lebih cepat).
+        cache (PageCache): Cache halaman persisten untuk request kondisional; None = nonaktif.
+        metrics (RunMetrics): Penampung metrik per halaman (latensi, byte, waktu parse, jumlah kartu).
+        parse_processes (int): Jumlah proses parser. 0 = parsing di thread fetch; >0 = body
+            mentah dikirim ke process pool agar parsing memakai banyak core. Pakai bersama
+            max_workers >= parse_processes supaya pool selalu terisi.
+        max_retries (int): Percobaan ulang untuk timeout, gangguan koneksi, 5xx, dan 429.
+        retry_backoff (float): Jeda dasar exponential backoff (detik).
+        checkpoint (CheckpointStore): Jika diberikan, setiap halaman yang selesai dicatat dan
+            halaman yang sudah tercatat untuk run ID yang sama tidak diambil ulang.
+        archive (PageArchive): Jika diberikan, setiap halaman mentah yang diambil diarsipkan
+            sebagai snapshot baru.
+        replay (str): ID snapshot arsip (atau 'latest') yang diproses ulang. Halaman dibaca dari
+            `archive` tanpa jaringan dan hasilnya memakai timestamp snapshot tersebut.
+    """
+    options = {
+        'max_workers': max_workers, 'session': session, 'timeout': timeout,
+        'request_delay': request_delay, 'parser': parser, 'cache': cache, 'metrics': metrics,
+        'parse_processes': parse_processes, 'max_retries': max_retries, 'retry_backoff': retry_backoff,
+        'checkpoint': checkpoint, 'archive': archive, 'replay': replay,
+    }
+    buffer = ProductBuffer(_extraction_timestamp(base_url, options))
+
+    for _, products in _iter_page_products(base_url, total_pages, options):
+        buffer.extend(products)
+
+    logging.info(f"Ekstraksi selesai. Total {len(buffer)} data mentah didapat.")
+
+    if not len(buffer):
         logging.warning("Tidak ada data yang berhasil diekstrak.")
         return pd.DataFrame()
-            
-    return pd.DataFrame(all_products)
\ No newline at end of file
+
+    return buffer.to_frame()
+
+def iter_extract_batches(base_url: str, total_pages: int = None, batch_pages: int = 1,
+                         max_workers: int = 1, session: requests.Session = None,
+                         timeout: float = 10, request_delay: float = 0.0, parser: str = 'bs4',
+                         cache: PageCache = None, metrics: RunMetrics = None, parse_processes: int = 0,
+                         max_retries: int = 3, retry_backoff: float = 0.5,
+                         checkpoint: CheckpointStore = None, archive: PageArchive = None, replay: str = None):
+    """
+    Versi streaming dari extract_data: menghasilkan DataFrame mentah per
+    `batch_pages` halaman, sehingga data tidak perlu ditahan sampai crawl selesai.
+
+    Semua batch dalam satu pemanggilan memakai timestamp ekstraksi yang sama.
+    Argumen lain sama dengan extract_data.
+
+    Yields:
+        pd.DataFrame: Batch data mentah dengan kolom yang sama seperti extract_data.
+    """
+    if batch_pages < 1:
+        raise ValueError("batch_pages minimal 1.")
+
+    options = {
+        'max_workers': max_workers, 'session': session, 'timeout': timeout,
+        'request_delay': request_delay, 'parser': parser, 'cache': cache, 'metrics': metrics,
+        'parse_processes': parse_processes, 'max_retries': max_retries, 'retry_backoff': retry_backoff,
+        'checkpoint': checkpoint, 'archive': archive, 'replay': replay,
+    }
+    buffer = ProductBuffer(_extraction_timestamp(base_url, options))
+    pages_in_buffer = 0
+    total_rows = 0
+
+    for _, products in _iter_page_products(base_url, total_pages, options):
+        buffer.extend(products)
+        pages_in_buffer += 1
+        if pages_in_buffer >= batch_pages:
+            total_rows += len(buffer)
+            yield buffer.to_frame()
+            pages_in_buffer = 0
+
+    if len(buffer):
+        total_rows += len(buffer)
+        yield buffer.to_frame()
+
+    logging.info(f"Ekstraksi streaming selesai. Total {total_rows} data mentah didapat.")
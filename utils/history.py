@@ -0,0 +1,263 @@
+import logging
+import os
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from utils.identity import KEY_COLUMNS, product_fingerprint
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+PARTITION_FORMAT = '%Y%m'
+
+def _to_ns(value) -> int:
+    """Timestamp (datetime/str/pd.Timestamp) ke nanodetik epoch, seperti kolom datetime64[ns]."""
+    return pd.Timestamp(value).value
+
+def _month_bounds(observed_at: pd.Timestamp) -> tuple:
+    """Awal bulan observasi dan awal bulan berikutnya (nanodetik)."""
+    start = observed_at.normalize().replace(day=1)
+    return start.value, (start + pd.offsets.MonthBegin(1)).value
+
+def _nullable(value: float):
+    """NaN disimpan sebagai NULL."""
+    return None if value != value else value
+
+def _nullable_int(value: float):
+    """NaN disimpan sebagai NULL; nilai lain sebagai bilangan bulat."""
+    return None if value != value else int(value)
+
+def _frame(rows: list, columns: list) -> pd.DataFrame:
+    """Membentuk DataFrame hasil query dengan kolom timestamp bertipe datetime64[ns]."""
+    frame = pd.DataFrame(rows, columns=columns)
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'].astype('int64'), unit='ns')
+    return frame
+
+class PriceHistory:
+    """
+    Riwayat harga dan rating produk (SQLite) yang hanya menyimpan perubahan.
+
+    Setiap snapshot dibandingkan dengan nilai terakhir tiap produk (tabel
+    `latest`); hanya produk baru atau yang harga, rating, atau jumlah warnanya
+    berubah yang ditambahkan sebagai observasi, beserta harga sebelumnya.
+    Observasi dipartisi per bulan (tabel `observations_YYYYMM`) dengan kunci
+    (product_id, observed_at) dan indeks observed_at, sehingga query riwayat
+    satu produk maupun perubahan sejak waktu tertentu hanya menyentuh partisi
+    dan baris yang relevan. product_id adalah fingerprint dari utils.identity.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Lokasi file database riwayat.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                product_id INTEGER PRIMARY KEY,
+                title TEXT,
+                size TEXT,
+                gender TEXT
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS latest (
+                product_id INTEGER PRIMARY KEY,
+                observed_at INTEGER NOT NULL,
+                price REAL,
+                rating REAL,
+                colors INTEGER
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS partitions (
+                name TEXT PRIMARY KEY,
+                start_ns INTEGER NOT NULL,
+                end_ns INTEGER NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        """Jumlah observasi di semua partisi."""
+        with self._lock:
+            return sum(self._conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+                       for name in self._partitions(None, None))
+
+    def _partitions(self, start_ns, end_ns) -> list:
+        """Nama partisi yang beririsan dengan [start_ns, end_ns], terurut waktu."""
+        rows = self._conn.execute(
+            "SELECT name FROM partitions WHERE end_ns > COALESCE(?, end_ns - 1) "
+            "AND start_ns <= COALESCE(?, start_ns) ORDER BY start_ns",
+            (start_ns, end_ns),
+        ).fetchall()
+        return [name for (name,) in rows]
+
+    def _partition_for(self, observed_at: pd.Timestamp) -> str:
+        """Nama tabel partisi bulan observasi; dibuat jika belum ada."""
+        name = f"observations_{observed_at.strftime(PARTITION_FORMAT)}"
+        start_ns, end_ns = _month_bounds(observed_at)
+        self._conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {name} (
+                product_id INTEGER NOT NULL,
+                observed_at INTEGER NOT NULL,
+                price REAL,
+                rating REAL,
+                colors INTEGER,
+                prev_price REAL,
+                PRIMARY KEY (product_id, observed_at)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name}_observed_at ON {name} (observed_at)")
+        self._conn.execute("INSERT OR IGNORE INTO partitions VALUES (?, ?, ?)", (name, start_ns, end_ns))
+        return name
+
+    def append(self, df: pd.DataFrame, observed_at=None) -> int:
+        """
+        Menambahkan satu snapshot bersih; hanya produk baru atau berubah yang disimpan.
+
+        Args:
+            df (pd.DataFrame): DataFrame bersih hasil transform_data.
+            observed_at: Waktu snapshot; default kolom 'timestamp' baris pertama.
+
+        Returns:
+            int: Jumlah observasi yang ditambahkan.
+
+        Raises:
+            ValueError: Jika snapshot lebih lama dari observasi terakhir yang tersimpan
+                (delta hanya benar jika snapshot ditambahkan berurutan).
+        """
+        if df.empty:
+            return 0
+        observed_at = pd.Timestamp(observed_at if observed_at is not None else df['timestamp'].iloc[0])
+        observed_ns = observed_at.value
+
+        fingerprints = product_fingerprint(df)
+        keep = ~pd.Series(fingerprints).duplicated(keep='last').to_numpy()
+        snapshot = df[keep]
+        fingerprints = fingerprints[keep]
+        prices = snapshot['Price'].to_numpy(dtype='float64')
+        ratings = snapshot['Rating'].to_numpy(dtype='float64')
+        colors = snapshot['colors'].to_numpy(dtype='float64')
+
+        with self._lock:
+            newest = self._conn.execute("SELECT MAX(observed_at) FROM latest").fetchone()[0]
+            if newest is not None and observed_ns < newest:
+                raise ValueError(f"Snapshot {observed_at} lebih lama dari observasi terakhir "
+                                 f"{pd.Timestamp(newest)}; riwayat harus ditambahkan berurutan.")
+
+            latest = pd.read_sql_query("SELECT product_id, price, rating, colors FROM latest", self._conn)
+            positions = pd.Index(latest['product_id'].to_numpy(dtype=np.int64)).get_indexer(fingerprints)
+            is_new = positions < 0
+            changed = is_new.copy()
+            prev_prices = np.full(len(fingerprints), np.nan)
+            known = ~is_new
+            for column, values in (('price', prices), ('rating', ratings), ('colors', colors)):
+                previous = latest[column].to_numpy(dtype='float64')[positions[known]]
+                current = values[known]
+                changed[known] |= ~((previous == current) | (np.isnan(previous) & np.isnan(current)))
+            prev_prices[known] = latest['price'].to_numpy(dtype='float64')[positions[known]]
+
+            rows = [
+                (int(fp), observed_ns, _nullable(price), _nullable(rating), _nullable_int(color), _nullable(prev))
+                for fp, price, rating, color, prev in zip(fingerprints[changed].tolist(), prices[changed].tolist(),
+                                                          ratings[changed].tolist(), colors[changed].tolist(),
+                                                          prev_prices[changed].tolist())
+            ]
+            with self._conn:
+                partition = self._partition_for(observed_at)
+                self._conn.executemany(f"INSERT OR REPLACE INTO {partition} VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._conn.executemany("INSERT OR REPLACE INTO latest VALUES (?, ?, ?, ?, ?)",
+                                       (row[:5] for row in rows))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO products VALUES (?, ?, ?, ?)",
+                    zip(fingerprints[is_new].tolist(),
+                        *(snapshot.loc[is_new, col].astype(str).tolist() for col in KEY_COLUMNS)),
+                )
+        logging.info(f"Riwayat harga: {len(rows)} observasi baru dari {len(fingerprints)} produk ({observed_at}).")
+        return len(rows)
+
+    def product_history(self, title: str, size: str, gender: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Riwayat satu produk dalam rentang waktu [start, end].
+
+        Jika `start` diberikan, nilai yang sudah berlaku saat `start` (observasi
+        terakhir sebelum `start`) ikut dikembalikan dengan timestamp `start`, sehingga
+        produk yang tidak berubah selama rentang tetap punya satu baris.
+
+        Returns:
+            pd.DataFrame: Kolom 'timestamp', 'Price', 'Rating', 'colors', terurut waktu.
+                Setiap baris adalah nilai yang berlaku sejak timestamp tersebut.
+        """
+        product_id = int(product_fingerprint(pd.DataFrame({'title': [title], 'size': [size], 'gender': [gender]}))[0])
+        start_ns = _to_ns(start) if start is not None else None
+        end_ns = _to_ns(end) if end is not None else None
+        rows = []
+        with self._lock:
+            if start_ns is not None:
+                # Partisi diperiksa dari yang terbaru; observasi terakhir sebelum start cukup dicari sekali.
+                for name in reversed(self._partitions(None, start_ns)):
+                    row = self._conn.execute(
+                        f"SELECT price, rating, colors FROM {name} WHERE product_id = ? AND observed_at < ? "
+                        f"ORDER BY observed_at DESC LIMIT 1",
+                        (product_id, start_ns),
+                    ).fetchone()
+                    if row is not None:
+                        rows.append((start_ns, *row))
+                        break
+            partitions = self._partitions(start_ns, end_ns)
+            if partitions:
+                query = " UNION ALL ".join(
+                    f"SELECT observed_at, price, rating, colors FROM {name} WHERE product_id = ? "
+                    f"AND observed_at >= COALESCE(?, observed_at) AND observed_at <= COALESCE(?, observed_at)"
+                    for name in partitions
+                )
+                rows += self._conn.execute(query + " ORDER BY observed_at",
+                                           [product_id, start_ns, end_ns] * len(partitions)).fetchall()
+        if not rows:
+            return pd.DataFrame(columns=['timestamp', 'Price', 'Rating', 'colors'])
+        return _frame(rows, ['timestamp', 'Price', 'Rating', 'colors'])
+
+    def price_changes(self, since, until=None) -> pd.DataFrame:
+        """
+        Semua perubahan harga sejak `since` (sampai `until` jika diberikan).
+
+        Produk baru tidak dihitung sebagai perubahan harga.
+
+        Returns:
+            pd.DataFrame: Kolom 'title', 'size', 'gender', 'timestamp', 'old_price', 'Price', terurut waktu.
+        """
+        since_ns = _to_ns(since)
+        until_ns = _to_ns(until) if until is not None else None
+        with self._lock:
+            partitions = self._partitions(since_ns, until_ns)
+            if not partitions:
+                return pd.DataFrame(columns=['title', 'size', 'gender', 'timestamp', 'old_price', 'Price'])
+            query = " UNION ALL ".join(
+                f"SELECT p.title, p.size, p.gender, o.observed_at, o.prev_price, o.price FROM {name} o "
+                f"JOIN products p USING (product_id) WHERE o.observed_at >= ? "
+                f"AND o.observed_at <= COALESCE(?, o.observed_at) "
+                f"AND o.prev_price IS NOT NULL AND o.price IS NOT o.prev_price"
+                for name in partitions
+            )
+            rows = self._conn.execute(query + " ORDER BY 4", [since_ns, until_ns] * len(partitions)).fetchall()
+        return _frame(rows, ['title', 'size', 'gender', 'timestamp', 'old_price', 'Price'])
+
+    def close(self) -> None:
+        """Menutup koneksi database riwayat."""
+        with self._lock:
+            self._conn.close()
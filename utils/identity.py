@@ -0,0 +1,195 @@
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+KEY_COLUMNS = ['title', 'size', 'gender']
+CONTENT_COLUMNS = ['Price', 'Rating', 'colors']
+
+def _normalize_text(series: pd.Series) -> np.ndarray:
+    """
+    Huruf kecil, spasi di ujung dibuang, dan spasi berulang diringkas.
+
+    Seperti transform_data, hanya nilai unik yang diproses lalu dipetakan
+    kembali lewat kode factorize.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    normalized = np.array([' '.join(str(value).split()).lower() for value in uniques], dtype=object)
+    return normalized[codes]
+
+def _hash_columns(frame: pd.DataFrame) -> np.ndarray:
+    """Hash 64-bit per baris (deterministik), disimpan sebagai int64 agar muat di SQLite."""
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy().view(np.int64)
+
+def product_fingerprint(df: pd.DataFrame) -> np.ndarray:
+    """
+    Fingerprint stabil produk dari judul yang dinormalisasi plus ukuran dan gender.
+
+    Args:
+        df (pd.DataFrame): DataFrame bersih hasil transform_data.
+
+    Returns:
+        np.ndarray: int64 per baris.
+    """
+    keys = pd.DataFrame({col: _normalize_text(df[col]) for col in KEY_COLUMNS})
+    return _hash_columns(keys)
+
+def content_hash(df: pd.DataFrame) -> np.ndarray:
+    """Hash nilai yang dipantau perubahannya (harga, rating, jumlah warna)."""
+    return _hash_columns(df[CONTENT_COLUMNS])
+
+class ProductIndex:
+    """
+    Indeks identitas produk persisten (SQLite) untuk mendeteksi perubahan antar run.
+
+    Setiap produk disimpan dengan fingerprint (kunci INTEGER PRIMARY KEY) dan
+    hash kontennya. classify() membandingkan snapshot baru dengan indeks dalam
+    satu hash join dan mengelompokkan baris menjadi 'inserted', 'updated',
+    'unchanged', dan 'deleted'. Indeks baru diperbarui lewat commit(), sehingga
+    bisa ditunda sampai sink berhasil menulis delta-nya.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Lokasi file database indeks.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                fingerprint INTEGER PRIMARY KEY,
+                content_hash INTEGER NOT NULL,
+                title TEXT,
+                size TEXT,
+                gender TEXT,
+                first_seen TEXT NOT NULL,
+                last_changed TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    def _load(self) -> tuple:
+        """Membaca seluruh (fingerprint, content_hash) dari indeks sebagai array int64."""
+        rows = self._conn.execute("SELECT fingerprint, content_hash FROM products").fetchall()
+        table = np.array(rows, dtype=np.int64).reshape(-1, 2)
+        return table[:, 0], table[:, 1]
+
+    def _stored_keys(self, fingerprints: np.ndarray) -> pd.DataFrame:
+        """Mengambil kunci asli (seperti tersimpan di indeks) untuk fingerprint tertentu lewat tabel sementara."""
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS lookup (fingerprint INTEGER PRIMARY KEY)")
+        self._conn.execute("DELETE FROM lookup")
+        self._conn.executemany("INSERT INTO lookup VALUES (?)", ((int(fp),) for fp in fingerprints))
+        stored = pd.read_sql_query(
+            "SELECT p.fingerprint, p.title, p.size, p.gender FROM products p JOIN lookup USING (fingerprint)",
+            self._conn,
+        )
+        self._conn.execute("DELETE FROM lookup")
+        return stored
+
+    def classify(self, df: pd.DataFrame) -> dict:
+        """
+        Mengelompokkan snapshot bersih terhadap indeks dalam satu hash join.
+
+        Baris dengan fingerprint yang sama dalam satu snapshot diringkas menjadi
+        baris terakhir. Fingerprint memakai judul yang dinormalisasi, sedangkan
+        sink (misalnya upsert PostgreSQL) memakai kunci asli; jika baris yang
+        berubah kini punya kunci asli berbeda dari yang tersimpan (misalnya
+        huruf besar/kecil judul berubah), kunci lamanya ikut masuk 'deleted'
+        agar sink tidak menyimpan dua baris untuk produk yang sama.
+
+        Returns:
+            dict: 'inserted', 'updated', 'unchanged' berisi baris snapshot (kolom
+            asli); 'deleted' berisi KEY_COLUMNS produk yang tidak muncul lagi
+            dan kunci lama produk yang berganti kunci asli; 'index_upserts' dan
+            'index_deletes' dipakai oleh commit().
+        """
+        fingerprints = product_fingerprint(df)
+        keep = ~pd.Series(fingerprints).duplicated(keep='last').to_numpy()
+        snapshot = df[keep]
+        fingerprints = fingerprints[keep]
+        hashes = content_hash(snapshot)
+
+        with self._lock:
+            indexed_fingerprints, indexed_hashes = self._load()
+            positions = pd.Index(indexed_fingerprints).get_indexer(fingerprints)
+            is_new = positions < 0
+            is_same = np.zeros(len(positions), dtype=bool)
+            is_same[~is_new] = indexed_hashes[positions[~is_new]] == hashes[~is_new]
+
+            seen = np.zeros(len(indexed_fingerprints), dtype=bool)
+            seen[positions[~is_new]] = True
+            gone = indexed_fingerprints[~seen]
+            deleted = self._stored_keys(gone) if len(gone) else pd.DataFrame(columns=['fingerprint'] + KEY_COLUMNS)
+
+            is_updated = ~is_same & ~is_new
+            stored = self._stored_keys(fingerprints[is_updated]) if is_updated.any() else None
+
+        is_changed = ~is_same
+        updated = snapshot[is_updated]
+        rekeyed = pd.DataFrame(columns=KEY_COLUMNS)
+        if stored is not None:
+            # Kunci asli yang tersimpan dibandingkan dengan kunci asli baris yang berubah.
+            current = pd.DataFrame({col: updated[col].astype(str).to_numpy() for col in KEY_COLUMNS},
+                                   index=fingerprints[is_updated])
+            stored = stored.set_index('fingerprint')[KEY_COLUMNS]
+            current = current.loc[stored.index]
+            rekeyed = stored[(stored.to_numpy() != current.to_numpy()).any(axis=1)].reset_index(drop=True)
+        changes = {
+            'inserted': snapshot[is_new],
+            'updated': updated,
+            'unchanged': snapshot[is_same],
+            'deleted': pd.concat([deleted[KEY_COLUMNS], rekeyed], ignore_index=True) if len(rekeyed) else deleted[KEY_COLUMNS],
+            'index_upserts': pd.DataFrame({
+                'fingerprint': fingerprints[is_changed],
+                'content_hash': hashes[is_changed],
+                **{col: snapshot.loc[is_changed, col].astype(str).to_numpy() for col in KEY_COLUMNS},
+            }),
+            'index_deletes': deleted['fingerprint'].to_numpy(dtype=np.int64),
+        }
+        logging.info(f"Indeks produk: {len(changes['inserted'])} baru, {len(changes['updated'])} berubah, "
+                     f"{len(changes['unchanged'])} tetap, {len(deleted)} hilang, {len(rekeyed)} berganti kunci.")
+        return changes
+
+    def commit(self, changes: dict, seen_at: datetime = None) -> None:
+        """Menerapkan hasil classify() ke indeks dalam satu transaksi."""
+        seen_at = (seen_at or datetime.now()).isoformat()
+        upserts = changes['index_upserts']
+        rows = zip(upserts['fingerprint'].tolist(), upserts['content_hash'].tolist(),
+                   upserts['title'].tolist(), upserts['size'].tolist(), upserts['gender'].tolist())
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO products VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (fingerprint) DO UPDATE SET content_hash = excluded.content_hash, "
+                    "title = excluded.title, size = excluded.size, gender = excluded.gender, "
+                    "last_changed = excluded.last_changed",
+                    ((fp, ch, title, size, gender, seen_at, seen_at) for fp, ch, title, size, gender in rows),
+                )
+                self._conn.executemany("DELETE FROM products WHERE fingerprint = ?",
+                                       ((int(fp),) for fp in changes['index_deletes']))
+
+    def close(self) -> None:
+        """Menutup koneksi database indeks."""
+        with self._lock:
+            self._conn.close()
+
+def changed_rows(changes: dict) -> pd.DataFrame:
+    """Baris baru dan berubah dari hasil classify(), yaitu delta yang perlu ditulis sink."""
+    return pd.concat([changes['inserted'], changes['updated']])
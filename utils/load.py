@@ -1,29 +1,294 @@
 import pandas as pd
-from sqlalchemy import create_engine
-from sqlalchemy.exc import SQLAlchemyError
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import importlib
 import logging
 import os
+import io
+import shutil
+import sqlite3
+import time
+import uuid
+from utils.history import PriceHistory
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def load_to_csv(df: pd.DataFrame, file_path: str) -> None:
+# Dependensi berat tiap sink baru di-import saat sink itu dipakai, sehingga run
+# yang hanya menulis CSV tidak membayar waktu import Google API, SQLAlchemy, dan pyarrow.
+_LAZY_IMPORTS = {
+    'create_engine': ('sqlalchemy', 'create_engine'),
+    'SQLAlchemyError': ('sqlalchemy.exc', 'SQLAlchemyError'),
+    'service_account': ('google.oauth2.service_account', None),
+    'build': ('googleapiclient.discovery', 'build'),
+    'HttpError': ('googleapiclient.errors', 'HttpError'),
+    'pa': ('pyarrow', None),
+    'pq': ('pyarrow.parquet', None),
+}
+
+def _require(name: str):
+    """
+    Mengembalikan dependensi sink `name`, meng-import-nya saat pertama kali dibutuhkan.
+
+    Nilai disimpan sebagai atribut modul, jadi patch('utils.load.build') dan
+    sejenisnya tetap berlaku.
+    """
+    value = globals().get(name)
+    if value is None:
+        module_name, attribute = _LAZY_IMPORTS[name]
+        module = importlib.import_module(module_name)
+        value = getattr(module, attribute) if attribute else module
+        globals()[name] = value
+    return value
+
+def __getattr__(name: str):
+    if name in _LAZY_IMPORTS:
+        return _require(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def load_to_csv(df: pd.DataFrame, file_path: str, append: bool = False) -> bool:
     """
     Menyimpan DataFrame ke file CSV.
     
     Args:
         df (pd.DataFrame): DataFrame bersih.
         file_path (str): Lokasi file CSV output.
+        append (bool): Jika True, baris ditambahkan ke file tanpa header (mode streaming).
     """
     try:
-        df.to_csv(file_path, index=False, encoding='utf-8', date_format='%Y-%m-%d %H:%M:%S')
+        if append:
+            df.to_csv(file_path, index=False, encoding='utf-8', date_format='%Y-%m-%d %H:%M:%S',
+                      mode='a', header=False)
+        else:
+            df.to_csv(file_path, index=False, encoding='utf-8', date_format='%Y-%m-%d %H:%M:%S')
         logging.info(f"Data berhasil disimpan ke CSV: {file_path}")
+        return True
     except (IOError, OSError) as e:
         logging.error(f"Gagal menyimpan ke CSV {file_path}: {e}")
+        return False
         
-def load_to_gdrive(df: pd.DataFrame, sheet_id: str, creds_path: str) -> None:
+PARQUET_PARTITION_KEY = 'extracted_at'
+PARQUET_PARTITION_FORMAT = '%Y-%m-%dT%H-%M-%S'
+
+def _atomic_write_parquet(table, final_path: str, compression: str) -> None:
+    """Menulis tabel Arrow ke file sementara lalu mengganti file tujuan secara atomik."""
+    directory, name = os.path.split(final_path)
+    tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+    pq = _require('pq')
+    try:
+        pq.write_table(table, tmp_path, compression=compression)
+        os.replace(tmp_path, final_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_to_parquet(df: pd.DataFrame, base_dir: str, mode: str = 'append', compression: str = 'zstd',
+                    append: bool = None) -> bool:
+    """
+    Menyimpan DataFrame sebagai file Parquet bertipe dan terkompresi, dipartisi
+    per timestamp ekstraksi (base_dir/extracted_at=YYYY-MM-DDTHH-MM-SS/part-*.parquet).
+
+    Setiap file ditulis ke file sementara lalu di-rename, sehingga pembaca tidak
+    pernah melihat file setengah jadi.
+
+    Args:
+        df (pd.DataFrame): DataFrame bersih.
+        base_dir (str): Folder root dataset Parquet.
+        mode (str): 'append' menambah file baru ke partisi (cocok untuk batch streaming);
+            'overwrite' mengganti seluruh isi partisi snapshot tersebut.
+        compression (str): Codec kompresi Parquet.
+        append (bool): Flag mode streaming; jika diberikan, menggantikan `mode`
+            (False = 'overwrite' untuk batch pertama, True = 'append').
+    """
+    if append is not None:
+        mode = 'append' if append else 'overwrite'
+    if mode not in ('append', 'overwrite'):
+        logging.error(f"Mode Parquet tidak dikenal: {mode}")
+        return False
+
+    pa = _require('pa')
+    try:
+        timestamps = pd.to_datetime(df['timestamp'])
+        for snapshot_ts, part in df.groupby(timestamps.dt.strftime(PARQUET_PARTITION_FORMAT), sort=True, observed=True):
+            partition_dir = os.path.join(base_dir, f"{PARQUET_PARTITION_KEY}={snapshot_ts}")
+            os.makedirs(partition_dir, exist_ok=True)
+            table = pa.Table.from_pandas(part, preserve_index=False)
+
+            if mode == 'overwrite':
+                final_path = os.path.join(partition_dir, 'part-0.parquet')
+                _atomic_write_parquet(table, final_path, compression)
+                for name in os.listdir(partition_dir):
+                    if name.startswith('part-') and name != 'part-0.parquet':
+                        os.remove(os.path.join(partition_dir, name))
+            else:
+                final_path = os.path.join(partition_dir, f"part-{uuid.uuid4().hex}.parquet")
+                _atomic_write_parquet(table, final_path, compression)
+
+            logging.info(f"{len(part)} baris berhasil disimpan ke Parquet: {final_path}")
+        return True
+
+    except (IOError, OSError, pa.ArrowException) as e:
+        logging.error(f"Gagal menyimpan ke Parquet {base_dir}: {e}")
+        return False
+    except Exception as e:
+        logging.error(f"Error tidak terduga saat menyimpan ke Parquet: {e}")
+        return False
+
+def list_parquet_snapshots(base_dir: str) -> list:
+    """Mengembalikan nama partisi snapshot (nilai extracted_at), terurut dari yang terlama."""
+    if not os.path.isdir(base_dir):
+        return []
+    prefix = f"{PARQUET_PARTITION_KEY}="
+    return sorted(name[len(prefix):] for name in os.listdir(base_dir) if name.startswith(prefix))
+
+def read_parquet_snapshot(base_dir: str, snapshot: str = None, columns: list = None,
+                          filters: list = None, memory_map: bool = True) -> pd.DataFrame:
+    """
+    Membaca satu snapshot Parquet tanpa parsing teks.
+
+    Args:
+        base_dir (str): Folder root dataset Parquet.
+        snapshot (str): Nilai extracted_at (lihat list_parquet_snapshots); None = snapshot terbaru.
+        columns (list): Kolom yang dibaca (column pruning).
+        filters (list): Predicate push-down format pyarrow, mis. [('Price', '<', 500000)].
+        memory_map (bool): Memakai memory map saat membaca file lokal.
+
+    Returns:
+        pd.DataFrame: Isi snapshot, atau DataFrame kosong jika tidak ada snapshot.
+    """
+    if snapshot is None:
+        snapshots = list_parquet_snapshots(base_dir)
+        if not snapshots:
+            logging.warning(f"Tidak ada snapshot Parquet di {base_dir}.")
+            return pd.DataFrame()
+        snapshot = snapshots[-1]
+
+    partition_dir = os.path.join(base_dir, f"{PARQUET_PARTITION_KEY}={snapshot}")
+    table = _require('pq').read_table(partition_dir, columns=columns, filters=filters, memory_map=memory_map,
+                          partitioning=None)
+    return table.to_pandas()
+
+def load_to_history(df: pd.DataFrame, path: str, append: bool = False) -> bool:
+    """
+    Menambahkan snapshot ke riwayat harga/rating (lihat utils.history.PriceHistory).
+    Hanya produk baru atau berubah yang disimpan, jadi observasi lama tidak pernah ditimpa.
+
+    Args:
+        df (pd.DataFrame): DataFrame bersih (atau satu batch pada mode streaming).
+        path (str): Lokasi file database riwayat.
+        append (bool): Flag mode streaming; diabaikan karena riwayat selalu ditambahkan.
+    """
+    try:
+        history = PriceHistory(path)
+        try:
+            added = history.append(df)
+        finally:
+            history.close()
+        logging.info(f"{added} observasi ditambahkan ke riwayat harga: {path}")
+        return True
+    except (ValueError, sqlite3.Error, OSError) as e:
+        logging.error(f"Gagal menyimpan ke riwayat harga {path}: {e}")
+        return False
+    except Exception as e:
+        logging.error(f"Error tidak terduga saat menyimpan riwayat harga: {e}")
+        return False
+
+def _query_staging_dir(path: str) -> str:
+    """Folder staging batch streaming untuk snapshot query di `path`."""
+    return f"{path}.staging"
+
+def load_to_query_snapshot(df: pd.DataFrame, path: str, append: bool = None) -> bool:
+    """
+    Menulis snapshot bersih ke satu file Parquet untuk layanan query (utils.query).
+    File diganti secara atomik, sehingga layanan yang memantaunya selalu memuat
+    snapshot utuh lalu menukarnya dengan snapshot lama.
+
+    Args:
+        df (pd.DataFrame): DataFrame bersih.
+        path (str): Lokasi file Parquet snapshot.
+        append (bool): Flag mode streaming; jika diberikan, batch hanya ditulis sebagai
+            file part di folder staging `<path>.staging` (False = batch pertama, staging
+            lama dikosongkan). File snapshot baru diganti oleh publish_query_snapshot()
+            setelah batch terakhir, sehingga layanan tidak memuat snapshot setengah jadi.
+    """
+    pa = _require('pa')
+    try:
+        if append is not None:
+            staging = _query_staging_dir(path)
+            if not append and os.path.isdir(staging):
+                shutil.rmtree(staging)
+            os.makedirs(staging, exist_ok=True)
+            parts = sum(1 for name in os.listdir(staging) if name.endswith('.parquet'))
+            _atomic_write_parquet(pa.Table.from_pandas(df, preserve_index=False),
+                                  os.path.join(staging, f"part-{parts:06d}.parquet"), 'zstd')
+            logging.info(f"Batch snapshot query ({len(df)} baris) ditulis ke staging {staging}")
+            return True
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _atomic_write_parquet(pa.Table.from_pandas(df, preserve_index=False), path, 'zstd')
+        logging.info(f"Snapshot query ({len(df)} baris) berhasil disimpan: {path}")
+        return True
+    except (IOError, OSError, pa.ArrowException) as e:
+        logging.error(f"Gagal menyimpan snapshot query {path}: {e}")
+        return False
+    except Exception as e:
+        logging.error(f"Error tidak terduga saat menyimpan snapshot query: {e}")
+        return False
+
+def publish_query_snapshot(path: str) -> bool:
+    """
+    Menggabungkan batch streaming di folder staging menjadi file snapshot query,
+    mengganti file lama secara atomik sekali saja, lalu menghapus folder staging.
+
+    Args:
+        path (str): Lokasi file Parquet snapshot (sama dengan load_to_query_snapshot).
+    """
+    pa = _require('pa')
+    staging = _query_staging_dir(path)
+    parts = sorted(name for name in os.listdir(staging) if name.endswith('.parquet')) \
+        if os.path.isdir(staging) else []
+    if not parts:
+        logging.warning(f"Tidak ada batch snapshot query di {staging}; snapshot tidak diganti.")
+        return False
+    try:
+        df = pd.concat([pd.read_parquet(os.path.join(staging, name)) for name in parts], ignore_index=True)
+        if not load_to_query_snapshot(df, path):
+            return False
+        shutil.rmtree(staging)
+        return True
+    except (IOError, OSError, pa.ArrowException) as e:
+        logging.error(f"Gagal menerbitkan snapshot query {path}: {e}")
+        return False
+
+def _sheet_columns(df: pd.DataFrame, header: bool = True) -> list:
+    """
+    Mengubah DataFrame menjadi list nilai per kolom (tipe Python native, siap JSON)
+    tanpa membuat salinan DataFrame atau array object 2D. Jika `header` True,
+    nama kolom menjadi sel pertama setiap kolom.
+    """
+    columns = []
+    for name in df.columns:
+        values = df[name]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime('%Y-%m-%d %H:%M:%S')
+        if values.hasnans:
+            values = values.astype(object).where(values.notna(), '')
+        column = values.tolist()
+        if header:
+            column.insert(0, str(name))
+        columns.append(column)
+    return columns
+
+def _sheet_body(df: pd.DataFrame, header: bool = True) -> dict:
+    """Payload ValueRange Google Sheets yang dikirim kolom per kolom (majorDimension 'COLUMNS')."""
+    return {'majorDimension': 'COLUMNS', 'values': _sheet_columns(df, header=header)}
+
+def _sheets_service(creds_path: str):
+    """Membuat client Google Sheets API dari file kredensial service account."""
+    SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+    creds = _require('service_account').Credentials.from_service_account_file(creds_path, scopes=SCOPES)
+    return _require('build')('sheets', 'v4', credentials=creds)
+
+def load_to_gdrive(df: pd.DataFrame, sheet_id: str, creds_path: str, append: bool = False) -> bool:
     """
     Mengupload DataFrame ke Google Sheets.
     
@@ -31,24 +296,29 @@ def load_to_gdrive(df: pd.DataFrame, sheet_id: str, creds_path: str) -> None:
         df (pd.DataFrame): DataFrame bersih.
         sheet_id (str): ID Google Sheet.
         creds_path (str): Path ke file google-sheets-api.json.
+        append (bool): Jika True, baris ditambahkan di bawah data yang ada tanpa
+            clear dan tanpa header (mode streaming).
     """
     if not os.path.exists(creds_path):
         logging.error(f"File kredensial Google Sheets tidak ditemukan: {creds_path}")
-        return
+        return False
         
+    HttpError = _require('HttpError')
     try:
-        SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-        creds = service_account.Credentials.from_service_account_file(creds_path, scopes=SCOPES)
-        service = build('sheets', 'v4', credentials=creds)
+        service = _sheets_service(creds_path)
 
-        df_gdrive = df.copy()
-        df_gdrive['timestamp'] = df_gdrive['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-        
-        values = [df_gdrive.columns.tolist()] + df_gdrive.values.tolist()
-        
-        body = {
-            'values': values
-        }
+        if append:
+            service.spreadsheets().values().append(
+                spreadsheetId=sheet_id,
+                range='Sheet1',
+                valueInputOption='USER_ENTERED',
+                insertDataOption='INSERT_ROWS',
+                body=_sheet_body(df, header=False)
+            ).execute()
+            logging.info(f"{len(df)} baris berhasil ditambahkan ke Google Sheet ID: {sheet_id}")
+            return True
+
+        body = _sheet_body(df)
         
         range_name = 'Sheet1!A1'
         
@@ -65,13 +335,176 @@ def load_to_gdrive(df: pd.DataFrame, sheet_id: str, creds_path: str) -> None:
         ).execute()
         
         logging.info(f"Data berhasil di-upload ke Google Sheet ID: {sheet_id}")
+        return True
         
     except HttpError as e:
         logging.error(f"Error saat API Google Sheets: {e}")
+        return False
     except Exception as e:
         logging.error(f"Error tidak terduga saat upload ke Google Sheets: {e}")
+        return False
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+def _column_letter(index: int) -> str:
+    """Mengubah indeks kolom (0-based) menjadi huruf kolom A1 (0 -> A, 26 -> AA)."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _execute_with_backoff(request, max_retries: int, base_delay: float):
+    """Menjalankan request Sheets API, mengulang dengan backoff eksponensial untuk 429/5xx."""
+    HttpError = _require('HttpError')
+    for attempt in range(max_retries + 1):
+        try:
+            return request.execute()
+        except HttpError as e:
+            status = getattr(e.resp, 'status', None)
+            if status not in _RETRYABLE_STATUS or attempt == max_retries:
+                raise
+            delay = base_delay * (2 ** attempt)
+            logging.warning(f"Google Sheets API membalas {status}, mencoba lagi dalam {delay:.1f} detik...")
+            time.sleep(delay)
+
+def _normalize_cell(value):
+    """Menyamakan representasi sel agar nilai lama dan baru bisa dibandingkan."""
+    if isinstance(value, bool) or value is None:
+        return '' if value is None else value
+    if isinstance(value, (int, float)):
+        return float(value)
+    return value
+
+def _changed_row_blocks(old_columns: list, new_columns: list, rows: int) -> list:
+    """
+    Mengembalikan blok (start, end) baris berurutan (0-based, end eksklusif) yang
+    berbeda, dengan membandingkan sheet lama dan snapshot baru kolom per kolom.
+    """
+    changed = [False] * rows
+    for index, new in enumerate(new_columns):
+        old = old_columns[index] if index < len(old_columns) else []
+        for row, value in enumerate(new):
+            if not changed[row] and _normalize_cell(old[row] if row < len(old) else '') != _normalize_cell(value):
+                changed[row] = True
+
+    blocks = []
+    start = None
+    for row, is_changed in enumerate(changed):
+        if is_changed and start is None:
+            start = row
+        elif not is_changed and start is not None:
+            blocks.append((start, row))
+            start = None
+    if start is not None:
+        blocks.append((start, rows))
+    return blocks
+
+def sync_to_gdrive(df: pd.DataFrame, sheet_id: str, creds_path: str = None, sheet_name: str = 'Sheet1',
+                   max_cells_per_request: int = 50000, max_retries: int = 5,
+                   base_delay: float = 1.0, service=None) -> bool:
+    """
+    Menyinkronkan DataFrame ke Google Sheets dengan hanya mengirim baris yang berubah.
+
+    Isi sheet saat ini dibaca lebih dulu (kolom per kolom) lalu dibandingkan dengan
+    snapshot baru untuk menemukan baris yang berbeda. Blok baris tersebut dikirim lewat
+    values().batchUpdate sebagai potongan list per kolom (majorDimension 'COLUMNS'),
+    tanpa menyusun ulang snapshot menjadi list per baris, dengan ukuran payload
+    dibatasi `max_cells_per_request`. Baris/kolom sisa dari snapshot lama
+    dikosongkan. Sheet tidak pernah di-clear total, jadi tidak pernah kosong saat upload.
+    Nilai dikirim dengan valueInputOption='RAW' agar pembacaan berikutnya bisa
+    dibandingkan apa adanya.
+
+    Args:
+        df (pd.DataFrame): DataFrame bersih.
+        sheet_id (str): ID Google Sheet.
+        creds_path (str): Path ke file google-sheets-api.json (tidak dipakai jika `service` diberikan).
+        sheet_name (str): Nama tab tujuan.
+        max_cells_per_request (int): Jumlah sel maksimum per request batchUpdate.
+        max_retries (int): Jumlah percobaan ulang untuk respons 429/5xx.
+        base_delay (float): Jeda awal backoff dalam detik.
+        service: Client Sheets API yang sudah dibuat (misalnya fake untuk test).
+    """
+    if service is None:
+        if not creds_path or not os.path.exists(creds_path):
+            logging.error(f"File kredensial Google Sheets tidak ditemukan: {creds_path}")
+            return False
+
+    HttpError = _require('HttpError')
+    try:
+        if service is None:
+            service = _sheets_service(creds_path)
+        values_api = service.spreadsheets().values()
+
+        existing = _execute_with_backoff(
+            values_api.get(spreadsheetId=sheet_id, range=sheet_name, valueRenderOption='UNFORMATTED_VALUE',
+                           majorDimension='COLUMNS'),
+            max_retries, base_delay
+        ).get('values', [])
+
+        new_columns = _sheet_columns(df)
+        width = len(df.columns)
+        new_rows = len(df) + 1
+        last_column = _column_letter(width - 1)
+        rows_per_request = max(1, max_cells_per_request // max(width, 1))
+
+        data = []
+        for start, end in _changed_row_blocks(existing, new_columns, new_rows):
+            for chunk_start in range(start, end, rows_per_request):
+                chunk_end = min(chunk_start + rows_per_request, end)
+                data.append({
+                    'range': f"{sheet_name}!A{chunk_start + 1}:{last_column}{chunk_end}",
+                    'majorDimension': 'COLUMNS',
+                    'values': [column[chunk_start:chunk_end] for column in new_columns],
+                })
+
+        requests_sent = 0
+        batch, batch_cells = [], 0
+        for item in data + [None]:
+            item_cells = len(item['values'][0]) * width if item else 0
+            if batch and (item is None or batch_cells + item_cells > max_cells_per_request):
+                _execute_with_backoff(
+                    values_api.batchUpdate(spreadsheetId=sheet_id,
+                                           body={'valueInputOption': 'RAW', 'data': batch}),
+                    max_retries, base_delay
+                )
+                requests_sent += 1
+                batch, batch_cells = [], 0
+            if item is not None:
+                batch.append(item)
+                batch_cells += item_cells
+
+        stale_ranges = []
+        old_rows = max((len(column) for column in existing), default=0)
+        old_width = len(existing)
+        if old_rows > new_rows:
+            stale_ranges.append(f"{sheet_name}!A{new_rows + 1}:{_column_letter(max(old_width, width) - 1)}{old_rows}")
+        if old_width > width:
+            stale_ranges.append(f"{sheet_name}!{_column_letter(width)}1:{_column_letter(old_width - 1)}{new_rows}")
+        if stale_ranges:
+            _execute_with_backoff(
+                values_api.batchClear(spreadsheetId=sheet_id, body={'ranges': stale_ranges}),
+                max_retries, base_delay
+            )
+
+        changed_rows = sum(len(item['values'][0]) for item in data)
+        logging.info(f"Sinkronisasi Google Sheet ID {sheet_id} selesai: {changed_rows} baris berubah "
+                     f"dalam {requests_sent} request, {len(stale_ranges)} range dikosongkan.")
+        return True
+
+    except HttpError as e:
+        logging.error(f"Error saat API Google Sheets: {e}")
+        return False
+    except Exception as e:
+        logging.error(f"Error tidak terduga saat sinkronisasi ke Google Sheets: {e}")
+        return False
+
+def postgres_engine(db_url: str):
+    """Engine SQLAlchemy yang bisa dipakai ulang lintas pemanggilan sink (misalnya semua batch streaming)."""
+    return _require('create_engine')(db_url)
 
-def load_to_postgres(df: pd.DataFrame, db_url: str, table_name: str) -> None:
+def load_to_postgres(df: pd.DataFrame, db_url: str, table_name: str, append: bool = False, engine=None) -> bool:
     """
     Menyimpan DataFrame ke database PostgreSQL.
     
@@ -79,14 +512,173 @@ def load_to_postgres(df: pd.DataFrame, db_url: str, table_name: str) -> None:
         df (pd.DataFrame): DataFrame bersih.
         db_url (str): URL koneksi SQLAlchemy.
         table_name (str): Nama tabel tujuan.
+        append (bool): Jika True, baris ditambahkan ke tabel yang ada (mode streaming).
+        engine: Engine dari postgres_engine() untuk dipakai ulang; None = engine baru dari db_url.
     """
+    create_engine, SQLAlchemyError = _require('create_engine'), _require('SQLAlchemyError')
     try:
-        engine = create_engine(db_url)
+        if engine is None:
+            engine = create_engine(db_url)
         with engine.connect() as connection:
-            df.to_sql(table_name, connection, if_exists='replace', index=False)
+            df.to_sql(table_name, connection, if_exists='append' if append else 'replace', index=False)
             logging.info(f"Data berhasil disimpan ke PostgreSQL, tabel: {table_name}")
+            return True
             
     except SQLAlchemyError as e:
         logging.error(f"Gagal menyimpan ke PostgreSQL: {e}")
+        return False
+    except Exception as e:
+        logging.error(f"Error tidak terduga saat koneksi PostgreSQL: {e}")
+        return False
+
+_POSTGRES_TYPES = {
+    'i': 'BIGINT',
+    'u': 'BIGINT',
+    'f': 'DOUBLE PRECISION',
+    'b': 'BOOLEAN',
+    'M': 'TIMESTAMP',
+}
+
+def _quote_ident(name: str) -> str:
+    """Meng-quote nama tabel/kolom PostgreSQL (mendukung huruf besar dan spasi)."""
+    return '"' + name.replace('"', '""') + '"'
+
+def _postgres_column_type(dtype) -> str:
+    """Memetakan dtype pandas ke tipe kolom PostgreSQL."""
+    return _POSTGRES_TYPES.get(dtype.kind, 'TEXT')
+
+def load_to_postgres_upsert(df: pd.DataFrame, db_url: str, table_name: str,
+                            key_columns: tuple = ('title', 'size', 'gender'),
+                            delete_missing: bool = False, chunk_rows: int = 50000,
+                            delete_keys: pd.DataFrame = None) -> bool:
+    """
+    Memuat DataFrame ke PostgreSQL dengan COPY ke tabel staging lalu upsert
+    berbasis kunci ke tabel tujuan dalam satu transaksi.
+
+    Berbeda dengan load_to_postgres, tabel tujuan tidak pernah di-drop sehingga
+    pembaca tidak melihat tabel kosong saat load berjalan. Hanya baris yang
+    nilainya berubah (selain kolom 'timestamp') yang ditulis ulang, sehingga
+    'timestamp' menunjukkan kapan baris terakhir berubah. Jika satu kunci muncul
+    lebih dari sekali di `df`, baris terakhir yang dipakai.
+
+    Args:
+        df (pd.DataFrame): DataFrame bersih.
+        db_url (str): URL koneksi SQLAlchemy.
+        table_name (str): Nama tabel tujuan (dibuat jika belum ada).
+        key_columns (tuple): Kolom kunci unik produk.
+        delete_missing (bool): Jika True, baris yang tidak ada di snapshot ini dihapus.
+        chunk_rows (int): Jumlah baris per potongan CSV yang dikirim lewat COPY.
+        delete_keys (pd.DataFrame): Kunci produk (key_columns) yang harus dihapus, misalnya
+            'deleted' dari ProductIndex.classify() saat `df` hanya berisi delta.
+    """
+    missing_keys = [col for col in key_columns if col not in df.columns]
+    if missing_keys:
+        logging.error(f"Kolom kunci tidak ditemukan di DataFrame: {missing_keys}")
+        return False
+
+    columns = list(df.columns)
+    value_columns = [col for col in columns if col not in key_columns]
+    compare_columns = [col for col in value_columns if col != 'timestamp']
+
+    target = _quote_ident(table_name)
+    staging = _quote_ident(f"{table_name}_staging")
+    column_list = ', '.join(_quote_ident(col) for col in columns)
+    key_list = ', '.join(_quote_ident(col) for col in key_columns)
+    column_defs = ', '.join(f"{_quote_ident(col)} {_postgres_column_type(df[col].dtype)}" for col in columns)
+
+    if value_columns:
+        update_set = ', '.join(f"{_quote_ident(col)} = EXCLUDED.{_quote_ident(col)}" for col in value_columns)
+        on_conflict = f"DO UPDATE SET {update_set}"
+        if compare_columns:
+            current = ', '.join(f"{target}.{_quote_ident(col)}" for col in compare_columns)
+            incoming = ', '.join(f"EXCLUDED.{_quote_ident(col)}" for col in compare_columns)
+            on_conflict += f" WHERE ({current}) IS DISTINCT FROM ({incoming})"
+    else:
+        on_conflict = "DO NOTHING"
+
+    # Urutan baris staging sesuai urutan COPY; untuk kunci ganda baris terakhir yang dipakai.
+    staging_row = _quote_ident('_staging_row')
+    upsert_sql = (
+        f"INSERT INTO {target} ({column_list}) "
+        f"SELECT DISTINCT ON ({key_list}) {column_list} FROM {staging} "
+        f"ORDER BY {key_list}, {staging_row} DESC "
+        f"ON CONFLICT ({key_list}) {on_conflict} "
+        f"RETURNING (xmax = 0) AS inserted"
+    )
+    copy_sql = f"COPY {staging} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '')"
+
+    create_engine, SQLAlchemyError = _require('create_engine'), _require('SQLAlchemyError')
+    engine = None
+    try:
+        engine = create_engine(db_url)
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT to_regclass(%s)", (target,))
+            if cursor.fetchone()[0] is None:
+                cursor.execute(f"CREATE TABLE {target} ({column_defs}, PRIMARY KEY ({key_list}))")
+            else:
+                # Tabel lama (misalnya dari load_to_postgres mode replace) belum punya kunci untuk ON CONFLICT.
+                cursor.execute(
+                    f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote_ident(f'{table_name}_key_idx')} "
+                    f"ON {target} ({key_list})"
+                )
+            cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {target} INCLUDING DEFAULTS, "
+                           f"{staging_row} BIGSERIAL) ON COMMIT DROP")
+
+            for start in range(0, len(df), chunk_rows):
+                buffer = io.StringIO()
+                df.iloc[start:start + chunk_rows].to_csv(buffer, index=False, header=False,
+                                                         date_format='%Y-%m-%d %H:%M:%S.%f')
+                buffer.seek(0)
+                cursor.copy_expert(copy_sql, buffer)
+
+            cursor.execute(upsert_sql)
+            changes = cursor.fetchall()
+            inserted = sum(1 for (is_insert,) in changes if is_insert)
+            updated = len(changes) - inserted
+
+            deleted = 0
+            if delete_keys is not None and not delete_keys.empty:
+                doomed = _quote_ident(f"{table_name}_delete")
+                cursor.execute(f"CREATE TEMP TABLE {doomed} ON COMMIT DROP AS SELECT {key_list} FROM {target} "
+                               f"WITH NO DATA")
+                buffer = io.StringIO()
+                delete_keys[list(key_columns)].to_csv(buffer, index=False, header=False)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {doomed} ({key_list}) FROM STDIN WITH (FORMAT csv, NULL '')", buffer)
+                doomed_match = ' AND '.join(
+                    f"{doomed}.{_quote_ident(col)} IS NOT DISTINCT FROM {target}.{_quote_ident(col)}"
+                    for col in key_columns
+                )
+                cursor.execute(f"DELETE FROM {target} USING {doomed} WHERE {doomed_match}")
+                deleted += cursor.rowcount
+
+            if delete_missing:
+                key_match = ' AND '.join(
+                    f"{staging}.{_quote_ident(col)} IS NOT DISTINCT FROM {target}.{_quote_ident(col)}"
+                    for col in key_columns
+                )
+                cursor.execute(f"DELETE FROM {target} WHERE NOT EXISTS (SELECT 1 FROM {staging} WHERE {key_match})")
+                deleted += cursor.rowcount
+
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            connection.close()
+
+        logging.info(f"Upsert PostgreSQL selesai, tabel: {table_name} "
+                     f"({inserted} baru, {updated} berubah, {deleted} dihapus).")
+        return True
+
+    except SQLAlchemyError as e:
+        logging.error(f"Gagal menyimpan ke PostgreSQL: {e}")
+        return False
     except Exception as e:
-        logging.error(f"Error tidak terduga saat koneksi PostgreSQL: {e}")
\ No newline at end of file
+        logging.error(f"Error tidak terduga saat upsert PostgreSQL: {e}")
+        return False
+    finally:
+        if engine is not None:
+            engine.dispose()
@@ -0,0 +1,186 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    """Persentil sederhana (nearest-rank) dari list yang sudah terurut."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def _atomic_write(path: str, content: str) -> None:
+    """
+    Menulis file lewat file sementara + rename agar pembaca tidak melihat file setengah jadi.
+    Nama file sementara unik, sehingga beberapa run yang menulis file yang sama
+    (misalnya etl.prom bersama) tidak saling menimpa file sementaranya.
+    """
+    directory, name = os.path.split(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=f".{name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+class RunMetrics:
+    """
+    Kumpulan metrik satu run ETL: latensi fetch dan ukuran setiap halaman,
+    waktu parsing, jumlah kartu, baris yang dibuang per langkah transform,
+    serta durasi dan throughput setiap sink.
+
+    Aman dipakai dari beberapa thread (mode fetch konkuren dan load paralel).
+    Hasilnya bisa ditulis sebagai laporan JSON dan file textfile Prometheus.
+    """
+
+    def __init__(self, run_id: str = None):
+        self.run_id = run_id or datetime.now().strftime('%Y%m%dT%H%M%S')
+        self.started_at = time.time()
+        self.pages = []
+        self.transform_steps = []
+        self.sinks = {}
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def record_page(self, page: int, status: str, fetch_seconds: float = 0.0, bytes_received: int = 0,
+                    parse_seconds: float = 0.0, cards: int = 0) -> None:
+        """Mencatat hasil satu halaman dari tahap extract."""
+        with self._lock:
+            self.pages.append({
+                'page': page,
+                'status': status,
+                'fetch_seconds': fetch_seconds,
+                'bytes': bytes_received,
+                'parse_seconds': parse_seconds,
+                'cards': cards,
+            })
+
+    def record_transform_step(self, step: str, rows_dropped: int) -> None:
+        """Mencatat jumlah baris yang dibuang oleh satu langkah transform."""
+        with self._lock:
+            self.transform_steps.append({'step': step, 'rows_dropped': int(rows_dropped)})
+
+    def record_sink(self, name: str, seconds: float, rows: int, status: str = 'ok') -> None:
+        """
+        Mencatat durasi, jumlah baris, dan status satu sink. Pemanggilan berulang
+        untuk sink yang sama (mode streaming) dijumlahkan.
+        """
+        with self._lock:
+            previous = self.sinks.get(name)
+            if previous is not None:
+                seconds += previous['seconds']
+                rows += previous['rows']
+                if previous['status'] != 'ok':
+                    status = previous['status']
+            self.sinks[name] = {
+                'seconds': seconds,
+                'rows': rows,
+                'rows_per_sec': rows / seconds if seconds > 0 else None,
+                'status': status,
+            }
+
+    @contextmanager
+    def stage(self, name: str):
+        """Context manager untuk mengukur durasi satu tahap (extract/transform/load)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = time.perf_counter() - start
+
+    def summary(self) -> dict:
+        """Ringkasan agregat metrik extract, transform, dan load."""
+        with self._lock:
+            pages = list(self.pages)
+            steps = list(self.transform_steps)
+            sinks = dict(self.sinks)
+            stages = dict(self.stages)
+
+        by_status = {}
+        for record in pages:
+            by_status[record['status']] = by_status.get(record['status'], 0) + 1
+        latencies = sorted(record['fetch_seconds'] for record in pages)
+        dropped = {}
+        for record in steps:
+            dropped[record['step']] = dropped.get(record['step'], 0) + record['rows_dropped']
+
+        return {
+            'run_id': self.run_id,
+            'started_at': datetime.fromtimestamp(self.started_at).isoformat(),
+            'stages': stages,
+            'extract': {
+                'pages': len(pages),
+                'pages_by_status': by_status,
+                'bytes': sum(record['bytes'] for record in pages),
+                'cards': sum(record['cards'] for record in pages),
+                'fetch_seconds_total': sum(latencies),
+                'fetch_seconds_p50': _percentile(latencies, 0.50),
+                'fetch_seconds_p95': _percentile(latencies, 0.95),
+                'fetch_seconds_max': latencies[-1] if latencies else 0.0,
+                'parse_seconds_total': sum(record['parse_seconds'] for record in pages),
+            },
+            'transform': {'rows_dropped': dropped},
+            'load': sinks,
+        }
+
+    def write_json(self, path: str) -> None:
+        """Menulis laporan run (ringkasan + detail per halaman) sebagai JSON."""
+        report = self.summary()
+        with self._lock:
+            report['pages'] = sorted(self.pages, key=lambda record: record['page'])
+        _atomic_write(path, json.dumps(report, indent=2))
+        logging.info(f"Laporan metrik JSON ditulis ke {path}")
+
+    def to_prometheus(self) -> str:
+        """Merender ringkasan metrik dalam format textfile Prometheus."""
+        summary = self.summary()
+        extract = summary['extract']
+        lines = []
+
+        def metric(name, help_text, metric_type, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        metric('etl_run_start_timestamp_seconds', 'Waktu mulai run ETL.', 'gauge', [({}, self.started_at)])
+        metric('etl_stage_duration_seconds', 'Durasi setiap tahap ETL.', 'gauge',
+               [({'stage': name}, seconds) for name, seconds in summary['stages'].items()])
+        metric('etl_extract_pages', 'Jumlah halaman per status.', 'gauge',
+               [({'status': status}, count) for status, count in extract['pages_by_status'].items()])
+        metric('etl_extract_bytes', 'Total byte yang diterima.', 'gauge', [({}, extract['bytes'])])
+        metric('etl_extract_cards', 'Total kartu produk yang di-parse.', 'gauge', [({}, extract['cards'])])
+        metric('etl_extract_fetch_seconds', 'Latensi fetch per halaman.', 'gauge', [
+            ({'quantile': '0.5'}, extract['fetch_seconds_p50']),
+            ({'quantile': '0.95'}, extract['fetch_seconds_p95']),
+            ({'quantile': '1'}, extract['fetch_seconds_max']),
+        ])
+        metric('etl_extract_parse_seconds_total', 'Total waktu parsing HTML.', 'gauge',
+               [({}, extract['parse_seconds_total'])])
+        metric('etl_transform_rows_dropped', 'Baris yang dibuang per langkah transform.', 'gauge',
+               [({'step': step}, count) for step, count in summary['transform']['rows_dropped'].items()])
+        metric('etl_load_duration_seconds', 'Durasi tulis per sink.', 'gauge',
+               [({'sink': name}, sink['seconds']) for name, sink in summary['load'].items()])
+        metric('etl_load_rows', 'Jumlah baris yang dikirim per sink.', 'gauge',
+               [({'sink': name}, sink['rows']) for name, sink in summary['load'].items()])
+        metric('etl_load_success', 'Status sink (1 = sukses).', 'gauge',
+               [({'sink': name}, int(sink['status'] == 'ok')) for name, sink in summary['load'].items()])
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> None:
+        """Menulis metrik ke file textfile Prometheus (node_exporter textfile collector)."""
+        _atomic_write(path, self.to_prometheus())
+        logging.info(f"Metrik Prometheus ditulis ke {path}")
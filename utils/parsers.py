@@ -0,0 +1,164 @@
+import re
+from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+PRODUCT_FIELDS = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']
+
+_LXML_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+
+_PAGE_OF_PATTERN = re.compile(r'Page\s+\d+\s+of\s+(\d+)', re.IGNORECASE)
+
+_CARD_XPATH = etree.XPath(
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' collection-card ')]"
+)
+
+def _classify_detail(text: str, fields: dict) -> None:
+    """Memasukkan teks <p> dari 'product-details' ke field yang sesuai."""
+    if text.startswith('Rating:'):
+        fields['Rating'] = text
+    elif 'Colors' in text and text.endswith('Colors'):
+        fields['Colors'] = text
+    elif text.startswith('Size:'):
+        fields['Size'] = text
+    elif text.startswith('Gender:'):
+        fields['Gender'] = text
+
+def _empty_product() -> dict:
+    """Nilai default jika elemen tidak ditemukan di kartu produk."""
+    return {
+        'Title': 'Unknown Product',
+        'Price': 'Price Unavailable',
+        'Rating': 'Invalid Rating',
+        'Colors': 'N/A',
+        'Size': 'N/A',
+        'Gender': 'N/A',
+    }
+
+def parse_products_bs4(html: str) -> list:
+    """
+    Parser referensi berbasis BeautifulSoup ('html.parser').
+
+    Returns:
+        list: Satu dict per 'div.collection-card' dengan kunci PRODUCT_FIELDS.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    products = []
+
+    for card in soup.select('div.collection-card'):
+        product = _empty_product()
+
+        title_tag = card.find('h3', class_='product-title')
+        if title_tag:
+            product['Title'] = title_tag.get_text(strip=True)
+
+        price_tag = card.find(class_='price-container')
+        if price_tag:
+            product['Price'] = price_tag.get_text(strip=True)
+
+        details_div = card.find('div', class_='product-details')
+        if details_div:
+            for p in details_div.find_all('p'):
+                _classify_detail(p.get_text(strip=True), product)
+
+        products.append(product)
+
+    return products
+
+def _lxml_text(element) -> str:
+    """Setara dengan get_text(strip=True) milik BeautifulSoup."""
+    return ''.join(part.strip() for part in element.itertext())
+
+def parse_products_lxml(html) -> list:
+    """
+    Parser cepat berbasis lxml: kartu dicari dengan XPath terkompilasi, lalu
+    setiap kartu ditelusuri satu kali untuk mengambil semua field.
+
+    Hasilnya identik dengan parse_products_bs4.
+    """
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    if not html.strip():
+        return []
+
+    root = lxml.html.fromstring(html, parser=_LXML_PARSER)
+    products = []
+
+    for card in _CARD_XPATH(root):
+        product = _empty_product()
+        title_found = price_found = details_found = False
+
+        for element in card.iterdescendants():
+            if not isinstance(element.tag, str):
+                continue
+            classes = (element.get('class') or '').split()
+            if not classes:
+                continue
+
+            if not title_found and element.tag == 'h3' and 'product-title' in classes:
+                product['Title'] = _lxml_text(element)
+                title_found = True
+            elif not price_found and 'price-container' in classes:
+                product['Price'] = _lxml_text(element)
+                price_found = True
+            elif not details_found and element.tag == 'div' and 'product-details' in classes:
+                for p in element.iter('p'):
+                    _classify_detail(_lxml_text(p), product)
+                details_found = True
+
+        products.append(product)
+
+    return products
+
+PARSER_BACKENDS = {
+    'bs4': parse_products_bs4,
+    'lxml': parse_products_lxml,
+}
+
+def get_parser(name: str):
+    """
+    Mengambil fungsi parser berdasarkan nama backend.
+
+    Args:
+        name (str): 'bs4' atau 'lxml'.
+    """
+    try:
+        return PARSER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Parser backend tidak dikenal: {name}. Pilihan: {sorted(PARSER_BACKENDS)}")
+
+def parse_rows(name: str, body: bytes, encoding: str = None) -> list:
+    """
+    Mem-parsing body halaman mentah menjadi baris ringkas untuk process pool.
+
+    Input berupa bytes apa adanya dari response dan output berupa list tuple
+    (urutan PRODUCT_FIELDS), sehingga yang berpindah antar proses hanya data
+    kecil yang murah di-pickle, bukan objek soup/elemen.
+
+    Args:
+        name (str): Nama backend parser.
+        body (bytes): Body halaman.
+        encoding (str): Encoding response; None dianggap UTF-8.
+    """
+    parse_products = get_parser(name)
+    if name != 'lxml' or (encoding or 'utf-8').lower().replace('_', '-') not in ('utf-8', 'utf8'):
+        body = body.decode(encoding or 'utf-8', errors='replace')
+    return [tuple(product[field] for field in PRODUCT_FIELDS) for product in parse_products(body)]
+
+def rows_to_products(rows: list) -> list:
+    """Mengubah baris ringkas dari parse_rows kembali menjadi dict produk."""
+    return [dict(zip(PRODUCT_FIELDS, row)) for row in rows]
+
+def parse_page_count(html: str):
+    """
+    Membaca jumlah halaman katalog dari kontrol pagination.
+
+    Hanya teks "Page X of N" yang dipakai. Tautan '/pageN' tidak menunjukkan
+    halaman terakhir (misalnya pager yang hanya berisi "Next" ke /page2), jadi
+    tanpa teks tersebut hasilnya None dan crawl berjalan sampai 404 atau halaman kosong.
+
+    Returns:
+        int atau None: Jumlah halaman, atau None jika pagination tidak ditemukan.
+    """
+    match = _PAGE_OF_PATTERN.search(html)
+    return int(match.group(1)) if match else None
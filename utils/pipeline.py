@@ -0,0 +1,103 @@
+import logging
+import queue
+import threading
+import time
+from utils.transform import transform_data
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+_END_OF_STREAM = object()
+
+def _sink_name(sink) -> str:
+    """Nama sink untuk log dan metrik (mendukung functools.partial dan sink yang dibungkus functools.wraps)."""
+    sink = getattr(sink, '__wrapped__', sink)
+    func = getattr(sink, 'func', sink)
+    return getattr(func, '__name__', repr(func))
+
+def run_streaming_pipeline(batches, sinks: list, exchange_rate: int = 16000, queue_size: int = 4,
+                           metrics=None) -> dict:
+    """
+    Menjalankan pipeline ETL secara streaming: setiap batch mentah langsung
+    ditransformasi lalu dikirim ke antrian terbatas yang dikonsumsi thread load,
+    sehingga proses load berjalan bersamaan dengan scraping.
+
+    Args:
+        batches: Iterable DataFrame mentah, misalnya dari iter_extract_batches.
+        sinks (list): Callable `sink(df, append=...)`, misalnya
+            functools.partial(load_to_csv, file_path='products.csv').
+            Sink yang mengembalikan False dianggap gagal, seperti pada dispatch_loads.
+            Batch pertama dikirim dengan append=False, sisanya append=True.
+            Sink yang gagal pada batch pertama tidak menerima batch berikutnya,
+            agar batch tersebut tidak ditambahkan ke tabel/file lama.
+        exchange_rate (int): Kurs USD ke IDR untuk transform_data.
+        queue_size (int): Jumlah batch bersih maksimum yang menunggu di antrian.
+            Jika penuh, ekstraksi menunggu sink sehingga memori tetap datar.
+        metrics (RunMetrics): Jika diberikan, baris yang dibuang transform dan durasi
+            setiap sink (dijumlahkan lintas batch) ikut dicatat.
+
+    Returns:
+        dict: Ringkasan {'batches', 'raw_rows', 'clean_rows', 'failed_sinks'}, dengan
+        'failed_sinks' berisi nama sink yang gagal pada minimal satu batch.
+    """
+    if queue_size < 1:
+        raise ValueError("queue_size minimal 1.")
+
+    batch_queue = queue.Queue(maxsize=queue_size)
+    seen_hashes = set()
+    summary = {'batches': 0, 'raw_rows': 0, 'clean_rows': 0}
+    failed = set()
+
+    def consume():
+        first = True
+        disabled = set()
+        while True:
+            batch = batch_queue.get()
+            if batch is _END_OF_STREAM:
+                return
+            for index, sink in enumerate(sinks):
+                if index in disabled:
+                    continue
+                name = _sink_name(sink)
+                start = time.perf_counter()
+                status = 'ok'
+                try:
+                    if sink(batch, append=not first) is False:
+                        status = 'error'
+                        logging.error(f"Sink {name} melaporkan kegagalan.")
+                except Exception as e:
+                    status = 'error'
+                    logging.error(f"Error tidak terduga pada sink {name}: {e}")
+                if metrics is not None:
+                    metrics.record_sink(name, time.perf_counter() - start, len(batch), status)
+                if status != 'ok':
+                    failed.add(name)
+                if first and status != 'ok':
+                    disabled.add(index)
+                    logging.error(f"Sink {name} gagal pada batch pertama; batch berikutnya tidak dikirim ke sink ini.")
+            first = False
+
+    consumer = threading.Thread(target=consume, name='load-consumer', daemon=True)
+    consumer.start()
+
+    try:
+        for raw_batch in batches:
+            summary['batches'] += 1
+            summary['raw_rows'] += len(raw_batch)
+            if raw_batch.empty:
+                continue
+
+            cleaned_batch = transform_data(raw_batch, exchange_rate=exchange_rate, seen_hashes=seen_hashes,
+                                           metrics=metrics)
+            if cleaned_batch.empty:
+                continue
+
+            summary['clean_rows'] += len(cleaned_batch)
+            batch_queue.put(cleaned_batch)
+    finally:
+        batch_queue.put(_END_OF_STREAM)
+        consumer.join()
+    summary['failed_sinks'] = sorted(failed)
+
+    logging.info(f"Pipeline streaming selesai. {summary['batches']} batch, "
+                 f"{summary['raw_rows']} data mentah, {summary['clean_rows']} data bersih.")
+    return summary
@@ -0,0 +1,326 @@
+import argparse
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT_FILE = 'profile.json'
+
+def _site(filename: str, lineno: int) -> str:
+    """Lokasi 'file:baris' relatif terhadap root proyek jika berada di dalamnya."""
+    if filename.startswith(PROJECT_ROOT + os.sep):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    return f"{filename}:{lineno}"
+
+def _project_frame(traceback):
+    """Frame terdalam yang berada di kode proyek (bukan library maupun profiler ini), atau None."""
+    for frame in reversed(traceback):
+        if (frame.filename.startswith(PROJECT_ROOT + os.sep) and os.sep + 'site-packages' + os.sep not in frame.filename
+                and frame.filename != __file__):
+            return frame
+    return None
+
+def _cpu_top(stats: pstats.Stats, top: int) -> list:
+    """Fungsi dengan waktu kumulatif terbesar dari hasil cProfile."""
+    rows = []
+    for (filename, lineno, function), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({'function': f"{_site(filename, lineno)}({function})", 'ncalls': ncalls,
+                     'tottime': tottime, 'cumtime': cumtime})
+    rows.sort(key=lambda row: row['cumtime'], reverse=True)
+    return rows[:top]
+
+def _allocation_top(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top: int) -> tuple:
+    """
+    Selisih alokasi antara dua snapshot tracemalloc.
+
+    Returns:
+        tuple: (situs alokasi teratas menurut baris terdalam, situs teratas yang
+        dikelompokkan ke baris kode proyek yang memicunya).
+    """
+    diffs = after.compare_to(before, 'traceback')
+    by_line, by_project_line = {}, {}
+    for diff in diffs:
+        if diff.size_diff <= 0:
+            continue
+        deepest = diff.traceback[-1]
+        key = _site(deepest.filename, deepest.lineno)
+        by_line[key] = by_line.get(key, 0) + diff.size_diff
+        frame = _project_frame(diff.traceback)
+        if frame is not None:
+            key = _site(frame.filename, frame.lineno)
+            by_project_line[key] = by_project_line.get(key, 0) + diff.size_diff
+
+    def ranked(sizes: dict) -> list:
+        return [{'site': site, 'size_bytes': size}
+                for site, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:top]]
+    return ranked(by_line), ranked(by_project_line)
+
+class _PeakSampler(threading.Thread):
+    """
+    Thread yang memantau memori selama satu tahap dan meringkas situs alokasi
+    setiap kali memori naik ke puncak baru, sehingga alokasi sementara (yang
+    sudah dibebaskan di akhir tahap) tetap terlihat.
+
+    Snapshot tracemalloc sendiri memakan memori; setelah setiap ringkasan,
+    puncak di-reset dan puncak sebelumnya disimpan di `self.peak`.
+    """
+
+    def __init__(self, before: tracemalloc.Snapshot, baseline: int, interval: float, top: int):
+        super().__init__(daemon=True, name='profiling-sampler')
+        self.before = before
+        self.interval = interval
+        self.top = top
+        self.peak = baseline
+        self.sampled_size = baseline
+        self.sites = None
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.wait(self.interval):
+            current, peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, peak)
+            if current > self.sampled_size * 1.1:
+                snapshot = tracemalloc.take_snapshot()
+                self.sites = _allocation_top(self.before, snapshot, self.top)
+                self.sampled_size = current
+                del snapshot
+                tracemalloc.reset_peak()
+
+class StageProfiler:
+    """
+    Profiler CPU (cProfile) dan memori (tracemalloc) per tahap pipeline.
+
+    Setiap tahap menghasilkan file .prof (bisa dibuka dengan pstats/snakeviz)
+    serta ringkasan di profile.json: fungsi terberat, puncak memori selama
+    tahap, memori yang masih dipegang di akhir tahap, dan situs alokasi
+    teratas, baik per baris terdalam (biasanya di pandas/numpy) maupun per
+    baris kode proyek yang memicunya (misalnya baris di transform_data).
+
+    Situs alokasi diambil saat memori mendekati puncak tahap (lihat _PeakSampler),
+    atau di akhir tahap jika memori tidak pernah naik berarti, sehingga salinan
+    sementara seperti df.copy() atau tolist() di dalam sink tetap terlihat.
+
+    Tahap dengan nama yang sama boleh dijalankan berkali-kali (misalnya sink
+    yang dipanggil per batch pada mode streaming): waktu, statistik cProfile,
+    dan memori bersih dijumlahkan, sedangkan puncak memori dan situs alokasinya
+    diambil dari pemanggilan dengan puncak tertinggi.
+
+    cProfile hanya merekam thread yang menjalankan tahap dan hanya satu yang
+    boleh aktif sekaligus (Python 3.12+); tracemalloc merekam semua thread.
+    Jalankan tahap satu per satu agar angka memorinya tidak tercampur.
+    """
+
+    def __init__(self, output_dir: str, top: int = 25, frames: int = 25, sample_interval: float = 0.05):
+        """
+        Args:
+            output_dir (str): Folder artefak profil run ini.
+            top (int): Jumlah fungsi/situs alokasi teratas yang diringkas.
+            frames (int): Kedalaman traceback tracemalloc; perlu cukup dalam agar
+                alokasi di pandas bisa ditelusuri ke baris kode proyek.
+            sample_interval (float): Jeda (detik) pemantauan puncak memori.
+        """
+        self.output_dir = output_dir
+        self.top = top
+        self.frames = frames
+        self.sample_interval = sample_interval
+        self.stages = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name: str, cpu: bool = True):
+        """
+        Context manager yang memprofil satu tahap dan menyimpan artefaknya.
+
+        Args:
+            name (str): Nama tahap.
+            cpu (bool): Jika False, hanya waktu dan memori yang dicatat (tanpa cProfile).
+                Dipakai untuk tahap yang membungkus thread lain yang diprofil sendiri,
+                karena sejak Python 3.12 hanya satu cProfile yang boleh aktif.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracemalloc = True
+        before = tracemalloc.take_snapshot()
+        current_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        sampler = _PeakSampler(before, current_before, self.sample_interval, self.top)
+        profile = None
+        start = time.perf_counter()
+        try:
+            sampler.start()
+            if cpu:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                except ValueError as e:
+                    logging.warning(f"cProfile tidak bisa diaktifkan untuk tahap {name} ({e}); "
+                                    f"hanya waktu dan memori yang dicatat.")
+                    profile = None
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            seconds = time.perf_counter() - start
+            sampler.stop.set()
+            if sampler.is_alive():
+                sampler.join()
+            current_after, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, sampler.peak)
+            if sampler.sites is not None and sampler.sampled_size > current_after:
+                top_lines, top_project_lines = sampler.sites
+            else:
+                top_lines, top_project_lines = _allocation_top(before, tracemalloc.take_snapshot(), self.top)
+
+            memory = {
+                'peak_bytes': peak - current_before,
+                'net_bytes': current_after - current_before,
+                'top_allocations': top_lines,
+                'top_project_allocations': top_project_lines,
+            }
+            os.makedirs(self.output_dir, exist_ok=True)
+            with self._lock:
+                previous = self.stages.get(name)
+                stats = self._stats.get(name)
+                if profile is not None:
+                    if stats is None:
+                        stats = self._stats[name] = pstats.Stats(profile)
+                    else:
+                        stats.add(profile)
+                    stats.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+                if previous is None:
+                    calls = 1
+                else:
+                    seconds += previous['seconds']
+                    calls = previous['calls'] + 1
+                    net_bytes = previous['memory']['net_bytes'] + memory['net_bytes']
+                    if previous['memory']['peak_bytes'] >= memory['peak_bytes']:
+                        memory = dict(previous['memory'])
+                    memory['net_bytes'] = net_bytes
+                self.stages[name] = {
+                    'seconds': seconds,
+                    'calls': calls,
+                    'cpu_top': _cpu_top(stats, self.top) if stats is not None else [],
+                    'memory': memory,
+                }
+            logging.info(f"Profil tahap {name}: {seconds:.2f} detik, puncak memori "
+                         f"{memory['peak_bytes'] / 1e6:.1f} MB.")
+
+    def wrap(self, name: str, func):
+        """Membungkus callable (misalnya sink) agar setiap pemanggilannya diprofil sebagai tahap `name`."""
+        @functools.wraps(func)
+        def profiled(*args, **kwargs):
+            with self.stage(name):
+                return func(*args, **kwargs)
+        return profiled
+
+    def write(self) -> str:
+        """Menulis profile.json ke folder artefak lalu menghentikan tracemalloc jika dimulai di sini."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, REPORT_FILE)
+        with self._lock:
+            report = {'stages': self.stages}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        logging.info(f"Artefak profil ditulis ke {self.output_dir}")
+        return path
+
+def _load_report(path: str) -> dict:
+    """Membaca profile.json dari file atau folder artefak."""
+    if os.path.isdir(path):
+        path = os.path.join(path, REPORT_FILE)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def diff_profiles(base_path: str, new_path: str, top: int = 10) -> dict:
+    """
+    Membandingkan profil dua run per tahap.
+
+    Returns:
+        dict: Nama tahap -> {'seconds', 'peak_bytes', 'net_bytes' (masing-masing
+        {'base', 'new', 'delta'}), 'functions' (selisih cumtime terbesar) dan
+        'allocations' (selisih ukuran situs alokasi proyek terbesar)}.
+    """
+    base, new = _load_report(base_path)['stages'], _load_report(new_path)['stages']
+    result = {}
+    for name in sorted(set(base) | set(new)):
+        old_stage, new_stage = base.get(name, {}), new.get(name, {})
+
+        def compare(value_of):
+            old_value, new_value = value_of(old_stage), value_of(new_stage)
+            delta = None if old_value is None or new_value is None else new_value - old_value
+            return {'base': old_value, 'new': new_value, 'delta': delta}
+
+        def entry_deltas(list_of, key, value):
+            old_entries = {row[key]: row[value] for row in list_of(old_stage)}
+            new_entries = {row[key]: row[value] for row in list_of(new_stage)}
+            deltas = [{key: item, 'base': old_entries.get(item, 0), 'new': new_entries.get(item, 0),
+                       'delta': new_entries.get(item, 0) - old_entries.get(item, 0)}
+                      for item in set(old_entries) | set(new_entries)]
+            deltas.sort(key=lambda row: abs(row['delta']), reverse=True)
+            return deltas[:top]
+
+        memory = lambda stage: stage.get('memory', {})
+        result[name] = {
+            'seconds': compare(lambda stage: stage.get('seconds')),
+            'peak_bytes': compare(lambda stage: memory(stage).get('peak_bytes')),
+            'net_bytes': compare(lambda stage: memory(stage).get('net_bytes')),
+            'functions': entry_deltas(lambda stage: stage.get('cpu_top', []), 'function', 'cumtime'),
+            'allocations': entry_deltas(lambda stage: memory(stage).get('top_project_allocations', []),
+                                        'site', 'size_bytes'),
+        }
+    return result
+
+def format_diff(diff: dict) -> str:
+    """Merender hasil diff_profiles sebagai teks."""
+    def number(value, scale: float = 1.0, signed: bool = False) -> str:
+        if value is None:
+            return '-'
+        return f"{value / scale:+.3f}" if signed else f"{value / scale:.3f}"
+
+    out = io.StringIO()
+    out.write(f"{'stage':<20} {'base s':>9} {'new s':>9} {'delta s':>9} {'base peak MB':>13} {'new peak MB':>12}\n")
+    for name, stage in diff.items():
+        seconds, peak = stage['seconds'], stage['peak_bytes']
+        out.write(f"{name:<20} {number(seconds['base']):>9} {number(seconds['new']):>9} "
+                  f"{number(seconds['delta'], signed=True):>9} {number(peak['base'], 1e6):>13} "
+                  f"{number(peak['new'], 1e6):>12}\n")
+    for name, stage in diff.items():
+        if stage['functions']:
+            out.write(f"\n[{name}] selisih cumtime terbesar:\n")
+            for row in stage['functions']:
+                out.write(f"  {row['delta']:+9.3f} s  {row['function']}\n")
+        if stage['allocations']:
+            out.write(f"[{name}] selisih alokasi (kode proyek) terbesar:\n")
+            for row in stage['allocations']:
+                out.write(f"  {row['delta'] / 1e6:+9.2f} MB  {row['site']}\n")
+    return out.getvalue()
+
+def main(argv=None) -> dict:
+    """CLI: `python -m utils.profiling RUN_A RUN_B` membandingkan dua folder artefak profil."""
+    parser = argparse.ArgumentParser(description="Membandingkan profil dua run pipeline.")
+    parser.add_argument('base', help='Folder artefak (atau profile.json) run pembanding.')
+    parser.add_argument('new', help='Folder artefak (atau profile.json) run baru.')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    diff = diff_profiles(args.base, args.new, top=args.top)
+    print(format_diff(diff), end='')
+    return diff
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,409 @@
+import argparse
+import json
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+import pandas as pd
+from utils.transform import FINAL_COLUMNS
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CATEGORY_COLUMNS = ('gender', 'size')
+RANGE_COLUMNS = ('Price', 'Rating')
+SORT_COLUMNS = ('Price', 'Rating', 'colors')
+DEFAULT_HTTP_LIMIT = 100
+_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.int64)
+
+def _bitmaps(values: pd.Series) -> dict:
+    """Bitmap terkompresi (np.packbits) per nilai kategori: bit ke-i menyala jika baris i bernilai tsb."""
+    codes, uniques = pd.factorize(values, sort=True)
+    return {str(value): np.packbits(codes == code) for code, value in enumerate(uniques)}
+
+def _test_bits(bitmap: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Nilai bit `bitmap` pada posisi baris `positions` (tanpa membongkar seluruh bitmap)."""
+    return ((bitmap[positions >> 3] >> (7 - (positions & 7))) & 1).astype(bool)
+
+def _popcount(bitmap: np.ndarray) -> int:
+    """Jumlah bit yang menyala pada bitmap."""
+    return int(_POPCOUNT[bitmap].sum())
+
+def _iso_strings(timestamps: pd.Series) -> list:
+    """Timestamp sebagai string ISO; setiap nilai unik (biasanya satu per snapshot) diformat sekali."""
+    codes, uniques = pd.factorize(timestamps)
+    return np.array([ts.isoformat() for ts in uniques], dtype=object)[codes].tolist()
+
+def _as_list(value) -> list:
+    """Satu nilai atau daftar nilai filter kategori menjadi daftar."""
+    return [value] if isinstance(value, str) else list(value)
+
+class ProductSnapshot:
+    """
+    Snapshot data bersih yang siap di-query, beserta indeksnya.
+
+    Indeks dibangun sekali saat snapshot dibuat: bitmap per nilai 'gender' dan
+    'size' (filter kategori = AND/OR bitmap) serta urutan baris terurut per
+    'Price' dan 'Rating', naik dan turun (filter rentang = dua binary search,
+    top-k = membaca urutan tersebut dari depan). Snapshot tidak
+    pernah diubah setelah dibuat, sehingga aman dibaca banyak thread tanpa lock.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: int = 0):
+        """
+        Args:
+            df (pd.DataFrame): DataFrame bersih hasil transform_data.
+            version (int): Nomor versi snapshot (naik setiap kali snapshot diganti).
+        """
+        df = df.reset_index(drop=True)
+        self.version = version
+        self.rows = len(df)
+        self.loaded_at = time.time()
+        timestamps = pd.to_datetime(df['timestamp'])
+        self.extracted_at = timestamps.max().isoformat() if self.rows else None
+
+        self._numbers = {column: df[column].to_numpy(dtype='float64') for column in RANGE_COLUMNS}
+        self._numbers['colors'] = df['colors'].to_numpy(dtype='int64')
+        self._bitmaps = {column: _bitmaps(df[column].astype(str)) for column in CATEGORY_COLUMNS}
+        # Urutan stabil: baris dengan nilai sama tetap dalam urutan snapshot, baik naik maupun turun.
+        self._order = {(column, descending): np.argsort(-self._numbers[column] if descending else self._numbers[column],
+                                                         kind='stable')
+                       for column in RANGE_COLUMNS for descending in (False, True)}
+        self._sorted = {column: self._numbers[column][self._order[column, False]] for column in RANGE_COLUMNS}
+        # Kolom keluaran sebagai list Python agar membentuk hasil top-k tidak perlu konversi per query.
+        self._output = {
+            'title': df['title'].astype(str).tolist(),
+            'Price': self._numbers['Price'].tolist(),
+            'Rating': self._numbers['Rating'].tolist(),
+            'colors': self._numbers['colors'].tolist(),
+            'size': df['size'].astype(str).tolist(),
+            'gender': df['gender'].astype(str).tolist(),
+            'timestamp': _iso_strings(timestamps),
+        }
+
+    def values(self, column: str) -> list:
+        """Nilai unik kolom kategori yang ada di snapshot."""
+        return sorted(self._bitmaps[column])
+
+    def _category_bitmap(self, column: str, wanted):
+        """Bitmap gabungan (OR) untuk nilai-nilai yang diminta pada satu kolom kategori."""
+        bitmap = np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+        for value in _as_list(wanted):
+            if value in self._bitmaps[column]:
+                bitmap |= self._bitmaps[column][value]
+        return bitmap
+
+    def select(self, gender=None, size=None, min_price: float = None, max_price: float = None,
+               min_rating: float = None, max_rating: float = None, sort: str = None, limit: int = None) -> tuple:
+        """
+        Mencari posisi baris yang memenuhi semua filter.
+
+        Args:
+            gender, size: Satu nilai atau daftar nilai (cocok jika salah satunya sama).
+            min_price, max_price, min_rating, max_rating: Batas rentang inklusif.
+            sort (str): Kolom urutan ('Price', 'Rating', 'colors'); awalan '-' untuk menurun.
+                None = urutan baris snapshot.
+            limit (int): Jumlah hasil maksimum (top-k).
+
+        Returns:
+            tuple: (posisi baris hasil sebagai np.ndarray, jumlah total baris yang cocok).
+
+        Raises:
+            ValueError: Jika kolom urutan atau limit tidak valid.
+        """
+        descending = sort is not None and sort.startswith('-')
+        sort_column = sort.lstrip('-') if sort is not None else None
+        if sort_column is not None and sort_column not in SORT_COLUMNS:
+            raise ValueError(f"Kolom urutan tidak dikenal: {sort_column} (pilihan: {', '.join(SORT_COLUMNS)}).")
+        if limit is not None and limit < 0:
+            raise ValueError("limit tidak boleh negatif.")
+
+        bitmap = None
+        for column, wanted in (('gender', gender), ('size', size)):
+            if wanted is not None:
+                column_bitmap = self._category_bitmap(column, wanted)
+                bitmap = column_bitmap if bitmap is None else bitmap & column_bitmap
+
+        # Rentang tersempit dipakai sebagai titik awal; posisinya sudah terurut menurut kolom tsb.
+        bounds = {'Price': (min_price, max_price), 'Rating': (min_rating, max_rating)}
+        driver, driver_range, positions = None, None, None
+        for column, (low, high) in bounds.items():
+            if low is None and high is None:
+                continue
+            sorted_values = self._sorted[column]
+            start = np.searchsorted(sorted_values, low, side='left') if low is not None else 0
+            stop = max(start, np.searchsorted(sorted_values, high, side='right') if high is not None else self.rows)
+            if driver is None or stop - start < driver_range[1] - driver_range[0]:
+                driver, driver_range = column, (start, stop)
+        if driver is not None:
+            start, stop = driver_range
+            if driver == sort_column and descending:
+                positions = self._order[driver, True][self.rows - stop:self.rows - start]
+            else:
+                positions = self._order[driver, False][start:stop]
+
+        if positions is None and sort_column in RANGE_COLUMNS and limit is not None:
+            return self._top_k(self._order[sort_column, descending], bitmap, limit)
+        if positions is None:
+            positions = np.arange(self.rows) if bitmap is None else np.flatnonzero(
+                np.unpackbits(bitmap, count=self.rows))
+        else:
+            if bitmap is not None:
+                positions = positions[_test_bits(bitmap, positions)]
+            for column, (low, high) in bounds.items():
+                if column == driver or (low is None and high is None):
+                    continue
+                values = self._numbers[column][positions]
+                keep = np.ones(len(positions), dtype=bool)
+                if low is not None:
+                    keep &= values >= low
+                if high is not None:
+                    keep &= values <= high
+                positions = positions[keep]
+        total = len(positions)
+
+        if sort_column is None:
+            if driver is not None:
+                positions = np.sort(positions)
+        elif sort_column != driver:
+            keys = self._numbers[sort_column][positions]
+            keys = -keys if descending else keys
+            if limit is not None and 0 < limit < total:
+                # Semua kandidat sampai nilai ke-k dipertahankan agar baris bernilai sama tetap berurutan.
+                candidates = keys <= np.partition(keys, limit - 1)[limit - 1]
+                positions, keys = positions[candidates], keys[candidates]
+            positions = positions[np.lexsort((positions, keys))]
+        if limit is not None:
+            positions = positions[:limit]
+        return positions, total
+
+    def _top_k(self, order: np.ndarray, bitmap, limit: int) -> tuple:
+        """k baris pertama menurut `order` yang lolos bitmap, dibaca per potongan dari depan."""
+        if bitmap is None:
+            return order[:limit], self.rows
+        total = _popcount(bitmap)
+        found, start, chunk = [], 0, max(64, limit * 4)
+        remaining = min(limit, total)
+        while remaining > 0 and start < self.rows:
+            positions = order[start:start + chunk]
+            positions = positions[_test_bits(bitmap, positions)][:remaining]
+            found.append(positions)
+            remaining -= len(positions)
+            start += chunk
+            chunk *= 2
+        return (np.concatenate(found) if found else np.empty(0, dtype=np.intp)), total
+
+    def records(self, positions: np.ndarray) -> list:
+        """Baris pada `positions` sebagai list dict (kolom seperti DataFrame bersih)."""
+        output = self._output
+        return [{column: output[column][i] for column in FINAL_COLUMNS} for i in positions.tolist()]
+
+    def info(self) -> dict:
+        """Ringkasan snapshot: versi, jumlah baris, waktu ekstraksi dan waktu dimuat."""
+        return {'version': self.version, 'rows': self.rows, 'extracted_at': self.extracted_at,
+                'loaded_at': self.loaded_at}
+
+class QueryService:
+    """
+    Layanan query read-only atas snapshot bersih terbaru.
+
+    Snapshot baru dibangun lengkap (termasuk indeksnya) sebelum menggantikan
+    snapshot lama dalam satu assignment referensi, sehingga query yang sedang
+    berjalan tetap memakai snapshot lama secara utuh dan query berikutnya
+    langsung memakai yang baru.
+
+    Contoh:
+        service = QueryService()
+        service.publish(cleaned_df)
+        service.query(gender='Women', size='M', max_price=500000, min_rating=4.5, sort='-Rating', limit=10)
+    """
+
+    def __init__(self, df: pd.DataFrame = None):
+        """
+        Args:
+            df (pd.DataFrame): Snapshot awal; None = snapshot kosong.
+        """
+        self._lock = threading.Lock()
+        self._snapshot = ProductSnapshot(df if df is not None else pd.DataFrame(columns=FINAL_COLUMNS))
+        self._source_state = None
+        self._watcher = None
+        self._stop = threading.Event()
+
+    @property
+    def snapshot(self) -> ProductSnapshot:
+        """Snapshot yang sedang aktif."""
+        return self._snapshot
+
+    def publish(self, df: pd.DataFrame) -> ProductSnapshot:
+        """Membangun snapshot baru dari DataFrame bersih lalu menggantikan snapshot aktif secara atomik."""
+        snapshot = ProductSnapshot(df)
+        with self._lock:
+            snapshot.version = self._snapshot.version + 1
+            self._snapshot = snapshot
+        logging.info(f"Snapshot query versi {snapshot.version} aktif ({snapshot.rows} produk).")
+        return snapshot
+
+    def query(self, **filters) -> dict:
+        """
+        Menjalankan query atas snapshot aktif (lihat ProductSnapshot.select untuk filternya).
+
+        Returns:
+            dict: {'version', 'total', 'items'}.
+        """
+        snapshot = self._snapshot
+        positions, total = snapshot.select(**filters)
+        return {'version': snapshot.version, 'total': total, 'items': snapshot.records(positions)}
+
+    def reload(self, path: str) -> bool:
+        """
+        Memuat ulang snapshot dari file Parquet (ditulis sink 'query') jika file berubah.
+
+        Returns:
+            bool: True jika snapshot diganti.
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return False
+        state = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if state == self._source_state:
+            return False
+        self.publish(pd.read_parquet(path))
+        self._source_state = state
+        return True
+
+    def watch(self, path: str, interval: float = 2.0) -> None:
+        """Memantau file snapshot di thread latar dan menggantinya setiap kali ETL menulis snapshot baru."""
+        def loop():
+            while True:
+                try:
+                    self.reload(path)
+                except Exception as e:
+                    logging.error(f"Gagal memuat snapshot query {path}: {e}")
+                if self._stop.wait(interval):
+                    return
+
+        self._stop.clear()
+        self._watcher = threading.Thread(target=loop, name='query-watcher', daemon=True)
+        self._watcher.start()
+
+    def close(self) -> None:
+        """Menghentikan pemantauan file snapshot."""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+def _query_params(query_string: str) -> dict:
+    """Parameter URL menjadi argumen ProductSnapshot.select (nilai kategori boleh diulang atau dipisah koma)."""
+    params = parse_qs(query_string)
+    filters = {'limit': DEFAULT_HTTP_LIMIT}
+    for name in CATEGORY_COLUMNS:
+        if name in params:
+            filters[name] = [value for raw in params[name] for value in raw.split(',') if value]
+    for name in ('min_price', 'max_price', 'min_rating', 'max_rating'):
+        if name in params:
+            filters[name] = float(params[name][-1])
+    if 'sort' in params:
+        filters['sort'] = params['sort'][-1]
+    if 'limit' in params:
+        filters['limit'] = int(params['limit'][-1])
+    return filters
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/products':
+            try:
+                status, payload = 200, self.server.service.query(**_query_params(url.query))
+            except ValueError as e:
+                status, payload = 400, {'error': str(e)}
+        elif url.path == '/health':
+            status, payload = 200, self.server.service.snapshot.info()
+        else:
+            status, payload = 404, {'error': f"Path tidak dikenal: {url.path}"}
+
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class QueryServer:
+    """
+    Endpoint HTTP lokal (read-only) untuk QueryService.
+
+    GET /products?gender=Women&size=M&max_price=500000&min_rating=4.5&sort=-Rating&limit=10
+    GET /health
+
+    Args:
+        service (QueryService): Layanan yang dilayani.
+        host (str): Alamat bind.
+        port (int): Port; 0 = port acak.
+    """
+
+    def __init__(self, service: QueryService, host: str = '127.0.0.1', port: int = 0):
+        self._server = ThreadingHTTPServer((host, port), _QueryHandler)
+        self._server.daemon_threads = True
+        self._server.service = service
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='query-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+def main(argv=None):
+    """CLI: `python -m utils.query --snapshot query.parquet --port 8080` menyajikan snapshot terbaru."""
+    parser = argparse.ArgumentParser(description="Layanan query read-only atas snapshot bersih terbaru.")
+    parser.add_argument('--snapshot', default=os.getenv('QUERY_SNAPSHOT_PATH'),
+                        help='File Parquet snapshot yang ditulis sink query (env QUERY_SNAPSHOT_PATH).')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--interval', type=float, default=2.0, help='Jeda (detik) pemeriksaan snapshot baru.')
+    args = parser.parse_args(argv)
+    if not args.snapshot:
+        parser.error('--snapshot (atau QUERY_SNAPSHOT_PATH) wajib diisi.')
+
+    service = QueryService()
+    service.watch(args.snapshot, interval=args.interval)
+    server = QueryServer(service, args.host, args.port)
+    logging.info(f"Layanan query berjalan di {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        service.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import logging
+import threading
+import time
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class AdaptiveRateLimiter:
+    """
+    Pembatas laju request bersama untuk semua worker fetch.
+
+    Awalnya tidak ada jeda. Setiap respons 429 menggandakan jarak minimum antar
+    request (atau memakai Retry-After jika lebih besar), lalu setiap respons
+    sukses menurunkannya sedikit demi sedikit kembali ke `min_interval`.
+    """
+
+    def __init__(self, min_interval: float = 0.0, max_interval: float = 30.0,
+                 backoff_factor: float = 2.0, recovery_factor: float = 0.9):
+        """
+        Args:
+            min_interval (float): Jarak minimum antar request (detik).
+            max_interval (float): Batas atas jarak antar request (detik).
+            backoff_factor (float): Pengali jarak setiap kali menerima 429.
+            recovery_factor (float): Pengali jarak setiap kali request sukses.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.recovery_factor = recovery_factor
+        self.interval = min_interval
+        self.throttled = 0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Menunggu giliran request berikutnya sesuai jarak saat ini."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def on_throttle(self, retry_after: float = None) -> None:
+        """Memperlambat laju setelah respons 429."""
+        with self._lock:
+            self.throttled += 1
+            self.interval = min(self.max_interval, max(self.interval * self.backoff_factor, 0.1))
+            if retry_after:
+                self.interval = min(self.max_interval, max(self.interval, retry_after))
+                self._next_time = max(self._next_time, time.monotonic() + retry_after)
+            interval = self.interval
+        logging.warning(f"Server membalas 429. Jarak antar request dinaikkan ke {interval:.2f} detik.")
+
+    def on_success(self) -> None:
+        """Mempercepat laju kembali secara bertahap setelah request sukses."""
+        with self._lock:
+            if self.interval > self.min_interval:
+                interval = self.interval * self.recovery_factor
+                # Sisa jeda di bawah 10 ms tidak berarti; kembali langsung ke min_interval.
+                self.interval = self.min_interval if interval - self.min_interval < 0.01 else interval
+
+def parse_retry_after(value: str):
+    """Membaca header Retry-After berupa jumlah detik; format tanggal diabaikan."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
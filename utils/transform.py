@@ -4,64 +4,114 @@ import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def transform_data(df: pd.DataFrame, exchange_rate: int = 16000) -> pd.DataFrame:
+def _drop_seen_rows(df: pd.DataFrame, seen_hashes: set) -> pd.DataFrame:
+    """Membuang baris yang hash-nya sudah ada di `seen_hashes`, lalu mencatat hash baru."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    is_new = np.fromiter((h not in seen_hashes for h in row_hashes.tolist()), dtype=bool, count=len(row_hashes))
+    seen_hashes.update(row_hashes[is_new].tolist())
+    return df[is_new]
+
+FINAL_COLUMNS = ['title', 'Price', 'Rating', 'colors', 'size', 'gender', 'timestamp']
+
+def _factorize(series: pd.Series):
+    """Memecah kolom mentah menjadi kode per baris dan nilai unik (NaN mendapat kode -1)."""
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Series(uniques, dtype=object)
+
+def _take(values: np.ndarray, codes: np.ndarray, missing) -> np.ndarray:
+    """Memetakan hasil parsing per nilai unik kembali ke setiap baris."""
+    return np.append(values, missing)[codes]
+
+def _parse_numeric(series: pd.Series, pattern: str = None, remove: str = None) -> np.ndarray:
+    """
+    Mem-parsing kolom angka dalam satu pass: regex hanya dijalankan pada nilai
+    unik, lalu hasilnya disebar ke semua baris lewat kode factorize.
+    """
+    codes, uniques = _factorize(series)
+    text = uniques.str.replace(remove, '', regex=True) if remove else uniques
+    if pattern:
+        text = text.str.extract(pattern, expand=False)
+    values = pd.to_numeric(text, errors='coerce').to_numpy(dtype='float64')
+    return _take(values, codes, np.nan)
+
+def _parse_category(series: pd.Series, prefix: str) -> pd.Categorical:
+    """Mem-parsing kolom berkardinalitas rendah ('Size: M,' -> 'M') menjadi Categorical."""
+    codes, uniques = _factorize(series)
+    labels = uniques.str.replace(prefix, '', regex=False).str.strip(',')
+    labels = labels.mask(labels == 'N/A')
+    label_codes, categories = pd.factorize(labels)
+    return pd.Categorical.from_codes(_take(label_codes, codes, -1),
+                                     categories=pd.Index(categories, dtype='string'))
+
+def transform_data(df: pd.DataFrame, exchange_rate: int = 16000, seen_hashes: set = None,
+                   metrics=None) -> pd.DataFrame:
     """
     Membersihkan dan mentransformasi data mentah.
     REVISI 3: Menyesuaikan (1) Kapitalisasi header, (2) Membiarkan angka di title, (3) Membulatkan Price.
+    REVISI 4: Setiap kolom di-parse dalam satu pass vektor (hanya nilai unik yang di-regex),
+    tanpa salinan DataFrame perantara; 'size' dan 'gender' bertipe category.
+
+    Args:
+        df (pd.DataFrame): Data mentah (atau satu batch data mentah).
+        exchange_rate (int): Kurs USD ke IDR.
+        seen_hashes (set): Hash baris bersih dari batch sebelumnya. Jika diberikan,
+            baris yang sudah pernah muncul dibuang dan hash baris baru ditambahkan,
+            sehingga deduplikasi berlaku lintas batch pada mode streaming.
+        metrics (RunMetrics): Jika diberikan, jumlah baris yang dibuang dicatat per langkah
+            (setiap baris dihitung pada langkah pertama yang menggugurkannya).
     """
     if df.empty:
         logging.warning("DataFrame input kosong, tidak ada transformasi yang dilakukan.")
         return df
         
     logging.info("Memulai proses transformasi data...")
-    df_copy = df.copy()
-    
+
     try:
-        df_copy = df_copy[df_copy['Title'] != 'Unknown Product'].copy()
-
-        df_copy['Price'] = df_copy['Price'].replace('Price Unavailable', np.nan)
-        df_copy['Price'] = df_copy['Price'].str.replace(r'[$,]', '', regex=True).astype(float)
-        df_copy['Price (IDR)'] = df_copy['Price'] * exchange_rate
-        df_copy['Price (IDR)'] = df_copy['Price (IDR)'].round(0)
-
-        df_copy['Rating'] = df_copy['Rating'].str.split(' ').str.get(2) 
-        df_copy['Rating'] = df_copy['Rating'].replace('Invalid', np.nan)
-        df_copy['Rating'] = pd.to_numeric(df_copy['Rating'], errors='coerce')
-        df_copy['Rating'] = df_copy['Rating'].round(1) 
-
-        df_copy['Colors'] = df_copy['Colors'].str.split(' ').str.get(0) 
-        df_copy['Colors'] = df_copy['Colors'].replace('N/A', np.nan)
-        df_copy['Colors'] = pd.to_numeric(df_copy['Colors'], errors='coerce')
-        df_copy['Colors'] = df_copy['Colors'].fillna(1).astype(int)
-
-        df_copy['Size'] = df_copy['Size'].str.replace('Size: ', '', regex=False)
-        df_copy['Size'] = df_copy['Size'].str.strip(',') 
-        df_copy['Size'] = df_copy['Size'].replace('N/A', np.nan)
-
-        df_copy['Gender'] = df_copy['Gender'].str.replace('Gender: ', '', regex=False)
-        df_copy['Gender'] = df_copy['Gender'].str.strip(',')
-        df_copy['Gender'] = df_copy['Gender'].replace('N/A', np.nan)
-
-        df_copy = df_copy.dropna(subset=['Title', 'Price (IDR)', 'Rating', 'Size', 'Gender'])
-
-        df_copy = df_copy.drop_duplicates()
-
-        df_copy['Price (IDR)'] = df_copy['Price (IDR)'].astype('float64')
-        df_copy['Rating'] = df_copy['Rating'].astype('float64')
-        df_copy['Colors'] = df_copy['Colors'].astype('int64')
-        df_copy['Title'] = df_copy['Title'].astype('string')
-        df_copy['Size'] = df_copy['Size'].astype('string')
-        df_copy['Gender'] = df_copy['Gender'].astype('string')
-        df_copy['timestamp'] = pd.to_datetime(df_copy['timestamp'])
-        
-        final_columns = ['Title', 'Price (IDR)', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp']
-        df_final = df_copy[final_columns]
-        
-        df_final.columns = ['title', 'Price', 'Rating', 'colors', 'size', 'gender', 'timestamp']
-        
+        price_usd = _parse_numeric(df['Price'], remove=r'[$,]')
+        price_idr = np.round(price_usd * exchange_rate, 0)
+        rating = np.round(_parse_numeric(df['Rating'], pattern=r'^(?:[^ ]* ){2}([^ ]*)'), 1)
+        colors = _parse_numeric(df['Colors'], pattern=r'^([^ ]*)')
+        size = _parse_category(df['Size'], 'Size: ')
+        gender = _parse_category(df['Gender'], 'Gender: ')
+        title = df['Title']
+
+        checks = [
+            ('unknown_title', (title != 'Unknown Product').to_numpy() & title.notna().to_numpy()),
+            ('invalid_price', ~np.isnan(price_idr)),
+            ('invalid_rating', ~np.isnan(rating)),
+            ('missing_size', size.codes != -1),
+            ('missing_gender', gender.codes != -1),
+        ]
+        keep = np.ones(len(df), dtype=bool)
+        for step, valid in checks:
+            if metrics is not None:
+                metrics.record_transform_step(step, np.count_nonzero(keep & ~valid))
+            keep &= valid
+
+        df_final = pd.DataFrame({
+            'title': pd.array(title.to_numpy()[keep], dtype='string'),
+            'Price': price_idr[keep],
+            'Rating': rating[keep],
+            'colors': np.nan_to_num(colors[keep], nan=1).astype('int64'),
+            'size': size[keep],
+            'gender': gender[keep],
+            'timestamp': pd.to_datetime(df['timestamp'].to_numpy()[keep]),
+        }, index=df.index[keep])
+
+        rows_before = len(df_final)
+        df_final = df_final.drop_duplicates()
+        if metrics is not None:
+            metrics.record_transform_step('duplicate', rows_before - len(df_final))
+
+        if seen_hashes is not None:
+            rows_before = len(df_final)
+            df_final = _drop_seen_rows(df_final, seen_hashes)
+            if metrics is not None:
+                metrics.record_transform_step('seen_in_previous_batch', rows_before - len(df_final))
+
         logging.info(f"Transformasi selesai. {len(df_final)} data bersih tersisa.")
         return df_final
-        
+
     except Exception as e:
         logging.error(f"Terjadi error saat transformasi data: {e}")
-        return pd.DataFrame(columns=['title', 'Price', 'Rating', 'colors', 'size', 'gender', 'timestamp'])
\ No newline at end of file
+        return pd.DataFrame(columns=FINAL_COLUMNS)